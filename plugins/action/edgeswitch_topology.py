@@ -0,0 +1,165 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import re
+import tempfile
+
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.module_utils.connection import Connection
+from ansible.plugins.action import ActionBase
+from ansible.plugins.loader import connection_loader
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch import topology
+
+ARGUMENT_SPEC = dict(
+    seeds=dict(type='list', elements='str'),
+    username=dict(type='str'),
+    password=dict(type='str', no_log=True),
+    port=dict(type='int', default=22),
+    subnets=dict(type='list', elements='str'),
+    workers=dict(type='int', default=8),
+    max_depth=dict(type='int'),
+    max_devices=dict(type='int'),
+    include=dict(type='str'),
+    timeout=dict(type='int', default=30),
+    dest=dict(type='path'),
+    format=dict(default='json', choices=['json', 'graphml'])
+)
+
+NETWORK_OS = 'community.network.edgeswitch'
+
+
+def write_graph(path, graph, format='json'):
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    if format == 'graphml':
+        data = topology.to_graphml(graph)
+    else:
+        data = to_bytes(json.dumps(graph, indent=2, sort_keys=True))
+
+    fd, tmp = tempfile.mkstemp(dir=dirname)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+class ActionModule(ActionBase):
+    """Crawl the network from the controller, reading every neighbor over
+    its own network_cli connection, instead of from a module that can only
+    reach the device the task runs against."""
+
+    TRANSFERS_FILES = False
+
+    def _local_connection(self):
+        return Connection(self._connection.socket_path)
+
+    def _remote_connection(self, address, args):
+        """Open a network_cli connection to a neighbor.
+
+        Host keys are always checked, a neighbor that is not in known_hosts
+        is refused instead of trusted on first use.
+        """
+        play_context = self._play_context.copy()
+        play_context.remote_addr = address
+        play_context.port = args['port']
+        play_context.remote_user = args['username']
+        play_context.password = args['password']
+        play_context.become = True
+        play_context.become_method = 'enable'
+        play_context.become_pass = args['password']
+        play_context.network_os = NETWORK_OS
+        play_context.timeout = args['timeout']
+
+        connection = connection_loader.get('ansible.netcommon.network_cli', play_context, '/dev/null',
+                                           task_uuid=self._task._uuid)
+        connection.set_options(direct={
+            'host': address,
+            'remote_addr': address,
+            'port': args['port'],
+            'remote_user': args['username'],
+            'password': args['password'],
+            'host_key_checking': True,
+            'host_key_auto_add': False,
+            'persistent_connect_timeout': args['timeout'],
+            'persistent_command_timeout': args['timeout'],
+        })
+        connection._connect()
+        return connection
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(
+            argument_spec=ARGUMENT_SPEC,
+            required_together=[('username', 'password')],
+        )
+
+        result['changed'] = False
+
+        include = None
+        if args['include']:
+            try:
+                include = re.compile(args['include'])
+            except re.error as err:
+                result.update(failed=True, msg='Invalid include expression: %s' % to_native(err))
+                return result
+
+        subnets = None
+        if args['max_depth'] != 0 or args['seeds']:
+            if not args['username']:
+                result.update(failed=True, msg='username and password are required to read neighbors')
+                return result
+            if not args['subnets']:
+                result.update(failed=True, msg='subnets is required to read neighbors')
+                return result
+            try:
+                subnets = topology.parse_subnets(args['subnets'])
+            except ValueError as err:
+                result.update(failed=True, msg='Invalid subnets: %s' % to_native(err))
+                return result
+
+        # the connected device is read once up front, the address None stands for it
+        try:
+            local = topology.parse_device(self._local_connection().run_commands(commands=topology.COMMANDS))
+        except Exception as err:
+            result.update(failed=True, msg=to_native(err))
+            return result
+
+        def fetch(address):
+            if address is None:
+                return local
+            connection = self._remote_connection(address, args)
+            try:
+                return topology.parse_device(connection.run_commands(commands=topology.COMMANDS))
+            finally:
+                connection.close()
+
+        graph = topology.crawl([None] + (args['seeds'] or []), fetch,
+                               workers=args['workers'],
+                               max_depth=args['max_depth'],
+                               max_devices=args['max_devices'],
+                               include=include,
+                               subnets=subnets)
+        result.update(graph)
+
+        if args['dest']:
+            path = os.path.abspath(self._loader.path_dwim(args['dest']))
+            try:
+                write_graph(path, graph, args['format'])
+            except (IOError, OSError) as err:
+                result.update(failed=True, msg='Could not write %s: %s' % (path, to_native(err)))
+                return result
+            result['dest'] = path
+
+        return result
@@ -0,0 +1,74 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.module_utils.basic import missing_required_lib
+from ansible.plugins.action import ActionBase
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp import READ_BUFFER_SIZE
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import argspec
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import fanout
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer.compress import GzipReader, gzip_filename
+
+
+class ActionModule(ActionBase):
+    """Send the file from the controller instead of packaging the content
+    into the module and running it there."""
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(**argspec.FANOUT_SEND)
+
+        warnings = list()
+        result.update({'changed': False, 'warnings': warnings})
+
+        try:
+            destinations = [fanout.parse_destination(url, args['username'], args['password']) for url in args['dest']]
+        except ValueError as err:
+            result.update(failed=True, msg=to_native(err))
+            return result
+        if args['compress']:
+            destinations = [fanout.with_filename(item, gzip_filename(item['filename'])) for item in destinations]
+
+        if not sftp.HAS_FABRIC and any(item['protocol'] == 'sftp' for item in destinations):
+            result.update(failed=True, msg=missing_required_lib('fabric'))
+            return result
+
+        if self._task.check_mode:
+            warnings.append('Transfer cannot occur using check mode')
+            return result
+
+        try:
+            if args['src_path']:
+                src = open(self._find_needle('files', args['src_path']), 'rb', READ_BUFFER_SIZE)
+            else:
+                src = io.BytesIO(to_bytes(args['src']))
+        except AnsibleError as err:
+            result.update(failed=True, msg='Could not find src_path: %s' % to_native(err))
+            return result
+
+        sftp_options = {'atomic': args['atomic']}
+        tftp_options = dict((key, args[key]) for key in ('blocksize', 'windowsize', 'timeout', 'retries'))
+        with src:
+            if args['compress']:
+                src = GzipReader(src)
+            sent = fanout.fan_out(src, destinations, sftp_options=sftp_options, tftp_options=tftp_options)
+
+        failed = [item for item in sent if item.get('failed')]
+        result['changed'] = len(failed) < len(sent)
+        result['destinations'] = sent
+        result['stdout'] = '\n'.join('Uploaded to %s' % to_native(item['dest']) for item in sent if not item.get('failed'))
+        result['stdout_lines'] = result['stdout'].splitlines()
+        if failed:
+            result.update(failed=True, msg='Upload failed for %d of %d destinations' % (len(failed), len(sent)))
+        return result
@@ -0,0 +1,49 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import missing_required_lib
+from ansible.plugins.action import ActionBase
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import fetch, sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import argspec
+
+
+class ActionModule(ActionBase):
+    """Fetch the files to the controller instead of running a module that
+    would write them on the target."""
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(**argspec.SFTP_FETCH)
+
+        warnings = list()
+        result.update({'changed': False, 'warnings': warnings})
+
+        if not sftp.HAS_FABRIC:
+            result.update(failed=True, msg=missing_required_lib('fabric'))
+            return result
+
+        compare = args['compare'] if args['skip_unchanged'] else None
+        try:
+            fetched, unmatched = fetch.download_files(args['host'], args['port'], args['username'], args['password'],
+                                                      args['src'], self._loader.path_dwim(args['dest']),
+                                                      workers=args['concurrency'], compare=compare,
+                                                      check_mode=self._task.check_mode)
+        except Exception as err:
+            result.update(failed=True, msg='SFTP fetch failed: %s' % to_native(err))
+            return result
+
+        warnings.extend('No files match %s' % to_native(pattern) for pattern in unmatched)
+        result['files'] = fetched
+        result['changed'] = any(item.get('changed') for item in fetched)
+        failed = [item for item in fetched if item.get('failed')]
+        if failed:
+            result.update(failed=True, msg='SFTP fetch failed for %d of %d files' % (len(failed), len(fetched)))
+        return result
@@ -0,0 +1,93 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import functools
+import io
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.basic import missing_required_lib
+from ansible.plugins.action import ActionBase
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import pool, sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import argspec
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer.compress import gzip_filename, gzip_source
+
+
+class ActionModule(ActionBase):
+    """Send the files from the controller instead of packaging the content
+    into the module and running it there."""
+
+    TRANSFERS_FILES = False
+
+    def _get_source(self, item):
+        if item['src_path']:
+            return functools.partial(open, self._find_needle('files', item['src_path']), 'rb')
+        return functools.partial(io.BytesIO, to_bytes(to_text(item['src']), encoding='utf-8'))
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(**argspec.SFTP_SEND)
+
+        warnings = list()
+        result.update({'changed': False, 'warnings': warnings})
+
+        if not sftp.HAS_FABRIC:
+            result.update(failed=True, msg=missing_required_lib('fabric'))
+            return result
+
+        if args['chunk_size'] < 1:
+            result.update(failed=True, msg='chunk_size must be a positive number of bytes')
+            return result
+        if args['pool'] and args['resume']:
+            result.update(failed=True, msg='resume can not be used with pool')
+            return result
+
+        if self._task.check_mode:
+            warnings.append('SFTP transfer cannot occur using check mode')
+            return result
+
+        items = args['files'] or [{'src': args['src'], 'src_path': args['src_path'], 'dest': args['dest_filename']}]
+        try:
+            files = [(self._get_source(item), item['dest']) for item in items]
+        except AnsibleError as err:
+            result.update(failed=True, msg='Could not find src_path: %s' % to_native(err))
+            return result
+        if args['compress']:
+            files = [(gzip_source(source), gzip_filename(dest)) for source, dest in files]
+
+        compare = args['compare'] if args['skip_unchanged'] else None
+        options = dict((key, args[key]) for key in ('chunk_size', 'atomic'))
+        try:
+            if args['pool']:
+                uploaded = pool.upload_files(args['host'], args['port'], args['username'], args['password'],
+                                             files, workers=args['concurrency'], idle_timeout=args['pool_idle_timeout'],
+                                             compare=compare, **options)
+            else:
+                uploaded = sftp.upload_files(args['host'], args['port'], args['username'], args['password'],
+                                             files, workers=args['concurrency'], compare=compare,
+                                             resume=args['resume'], **options)
+        except Exception as err:
+            result.update(failed=True, msg='SFTP upload failed: %s' % to_native(err))
+            return result
+
+        failed = [item for item in uploaded if item.get('failed')]
+        result['stdout'] = '\n'.join('SFTP client %s %s' % ('uploaded to' if item.get('changed', True) else 'left unchanged',
+                                                            to_native(item['dest']))
+                                     for item in uploaded if not item.get('failed'))
+        result['stdout_lines'] = result['stdout'].splitlines()
+        if compare:
+            result['changed'] = any(item.get('changed') for item in uploaded)
+        if args['files']:
+            result['files'] = uploaded
+            if failed:
+                result.update(failed=True, msg='SFTP upload failed for %d of %d files' % (len(failed), len(uploaded)))
+        elif failed:
+            result.update(failed=True, msg='SFTP upload failed: %s' % failed[0]['msg'])
+        elif uploaded[0].get('changed', True):
+            result['metrics'] = dict((key, value) for key, value in uploaded[0].items() if key not in ('dest', 'changed'))
+        return result
@@ -0,0 +1,60 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.plugins.action import ActionBase
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import argspec
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer.compress import gzip_filename
+
+
+class ActionModule(ActionBase):
+    """Send the file from the controller instead of packaging the content
+    into the module and running it there."""
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(**argspec.TFTP_SEND)
+
+        warnings = list()
+        result.update({'changed': False, 'warnings': warnings})
+
+        if self._task.check_mode:
+            warnings.append('TFTP transfer cannot occur using check mode')
+            return result
+
+        path = None
+        if args['src_path']:
+            try:
+                path = self._find_needle('files', args['src_path'])
+            except AnsibleError as err:
+                result.update(failed=True, msg='Could not find src_path: %s' % to_native(err))
+                return result
+
+        options = dict((key, args[key]) for key in ('blocksize', 'windowsize', 'timeout', 'retries', 'deadline', 'compress'))
+        dest = gzip_filename(args['dest_filename']) if args['compress'] else args['dest_filename']
+        responses = ['TFTP client connected to %s:%s' % (to_native(args['host']), to_native(args['port']))]
+        try:
+            if path:
+                result['metrics'] = tftp.upload_file(args['host'], args['port'], dest, path, **options)
+            else:
+                result['metrics'] = tftp.upload(args['host'], args['port'], dest,
+                                                io.BytesIO(to_bytes(args['src'])), **options)
+            responses.append('TFTP client uploaded to %s' % to_native(dest))
+        except Exception as err:
+            result.update(failed=True, msg='TFTP upload failed: %s' % to_native(err))
+            return result
+
+        result['stdout'] = '\n'.join(responses)
+        result['stdout_lines'] = result['stdout'].splitlines()
+        return result
@@ -0,0 +1,351 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import hashlib
+import re
+
+from ansible.module_utils._text import to_bytes
+
+PARENT_RE = [
+    re.compile(r"^(?:vlan\sdatabase)$"),
+    re.compile(r"^(?:ip\saccess-list\s\S+)$"),
+    re.compile(r"^(?:line\s\S+)$"),
+    re.compile(r"^(?:interface\s\S+)$"),
+    re.compile(r"^(?:interface\slag\s\S+)$"),
+    re.compile(r"^(?:service\s\S+)$"),
+]
+
+GLOBAL = None
+
+# how to undo a line, the first match wins.  Lines that set a value negate
+# to the same command whatever the value, so a changed value is simply pushed
+# without removing the old one.  Lines whose value names an entry of a list,
+# such as a name server or a tagged VLAN, keep it so only that entry goes.
+NEGATE_RULES = [
+    (re.compile(r'^no\s+(.+)$'), r'\1'),
+    (re.compile(r'^addport\s+(\S+)$'), r'deleteport \1'),
+    (re.compile(r'^vlan\s+participation\s+(?:include|exclude)\s+(\S+)$'), r'vlan participation auto \1'),
+    (re.compile(r'^(vlan\s+name\s+\S+)\s.*$'), r'no \1'),
+    (re.compile(r'^(vlan\s+tagging\s+\S+)$'), r'no \1'),
+    (re.compile(r'^((?:username|snmp-server\s+community)\s+\S+)\s.*$'), r'no \1'),
+    (re.compile(r'^((?:ip\s+name\s+server|sntp\s+server)\s+\S+)(?:\s.*)?$'), r'no \1'),
+    (re.compile(r'^(ip\s+route\s+\S+\s+\S+(?:\s+\d+\.\d+\.\d+\.\d+)?)(?:\s+\d+)?$'), r'no \1'),
+    (re.compile(r'^(description|hostname|domain-name|ip\s+address|ip\s+default-gateway|mtu|vlan\s+pvid'
+                r'|snmp-server\s+(?:sysname|location|contact)|network\s+parms|network\s+protocol)\s.*$'), r'no \1'),
+]
+
+# the first argument that is a value rather than part of the command, a
+# quoted string, a number, address, port, range or MAC address
+VALUE_RE = re.compile(r'^(?:"|[\d./:,\-]+$|[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5}$)')
+
+# sections that are removed as a whole and whose lines are order sensitive
+REMOVABLE_RE = [
+    re.compile(r"^(?:ip|ipv6|mac)\saccess-list\s"),
+]
+
+VLAN_DATABASE = 'vlan database'
+VLAN_RE = re.compile(r'^vlan\s+([\d,\-]+)$')
+
+
+def is_parent(line):
+    return any(regex.match(line) for regex in PARENT_RE)
+
+
+def indent_config(config):
+    """ indent the config so we can modify sections natively
+    """
+    config_indented = list()
+    indent = False
+    for line in str(config).split("\n"):
+        if is_parent(line):
+            config_indented.append(line)
+            indent = True
+        elif line == 'exit':
+            config_indented.append(line)
+            indent = False
+        else:
+            config_indented.append(" %s" % line if indent else line)
+    return "\n".join(config_indented)
+
+
+def negate(line):
+    """Return the command that undoes line.
+
+    Lines without a rule in `NEGATE_RULES` are prefixed with `no` and lose
+    their value, EdgeSwitch refuses most `no` commands given a value.
+    """
+    for regex, template in NEGATE_RULES:
+        match = regex.match(line)
+        if match:
+            return match.expand(template)
+    words = line.split()
+    for index, word in enumerate(words[1:], 1):
+        if VALUE_RE.match(word):
+            return 'no %s' % ' '.join(words[:index])
+    return 'no %s' % line
+
+
+def is_removable(header):
+    return header is not GLOBAL and any(regex.match(header) for regex in REMOVABLE_RE)
+
+
+def vlan_ranges(vlan_ids):
+    """ collapse VLAN IDs into a list of 'first-last' ranges
+    """
+    ranges = list()
+    start = previous = None
+    for vlan_id in sorted(vlan_ids):
+        if previous is not None and vlan_id == previous + 1:
+            previous = vlan_id
+            continue
+        if start is not None:
+            ranges.append((start, previous))
+        start = previous = vlan_id
+    if start is not None:
+        ranges.append((start, previous))
+    return ['%d-%d' % r if r[0] != r[1] else '%d' % r[0] for r in ranges]
+
+
+def expand_ranges(text):
+    """ expand a VLAN list such as '10,20-22' into a set of IDs
+    """
+    vlan_ids = set()
+    for item in text.split(','):
+        if not item:
+            continue
+        first, dummy, last = item.partition('-')
+        vlan_ids.update(range(int(first), int(last or first) + 1))
+    return vlan_ids
+
+
+def replace_lines(have, want):
+    """Find the commands that turn the lines of one section from have into
+    want, negations first in reverse order and then the missing lines."""
+    wanted = set(want)
+    overridden = set(negate(line) for line in want)
+    commands = list()
+    for line in reversed(have):
+        if line in wanted:
+            continue
+        command = negate(line)
+        if command not in wanted and command not in overridden and command not in commands:
+            commands.append(command)
+    present = set(have)
+    commands.extend(line for line in want if line not in present)
+    return commands
+
+
+def replace_vlan_database(have, want):
+    """Like replace_lines, but VLANs are compared by ID so a change of a
+    range only creates and removes the VLANs that differ."""
+    def split(lines):
+        vlan_ids = set()
+        rest = list()
+        for line in lines:
+            match = VLAN_RE.match(line)
+            if match:
+                vlan_ids.update(expand_ranges(match.group(1)))
+            else:
+                rest.append(line)
+        return vlan_ids, rest
+
+    have_ids, have_rest = split(have)
+    want_ids, want_rest = split(want)
+    commands = ['vlan %s' % r for r in vlan_ranges(want_ids - have_ids)]
+    commands.extend(replace_lines(have_rest, want_rest))
+    commands.extend('no vlan %s' % r for r in vlan_ranges(have_ids - want_ids))
+    return commands
+
+
+class SectionConfig(object):
+    """An EdgeSwitch config split into its top-level sections.
+
+    EdgeSwitch configs are flat, a section such as `interface 0/1` starts with
+    its header line and ends with `exit`.  Indented configs, where a section
+    ends with the indentation, are read as well.  Top-level lines outside of
+    any section make up the global section, keyed by `GLOBAL`.
+
+    Every section is hashed at most once, so comparing two configs only looks
+    at the lines of the sections whose hashes differ.
+
+    Args:
+        contents: The config text to load.
+        ignore_lines: Regular expressions of lines to leave out.
+    """
+
+    def __init__(self, contents=None, ignore_lines=None):
+        self._ignore = [re.compile(item) for item in ignore_lines or []]
+        self._sections = dict()
+        self._order = list()
+        self._hashes = dict()
+        if contents:
+            self.load(contents)
+
+    def _ignored(self, line):
+        return any(regex.match(line) for regex in self._ignore)
+
+    def _append(self, key, line):
+        if self._ignored(line):
+            return
+        if key is GLOBAL:
+            self._order.append((GLOBAL, line))
+        self._sections.setdefault(key, list()).append(line)
+        self._hashes.pop(key, None)
+
+    def _open(self, key):
+        if key not in self._sections:
+            self._order.append((key, None))
+            self._sections[key] = list()
+
+    def load(self, contents):
+        lines = [line.rstrip() for line in str(contents).split('\n')]
+        lines = [line for line in lines if line and not line.lstrip().startswith('!')]
+        # mode changes wrapping a whole config are not part of it
+        lines = [line for line in lines if line.strip() not in ('configure', 'end')]
+
+        section = None
+        flat = False
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped == 'exit':
+                section = None
+                continue
+
+            if section is not None:
+                if line != stripped or (flat and not is_parent(stripped)):
+                    self._append(section, stripped)
+                    continue
+                section = None
+
+            following = lines[index + 1] if index + 1 < len(lines) else ''
+            if following[:1].isspace():
+                section, flat = stripped, False
+            elif is_parent(stripped):
+                section, flat = stripped, True
+            else:
+                self._append(GLOBAL, stripped)
+                continue
+            self._open(section)
+
+    def add(self, lines, parents=None):
+        """Add lines to the global section, or to the section given by the
+        single header in parents."""
+        key = parents[0] if parents else GLOBAL
+        if key is not GLOBAL:
+            self._open(key)
+        for line in lines:
+            self._append(key, line)
+
+    def keys(self):
+        return list(self._sections)
+
+    def section(self, key):
+        return self._sections.get(key, list())
+
+    def sha1(self, key):
+        if key not in self._hashes:
+            text = '\n'.join(self._sections.get(key, list()))
+            self._hashes[key] = hashlib.sha1(to_bytes(text)).hexdigest()
+        return self._hashes[key]
+
+    def difference(self, other):
+        """Find the lines of this config that are missing from other.
+
+        Lines are matched within their section regardless of their position,
+        like a NetworkConfig line match.  Sections with equal hashes are
+        skipped without looking at their lines.
+
+        Returns:
+            A list of (header, lines) tuples in config order, the header is
+            `GLOBAL` for global lines.
+        """
+        diffs = list()
+        lookup = dict()
+        for key, line in self._order:
+            if key is GLOBAL:
+                if GLOBAL not in lookup:
+                    lookup[GLOBAL] = set(other.section(GLOBAL))
+                if line not in lookup[GLOBAL]:
+                    diffs.append((GLOBAL, [line]))
+                continue
+
+            if key not in other._sections:
+                diffs.append((key, list(self._sections[key])))
+            elif self.sha1(key) != other.sha1(key):
+                existing = set(other.section(key))
+                missing = [line for line in self._sections[key] if line not in existing]
+                if missing:
+                    diffs.append((key, missing))
+        return diffs
+
+    def replace(self, other):
+        """Find the commands that turn other into exactly this config.
+
+        Lines of other that are not in this config are negated with the
+        EdgeSwitch rules in `NEGATE_RULES`.  Order sensitive sections such
+        as access lists are removed and added again when they differ, other
+        sections of other that are not in this config have all of their
+        lines negated.  Sections with equal hashes are skipped.
+
+        Returns:
+            A list of (header, commands) tuples, global changes first, then
+            every section in config order and then the sections that are
+            only in other.
+        """
+        diffs = list()
+        keys = [key for key, line in self._order if line is None]
+        keys.extend(key for key, line in other._order if line is None and key not in self._sections)
+
+        for key in [GLOBAL] + keys:
+            if self.sha1(key) == other.sha1(key):
+                continue
+            have = other.section(key)
+            want = self.section(key)
+
+            if is_removable(key):
+                if have:
+                    diffs.append((GLOBAL, ['no %s' % key]))
+                if key in self._sections:
+                    diffs.append((key, list(want)))
+                continue
+
+            if key == VLAN_DATABASE:
+                commands = replace_vlan_database(have, want)
+            else:
+                commands = replace_lines(have, want)
+            if commands:
+                diffs.append((key, commands))
+        return diffs
+
+    def changed_sections(self, other):
+        """Compare every section with other by hash.
+
+        Returns:
+            A list of (header, lines in other, lines in self) tuples for each
+            section that differs.
+        """
+        changed = list()
+        keys = [key for key, line in other._order if line is None]
+        keys.extend(key for key, line in self._order if line is None and key not in other._sections)
+        if GLOBAL in self._sections or GLOBAL in other._sections:
+            keys.insert(0, GLOBAL)
+        for key in keys:
+            if self.sha1(key) != other.sha1(key):
+                changed.append((key, other.section(key), self.section(key)))
+        return changed
+
+
+def dumps(diffs, exit=False):
+    """Turn the result of SectionConfig.difference or SectionConfig.replace
+    into commands, with `exit` every section is closed again."""
+    commands = list()
+    for key, lines in diffs:
+        if key is not GLOBAL:
+            commands.append(key)
+        commands.extend(lines)
+        if exit and key is not GLOBAL:
+            commands.append('exit')
+    return commands
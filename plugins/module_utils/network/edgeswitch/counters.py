@@ -0,0 +1,186 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import csv
+import json
+import struct
+import sys
+from array import array
+
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.parsers import parse_tables
+
+BINARY_MAGIC = b'ESCNT1\n'
+ERROR_KEYWORDS = ('err', 'discard', 'crc', 'drop', 'collision')
+
+
+def parse_counters(output):
+    """Parse `show interface counters` into {port: {column: value}}.
+
+    The output is made of several tables that share the port column, such
+    as one for the receive and one for the transmit counters, they are
+    merged per port.  Only numeric cells are kept.
+    """
+    counters = dict()
+    for table in parse_tables(output, merge=False):
+        for row in table:
+            port = row.pop('port', None) or row.pop('interface', None)
+            if not port:
+                continue
+            values = counters.setdefault(port, dict())
+            for column, value in row.items():
+                if value.isdigit():
+                    values[column] = int(value)
+    return counters
+
+
+def is_error_column(column):
+    return any(keyword in column for keyword in ERROR_KEYWORDS)
+
+
+class CounterSeries(object):
+    """A time series of interface counter samples.
+
+    The ports and columns are fixed by the first sample.  Every sample is
+    stored as one flat `array` of unsigned 64 bit values, port major, which
+    keeps long series compact and is written to files as it is.
+
+    Args:
+        ports: Only keep these ports, all ports of the first sample if None.
+    """
+
+    def __init__(self, ports=None):
+        self.ports = list(ports) if ports else None
+        self.columns = None
+        self.timestamps = array('d')
+        self.samples = list()
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, timestamp, counters):
+        """Add a sample as returned by parse_counters."""
+        if self.columns is None:
+            if self.ports is None:
+                self.ports = sorted(counters, key=port_key)
+            columns = set()
+            for port in self.ports:
+                columns.update(counters.get(port, dict()))
+            self.columns = sorted(columns)
+
+        sample = array('Q')
+        for port in self.ports:
+            values = counters.get(port, dict())
+            sample.extend(values.get(column, 0) for column in self.columns)
+        self.timestamps.append(timestamp)
+        self.samples.append(sample)
+
+    def total(self):
+        """The counter increase over the whole series, summed from every pair
+        of samples so a cleared counter does not lose what came before.
+        Counters that went backwards were cleared or wrapped and count from
+        zero.
+
+        Every counter is walked once through all of the samples.
+        """
+        total = array('Q')
+        for values in zip(*self.samples):
+            increase = 0
+            previous = values[0]
+            for value in values[1:]:
+                increase += value - previous if value >= previous else value
+                previous = value
+            total.append(increase)
+        return total
+
+    def rates(self):
+        """The average per second rate of every counter over the whole series,
+        octet counters are turned into bits per second.
+
+        Returns:
+            {port: {column: rate}}
+        """
+        if len(self.samples) < 2:
+            return dict()
+        elapsed = self.timestamps[-1] - self.timestamps[0]
+        if elapsed <= 0:
+            return dict()
+
+        scale = array('d', [8.0 / elapsed if 'octets' in column else 1.0 / elapsed for column in self.columns])
+        scale = scale * len(self.ports)
+        rates = [round(d * s, 3) for d, s in zip(self.total(), scale)]
+        width = len(self.columns)
+        return dict((port, dict(zip(self.columns, rates[number * width:(number + 1) * width])))
+                    for number, port in enumerate(self.ports))
+
+    def errors(self):
+        """The increase of the error and discard counters over the whole
+        series, only ports with errors are returned."""
+        if len(self.samples) < 2:
+            return dict()
+        width = len(self.columns)
+        picked = [index for index, column in enumerate(self.columns) if is_error_column(column)]
+        total = self.total()
+
+        errors = dict()
+        for number, port in enumerate(self.ports):
+            offset = number * width
+            values = dict((self.columns[i], total[offset + i]) for i in picked if total[offset + i])
+            if values:
+                errors[port] = values
+        return errors
+
+    def write_csv(self, f):
+        """Write one row per port and sample to a text file object."""
+        writer = csv.writer(f)
+        writer.writerow(['timestamp', 'port'] + self.columns)
+        width = len(self.columns or [])
+        for timestamp, sample in zip(self.timestamps, self.samples):
+            for number, port in enumerate(self.ports):
+                writer.writerow(['%.3f' % timestamp, port] + sample[number * width:(number + 1) * width].tolist())
+
+    def write_binary(self, f):
+        """Write the series to a binary file object.
+
+        The file starts with `BINARY_MAGIC` and a JSON header line with the
+        ports and columns, followed by one record per sample: a little endian
+        double timestamp and the flat sample as little endian unsigned 64 bit
+        values.
+        """
+        f.write(BINARY_MAGIC)
+        header = {'ports': self.ports, 'columns': self.columns}
+        f.write(json.dumps(header).encode('utf-8') + b'\n')
+        for timestamp, sample in zip(self.timestamps, self.samples):
+            f.write(struct.pack('<d', timestamp))
+            if sys.byteorder != 'little':
+                sample = array('Q', sample)
+                sample.byteswap()
+            f.write(sample.tobytes())
+
+
+def read_binary(f):
+    """Read a series written by CounterSeries.write_binary."""
+    if f.readline() != BINARY_MAGIC:
+        raise ValueError('not a counter series file')
+    header = json.loads(f.readline().decode('utf-8'))
+    series = CounterSeries(header['ports'])
+    series.columns = header['columns']
+    size = len(series.ports) * len(series.columns) * 8
+    while True:
+        timestamp = f.read(8)
+        if len(timestamp) < 8:
+            break
+        sample = array('Q')
+        sample.frombytes(f.read(size))
+        if sys.byteorder != 'little':
+            sample.byteswap()
+        series.timestamps.append(struct.unpack('<d', timestamp)[0])
+        series.samples.append(sample)
+    return series
+
+
+def port_key(port):
+    """Sort 0/10 after 0/9."""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in port.replace('/', ' ').split()]
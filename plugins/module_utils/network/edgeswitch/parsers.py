@@ -0,0 +1,285 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import re
+
+SEPARATOR_RE = re.compile(r'^\s*-+(?:\s+-+)*\s*$')
+COLUMN_RE = re.compile(r'-+')
+KEY_RE = re.compile(r'[^a-z0-9]+')
+CAMEL_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+WORD_RE = re.compile(r'\S+')
+
+
+class ParseError(ValueError):
+    pass
+
+
+def column_name(text):
+    """Turn a column header such as `Link State` or `InOctets` into
+    `link_state` or `in_octets`."""
+    return KEY_RE.sub('_', CAMEL_RE.sub('_', text).lower()).strip('_')
+
+
+class TableLayout(object):
+    """The column layout of one fixed width EdgeSwitch table.
+
+    The layout is taken from the dashed separator line under the header, every
+    run of dashes is one column.  A column reaches up to the start of the next
+    one so values wider than their dashes are kept whole, and the last column
+    reaches to the end of the line.
+
+    Args:
+        header: The header lines above the separator, see header_lines.
+        separator: The separator line.
+    """
+
+    def __init__(self, header, separator):
+        starts = [m.start() for m in COLUMN_RE.finditer(separator)]
+        self.slices = [slice(start, end) for start, end in zip(starts, starts[1:] + [None])]
+        self.columns = [column_name(' '.join(line[s] for line in header)) for s in self.slices]
+
+    def split(self, line):
+        return [line[s].strip() for s in self.slices]
+
+
+def header_lines(lines, separator):
+    """The lines directly above a separator that are the table header.
+
+    The line right above the separator is always part of it.  The lines
+    further up are only taken while every word of them lies within the
+    dashes of one column, so text printed before the table such as
+    `Max. VLANs: 4093` is left out.
+    """
+    spans = [m.span() for m in COLUMN_RE.finditer(separator)]
+    header = lines[-1:]
+    for line in reversed(lines[:-1]):
+        words = [m.span() for m in WORD_RE.finditer(line)]
+        if not all(any(start <= first and last <= end for start, end in spans) for first, last in words):
+            break
+        header.insert(0, line)
+    return header
+
+
+def check_columns(rows, columns, name):
+    """Make sure the rows of a table have the columns a parser reads.
+
+    Returns:
+        The rows.
+
+    Raises:
+        ParseError: A column is missing from the table header.
+    """
+    missing = [column for column in columns if rows and column not in rows[0]]
+    if missing:
+        raise ParseError('Unable to parse the output of %s, the table has no %s column'
+                         % (name, ', '.join(missing)))
+    return rows
+
+
+def parse_tables(output, merge=True):
+    """Parse every fixed width table in the output of a show command.
+
+    Each table starts with its header lines and dashed separator and ends at
+    the first blank line, see header_lines for which lines make the header.
+    With `merge`, rows with an empty first column are wrapped continuation
+    lines and their cells are joined to the previous row with a comma.
+
+    Returns:
+        A list of tables, each a list of dicts keyed by column name.
+    """
+    tables = list()
+    lines = output.splitlines()
+    layout = None
+    header = list()
+    rows = None
+
+    for line in lines:
+        if layout is None:
+            if SEPARATOR_RE.match(line) and header:
+                layout = TableLayout(header_lines(header, line), line)
+                rows = list()
+                tables.append(rows)
+            elif line.strip():
+                header.append(line)
+            else:
+                header = list()
+            continue
+
+        if not line.strip():
+            layout = None
+            header = list()
+            continue
+
+        values = layout.split(line)
+        if merge and not values[0] and rows:
+            previous = rows[-1]
+            for column, value in zip(layout.columns, values):
+                if value:
+                    previous[column] = ','.join(v for v in (previous[column], value) if v)
+            continue
+
+        rows.append(dict(zip(layout.columns, values)))
+
+    return tables
+
+
+def parse_table(output, merge=True):
+    """Parse the first fixed width table in the output of a show command.
+
+    Returns:
+        A list of dicts keyed by column name.
+    """
+    tables = parse_tables(output, merge=merge)
+    return tables[0] if tables else list()
+
+
+def parse_dotted(output):
+    """Parse `Name........ value` lines as printed by `show version` and
+    `show sysinfo`.
+
+    Returns:
+        A dict keyed by the normalized name.
+    """
+    parsed = dict()
+    for match in re.finditer(r'^(\S.*?)\.{2,}\s?(.*)$', output, re.M):
+        parsed[column_name(match.group(1))] = match.group(2).strip()
+    return parsed
+
+
+def to_columns(records, columns=None):
+    """Turn a list of records into a dict of equal length lists."""
+    if columns is None:
+        columns = list(records[0]) if records else list()
+    return dict((column, [record.get(column) for record in records]) for column in columns)
+
+
+def split_list(value):
+    """Split a comma separated cell into a list, dropping empty items."""
+    return [item.strip() for item in value.split(',') if item.strip()] if value else list()
+
+
+MAC_ROW_RE = re.compile(
+    r'^\s*(\d+)\s+((?:[0-9A-Fa-f]{2}:){5,7}[0-9A-Fa-f]{2})\s+(\S+)\s+(\d+)\s+(\S+)\s*$', re.M)
+
+
+def parse_interfaces_status(output):
+    """Parse `show interfaces status`, one record per port."""
+    return check_columns(parse_table(output, merge=False), ['port'], 'show interfaces status')
+
+
+def parse_mac_table(output):
+    """Parse `show mac-addr-table`.
+
+    MAC tables can hold tens of thousands of rows, so the rows are matched
+    with a single compiled expression over the whole output instead of being
+    sliced into columns line by line.
+    """
+    return [{'vlan_id': m.group(1), 'mac_address': m.group(2), 'interface': m.group(3),
+             'ifindex': m.group(4), 'status': m.group(5)} for m in MAC_ROW_RE.finditer(output)]
+
+
+def parse_lldp_remote(output):
+    """Parse `show lldp remote-device`, ports without a neighbor are left
+    out."""
+    records = list()
+    rows = check_columns(parse_table(output, merge=False),
+                         ['local_interface', 'chassis_id', 'port_id', 'system_name'], 'show lldp remote-device')
+    for row in rows:
+        if not row['chassis_id']:
+            continue
+        records.append({
+            'local_port': row['local_interface'],
+            'host': row['system_name'],
+            'port': row['port_id'],
+            'chassis_id': row['chassis_id'],
+        })
+    return records
+
+
+DETAIL_RE = re.compile(r'^\s*([A-Za-z][\w /-]*?)\s*:\s*(.*?)\s*$')
+
+
+def parse_lldp_detail(output):
+    """Parse `show lldp remote-device detail`, one record per neighbor with
+    its capabilities and first IPv4 management address."""
+    records = list()
+    record = None
+    address_type = None
+    for line in output.splitlines():
+        match = DETAIL_RE.match(line)
+        if not match:
+            continue
+        key, value = column_name(match.group(1)), match.group(2)
+        if key == 'local_interface':
+            record = {'local_port': value, 'host': '', 'port': '', 'chassis_id': '',
+                      'description': '', 'capabilities': list(), 'address': None}
+            records.append(record)
+        elif record is None:
+            continue
+        elif key == 'system_name':
+            record['host'] = value
+        elif key == 'port_id':
+            record['port'] = value
+        elif key == 'chassis_id':
+            record['chassis_id'] = value
+        elif key == 'system_description':
+            record['description'] = value
+        elif key == 'system_capabilities_enabled':
+            record['capabilities'] = split_list(value)
+        elif key == 'type':
+            address_type = value.lower()
+        elif key == 'address' and address_type == 'ipv4' and not record['address']:
+            record['address'] = value
+    return [record for record in records if record['chassis_id']]
+
+
+def parse_vlan_brief(output):
+    """Parse `show vlan brief`."""
+    rows = check_columns(parse_table(output), ['vlan_id', 'vlan_name', 'vlan_type'], 'show vlan brief')
+    return [{'vlan_id': row['vlan_id'], 'name': row['vlan_name'], 'type': row['vlan_type']} for row in rows]
+
+
+def parse_port_channel_brief(output):
+    """Parse `show port-channel brief`, member ports wrapped over several
+    lines are joined into one list."""
+    records = list()
+    rows = check_columns(parse_table(output), ['logical_interface', 'port_channel_name', 'link', 'type',
+                                               'mbr_ports', 'active_ports'], 'show port-channel brief')
+    for row in rows:
+        records.append({
+            'interface': row['logical_interface'],
+            'name': row['port_channel_name'],
+            'link_state': row['link'],
+            'type': row['type'],
+            'members': split_list(row['mbr_ports']),
+            'active_members': split_list(row['active_ports']),
+        })
+    return records
+
+
+COMMAND_PARSERS = [
+    (re.compile(r'^show\s+interfaces?\s+status\b'), parse_interfaces_status),
+    (re.compile(r'^show\s+mac-addr(?:ess)?-table\b'), parse_mac_table),
+    (re.compile(r'^show\s+lldp\s+remote-device\s+detail\b'), parse_lldp_detail),
+    (re.compile(r'^show\s+lldp\s+remote-device\b'), parse_lldp_remote),
+    (re.compile(r'^show\s+vlan(?:\s+brief)?$'), parse_vlan_brief),
+    (re.compile(r'^show\s+port-channel(?:\s+brief)?$'), parse_port_channel_brief),
+]
+
+
+def parse_command(command, output):
+    """Parse the output of one of the commands in `COMMAND_PARSERS`.
+
+    Returns:
+        A list of records, or None when there is no parser for the command.
+
+    Raises:
+        ParseError: The output does not have the expected columns.
+    """
+    for regex, parser in COMMAND_PARSERS:
+        if regex.match(command.strip()):
+            return parser(output)
+    return None
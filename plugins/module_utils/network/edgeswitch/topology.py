@@ -0,0 +1,145 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import ipaddress
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ansible.module_utils._text import to_text
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.parsers import parse_dotted, parse_lldp_detail
+
+COMMANDS = ['show sysinfo', 'show lldp remote-device detail all']
+GRAPHML_NS = 'http://graphml.graphdrawing.org/xmlns'
+
+
+def parse_device(responses):
+    """Turn the output of `COMMANDS` into a device record."""
+    sysinfo = parse_dotted(to_text(responses[0]))
+    return {'name': sysinfo.get('system_name', ''), 'neighbors': parse_lldp_detail(to_text(responses[1]))}
+
+
+def parse_subnets(subnets):
+    """Turn a list of CIDR strings into networks for crawl.
+
+    Raises:
+        ValueError: One of the strings is not a network.
+    """
+    return [ipaddress.ip_network(to_text(subnet), strict=False) for subnet in subnets]
+
+
+def in_subnets(address, subnets):
+    """Whether an address is in any of the networks of parse_subnets."""
+    try:
+        address = ipaddress.ip_address(to_text(address))
+    except ValueError:
+        return False
+    return any(address in subnet for subnet in subnets)
+
+
+def crawl(seeds, fetch, workers=8, max_depth=None, max_devices=None, include=None, subnets=None):
+    """Discover the network breadth first through LLDP.
+
+    Every address is fetched at most once, the worker pool is kept busy by
+    submitting the neighbors of a device as soon as it is read instead of
+    waiting for the whole level.  Devices reached under several addresses
+    are only added once, by name.
+
+    Args:
+        seeds: The addresses to start from.
+        fetch: A function taking an address and returning a device record
+            as built by parse_device.  It runs in the worker threads.
+        workers: The maximum number of devices read at the same time.
+        max_depth: Do not read devices further than this many hops from a
+            seed.
+        max_devices: Stop submitting devices after this many.
+        include: A compiled expression neighbors' system names must match to
+            be read, all neighbors with a management address if None.
+        subnets: The networks of parse_subnets a neighbor's management
+            address must be in to be read, any address if None.  The seeds
+            are always read.
+
+    Returns:
+        A dict with the `nodes` and `links` sorted by name and the `errors`
+        keyed by address.
+    """
+    nodes = dict()
+    links = dict()
+    errors = dict()
+    queued = set()
+    pending = dict()
+
+    def submit(pool, address, depth):
+        if address in queued or (max_devices is not None and len(queued) >= max_devices):
+            return
+        queued.add(address)
+        pending[pool.submit(fetch, address)] = (address, depth)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for address in seeds:
+            submit(pool, address, 0)
+
+        while pending:
+            done, dummy = wait(list(pending), return_when=FIRST_COMPLETED)
+            # handle completions in submission order to keep the walk breadth first
+            for future in sorted(done, key=lambda f: pending[f][1]):
+                address, depth = pending.pop(future)
+                try:
+                    device = future.result()
+                except Exception as err:
+                    errors[address] = to_text(err)
+                    continue
+
+                name = device['name'] or address
+                node = nodes.setdefault(name, {'name': name})
+                if node.get('crawled'):
+                    continue
+                node.update({'address': address, 'depth': depth, 'crawled': True})
+
+                for neighbor in device['neighbors']:
+                    peer = neighbor['host'] or neighbor['chassis_id']
+                    nodes.setdefault(peer, {'name': peer, 'address': neighbor['address'], 'crawled': False,
+                                            'description': neighbor['description']})
+                    ends = sorted([(name, neighbor['local_port']), (peer, neighbor['port'])])
+                    links.setdefault(tuple(ends), {'source': ends[0][0], 'source_port': ends[0][1],
+                                                   'target': ends[1][0], 'target_port': ends[1][1]})
+
+                    if not neighbor['address'] or (max_depth is not None and depth >= max_depth):
+                        continue
+                    if include is not None and not include.search(neighbor['host']):
+                        continue
+                    if subnets is not None and not in_subnets(neighbor['address'], subnets):
+                        continue
+                    if nodes[peer].get('crawled'):
+                        continue
+                    submit(pool, neighbor['address'], depth + 1)
+
+    return {
+        'nodes': [nodes[name] for name in sorted(nodes)],
+        'links': [links[key] for key in sorted(links)],
+        'errors': errors,
+    }
+
+
+def to_graphml(topology):
+    """Render the result of crawl as a GraphML document."""
+    ET.register_namespace('', GRAPHML_NS)
+    root = ET.Element('{%s}graphml' % GRAPHML_NS)
+    keys = [('address', 'node'), ('depth', 'node'), ('crawled', 'node'), ('description', 'node'),
+            ('source_port', 'edge'), ('target_port', 'edge')]
+    for name, domain in keys:
+        ET.SubElement(root, '{%s}key' % GRAPHML_NS, {'id': name, 'for': domain, 'attr.name': name, 'attr.type': 'string'})
+
+    graph = ET.SubElement(root, '{%s}graph' % GRAPHML_NS, {'id': 'lldp', 'edgedefault': 'undirected'})
+    for node in topology['nodes']:
+        element = ET.SubElement(graph, '{%s}node' % GRAPHML_NS, {'id': node['name']})
+        for name, domain in keys:
+            if domain == 'node' and node.get(name) is not None:
+                ET.SubElement(element, '{%s}data' % GRAPHML_NS, {'key': name}).text = to_text(node[name])
+    for link in topology['links']:
+        element = ET.SubElement(graph, '{%s}edge' % GRAPHML_NS, {'source': link['source'], 'target': link['target']})
+        for name in ('source_port', 'target_port'):
+            ET.SubElement(element, '{%s}data' % GRAPHML_NS, {'key': name}).text = link[name]
+    return ET.tostring(root, encoding='utf-8')
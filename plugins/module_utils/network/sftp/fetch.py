@@ -0,0 +1,231 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Download many files from a SFTP server over one session."""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import errno
+import fnmatch
+import os
+import posixpath
+import stat
+import time
+
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp.sftp import (
+    CHUNK_SIZE, get_connection, is_unchanged, map_channels, read_digest)
+
+GLOB_CHARS = '*?['
+
+
+def has_magic(pattern):
+    return any(char in pattern for char in GLOB_CHARS)
+
+
+def glob(sftp, pattern):
+    """The regular files on the server matching a pattern.
+
+    The glob characters of fnmatch may appear in any component of the path.
+    As with a shell, names starting with a dot are only matched by a
+    component that starts with one.
+
+    Returns:
+        A list of (path, relative, attr) tuples, with the path of every
+        file relative to the directory before the first glob character and
+        its SFTPAttributes.  A path without glob characters is returned as
+        it is, relative to its directory, even when it does not exist.
+    """
+    if not has_magic(pattern):
+        return [(pattern, posixpath.basename(pattern), None)]
+    parts = pattern.split('/')
+    static = list()
+    while not has_magic(parts[0]):
+        static.append(parts.pop(0))
+    base = '/'.join(static) or ('/' if pattern.startswith('/') else '.')
+    matches = [(base, None)]
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        found = list()
+        for path, attr in matches:
+            if not has_magic(part):
+                found.append((posixpath.join(path, part), None))
+                continue
+            try:
+                entries = sftp.listdir_attr(path)
+            except IOError:
+                # not a directory, or one that can not be read
+                continue
+            for entry in sorted(entries, key=lambda item: item.filename):
+                if entry.filename.startswith('.') and not part.startswith('.'):
+                    continue
+                if fnmatch.fnmatchcase(entry.filename, part):
+                    found.append((posixpath.join(path, entry.filename), entry if last else None))
+        matches = found
+
+    files = list()
+    for path, attr in matches:
+        if attr is None:
+            try:
+                attr = sftp.stat(path)
+            except IOError:
+                continue
+        if stat.S_ISREG(attr.st_mode or 0):
+            files.append((path, posixpath.relpath(path, base), attr))
+    return files
+
+
+def resolve(sftp, patterns, dest):
+    """Expand the remote patterns into the files to download.
+
+    Every file is placed under `dest` by its path relative to the
+    directory before the first glob character of its pattern.
+
+    Returns:
+        A list of (remote, local, attr) tuples and a list of the patterns
+        that matched no file.
+
+    Raises:
+        ValueError: Two remote files would be written to the same local path,
+            or a file would be written outside of `dest`, as the `..` of a
+            pattern or a name given by the server can lead there.
+    """
+    files = list()
+    targets = dict()
+    unmatched = list()
+    root = os.path.normpath(dest)
+    for pattern in patterns:
+        matches = glob(sftp, pattern)
+        if not matches:
+            unmatched.append(pattern)
+        for remote, relative, attr in matches:
+            local = os.path.normpath(os.path.join(root, *relative.split('/')))
+            if not local.startswith(os.path.join(root, '')):
+                raise ValueError('%s would be written outside of %s' % (remote, dest))
+            if targets.get(local, remote) != remote:
+                raise ValueError('Both %s and %s would be written to %s' % (targets[local], remote, local))
+            if local not in targets:
+                targets[local] = remote
+                files.append((remote, local, attr))
+    return files, unmatched
+
+
+def local_unchanged(conn, sftp, remote, local, attr, compare='mtime'):
+    """Whether a local file already has the content of a remote one.
+
+    Args:
+        attr: The SFTPAttributes of the remote file.
+        compare: `mtime` to trust the same size and modification time,
+            which receive_file copies from the server, or `hash` and
+            `remote_hash` to compare SHA-256 digests as
+            sftp.is_unchanged.
+    """
+    try:
+        info = os.stat(local)
+    except OSError as err:
+        if err.errno == errno.ENOENT:
+            return False
+        raise
+    if info.st_size != attr.st_size:
+        return False
+    if compare == 'mtime':
+        return int(info.st_mtime) == attr.st_mtime
+    with open(local, 'rb') as f:
+        size, digest = read_digest(f)
+    return is_unchanged(conn, sftp, remote, size, digest, compare)
+
+
+def receive_file(sftp, remote, local, attr, chunk_size=CHUNK_SIZE * 8):
+    """Stream a remote file to a local one.
+
+    The reads are prefetched, paramiko keeps many read requests in flight.
+    The data is written to a hidden `.<name>.part` file next to `local` as
+    it arrives and renamed into place once complete, with the modification
+    time of the remote file.
+
+    Returns:
+        The transfer metrics, the number of `bytes` received, the
+        `duration` in seconds and the `throughput` in bytes per second.
+    """
+    started = time.time()
+    directory, name = os.path.split(local)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    temp = os.path.join(directory, '.%s.part' % name)
+    size = 0
+    try:
+        with sftp.file(remote, 'rb') as f:
+            f.prefetch(attr.st_size)
+            with open(temp, 'wb') as out:
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    out.write(data)
+                    size += len(data)
+        if attr.st_mtime is not None:
+            os.utime(temp, (attr.st_atime or attr.st_mtime, attr.st_mtime))
+        os.rename(temp, local)
+    except Exception:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    duration = time.time() - started
+    return {
+        'bytes': size,
+        'duration': round(duration, 3),
+        'throughput': int(size / duration) if duration > 0 else size,
+    }
+
+
+def fetch_files(conn, patterns, dest, workers=1, compare=None, check_mode=False):
+    """Download the files matching a list of paths or patterns over one
+    authenticated connection, in parallel over SFTP channels of its
+    transport, see sftp.map_channels.
+
+    Args:
+        conn: A fabric connection.
+        patterns: Remote paths, which may have glob characters, see glob.
+        dest: The local directory to place the files in, see resolve.
+        workers: The number of files downloaded at the same time.
+        compare: Leave local files that already have the content alone,
+            see local_unchanged.  Every file is downloaded if None.
+        check_mode: Only report which files would be downloaded.
+
+    Returns:
+        A list with the `src`, `dest` and `changed` of every file and the
+        receive_file metrics of the downloaded ones, and a list of the
+        patterns that matched no file.  Files that could not be downloaded
+        have `failed` and `msg` instead of the metrics.
+    """
+    conn.open()
+    client = conn.client.open_sftp()
+    try:
+        files, unmatched = resolve(client, patterns, dest)
+    finally:
+        client.close()
+
+    def fetch(client, item):
+        remote, local, attr = item
+        if attr is None:
+            attr = client.stat(remote)
+        if compare and local_unchanged(conn, client, remote, local, attr, compare):
+            return {'changed': False}
+        result = {'changed': True}
+        if not check_mode:
+            result.update(receive_file(client, remote, local, attr))
+        return result
+
+    results = map_channels(conn, fetch, files, workers)
+    for result, item in zip(results, files):
+        result.update(src=item[0], dest=item[1])
+    return results, unmatched
+
+
+def download_files(host, port, username, password, patterns, dest, workers=1, compare=None, check_mode=False):
+    """Download many files over a new connection, see fetch_files."""
+    conn = get_connection(host, port, username, password)
+    try:
+        return fetch_files(conn, patterns, dest, workers=workers, compare=compare, check_mode=check_mode)
+    finally:
+        conn.close()
@@ -0,0 +1,395 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""A connection pool keeping authenticated SFTP sessions open across tasks.
+
+Ansible runs every task in a new worker process, so a connection can not
+simply be kept in memory.  Instead the first upload to a server starts a
+small daemon on the controller that logs in once and listens on a UNIX
+socket named after the server and credentials.  Later uploads, from any
+task or fork, stream their files to that socket and the daemon writes them
+over a new SFTP channel of its open session.  The daemon exits once it was
+idle for `idle_timeout` seconds or its session was closed.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp.sftp import (
+    CHUNK_SIZE, get_connection, is_unchanged, local_signature, send_fileobj)
+
+DEFAULT_IDLE_TIMEOUT = 60
+STARTUP_TIMEOUT = 60
+DAEMON_CODE = 'from ansible_collections.ncstate.network.plugins.module_utils.network.sftp.pool import main; main()'
+
+
+class PoolError(Exception):
+    pass
+
+
+def socket_dir():
+    """The private directory for the sockets of the daemons.
+
+    It is placed in `$XDG_RUNTIME_DIR` when there is one, otherwise in
+    `~/.ansible`, and created readable by the current user only.
+
+    Raises:
+        PoolError: The directory is not a directory owned by the current
+            user and closed to everyone else.
+    """
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        dirname = os.path.join(runtime, 'ncstate-sftp')
+    else:
+        dirname = os.path.join(os.path.expanduser('~'), '.ansible', 'ncstate-sftp')
+    try:
+        os.makedirs(dirname, 0o700)
+    except OSError as err:
+        if err.errno != errno.EEXIST:
+            raise
+    info = os.lstat(dirname)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PoolError('%s must be a directory owned by the current user and closed to other users' % dirname)
+    return dirname
+
+
+def socket_path(host, port, username, password):
+    """The socket of the daemon for a server, different credentials get
+    their own daemon."""
+    key = json.dumps([host, port, username, password])
+    return os.path.join(socket_dir(), hashlib.sha256(to_bytes(key)).hexdigest()[:24] + '.sock')
+
+
+class PoolServer(object):
+    """Serve uploads over an open connection on a UNIX socket.
+
+    A request is a JSON header line with the `dest` filename followed by the
+    content until the client shuts down its side of the socket.  The reply
+    is the JSON line of the send_fileobj result, or `failed` and `msg`.
+
+    The header may also have the `chunk_size` and `atomic` options of
+    send_fileobj, `resume` can not be used as the content is not seekable.
+
+    When the header also has `compare` with the `size` and `digest` of the
+    content, see sftp.is_unchanged, the server first replies with a line
+    with `changed`.  If it is false that is the whole reply and the client
+    sends no content.
+
+    Args:
+        sock: A bound and listening UNIX socket.
+        path: The path of the socket, removed when the server stops.
+        conn: An open fabric connection.
+        idle_timeout: Stop after this many seconds without a request.
+        inode: The inode of the socket file, see remove_socket.  That of
+            `path` when the server is created if None.
+    """
+
+    def __init__(self, sock, path, conn, idle_timeout=DEFAULT_IDLE_TIMEOUT, inode=None):
+        self.sock = sock
+        self.path = path
+        self.inode = os.stat(path).st_ino if inode is None else inode
+        self.conn = conn
+        self.idle_timeout = idle_timeout
+        self.active = 0
+        self.last = time.time()
+        self.lock = threading.Lock()
+
+    def idle(self):
+        with self.lock:
+            return not self.active and time.time() - self.last > self.idle_timeout
+
+    def serve(self):
+        self.sock.settimeout(1)
+        try:
+            while True:
+                try:
+                    client, dummy = self.sock.accept()
+                except socket.timeout:
+                    if self.idle() or not self.conn.is_connected:
+                        break
+                    continue
+                with self.lock:
+                    self.active += 1
+                thread = threading.Thread(target=self.handle, args=(client,))
+                thread.daemon = True
+                thread.start()
+        finally:
+            # remove the socket first so no new client connects to a closing server
+            remove_socket(self.path, self.inode)
+            self.sock.close()
+            self.conn.close()
+
+    def handle(self, client):
+        try:
+            client.settimeout(None)
+            stream = client.makefile('rb')
+            try:
+                header = json.loads(to_text(stream.readline()))
+                sftp = self.conn.client.open_sftp()
+                try:
+                    result = None
+                    if header.get('compare'):
+                        changed = not is_unchanged(self.conn, sftp, header['dest'], header['size'], header['digest'],
+                                                   header['compare'])
+                        result = {'changed': changed}
+                        if changed:
+                            client.sendall(to_bytes(json.dumps(result)) + b'\n')
+                            result = None
+                    if result is None:
+                        result = send_fileobj(sftp, stream, header['dest'], chunk_size=header.get('chunk_size', CHUNK_SIZE),
+                                              atomic=header.get('atomic', False))
+                finally:
+                    sftp.close()
+            except Exception as err:
+                result = {'failed': True, 'msg': to_text(err)}
+            client.sendall(to_bytes(json.dumps(result)) + b'\n')
+        except socket.error:
+            pass
+        finally:
+            client.close()
+            with self.lock:
+                self.active -= 1
+                self.last = time.time()
+
+
+def collection_root():
+    """The directory holding `ansible_collections`, for the daemon to import
+    this file from outside of Ansible."""
+    path = os.path.abspath(__file__)
+    while os.path.basename(path) != 'ansible_collections':
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return os.path.dirname(path)
+
+
+def remove_socket(path, inode):
+    """Remove the socket file at `path` only if it is still the one with
+    `inode`, a daemon that started after this one may have replaced it."""
+    try:
+        if os.lstat(path).st_ino == inode:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def claim_socket(path):
+    """Bind and listen on the socket at `path`.
+
+    Daemons for the same server that start at the same time take turns on
+    a lock file next to the socket, so only one of them finds a stale
+    socket and replaces it.  The socket listens before the login, clients
+    that connect in the meantime wait in the backlog and later daemons see
+    it running.
+
+    Returns:
+        The listening socket, or None if another daemon is already running.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with open(path + '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # the socket is created closed to other users, there is no window before a chmod
+        umask = os.umask(0o177)
+        try:
+            try:
+                sock.bind(path)
+            except socket.error as err:
+                if err.errno != errno.EADDRINUSE:
+                    raise
+                if is_running(path):
+                    sock.close()
+                    return None
+                os.remove(path)
+                sock.bind(path)
+        finally:
+            os.umask(umask)
+        sock.listen(64)
+    return sock
+
+
+def run_daemon(path, host, port, username, password, idle_timeout=DEFAULT_IDLE_TIMEOUT, report=None):
+    """Claim the socket, log in and serve.
+
+    Args:
+        report: A function called with `ok` or an error message once the
+            daemon is serving or failed to start.
+    """
+    report = report or (lambda message: None)
+    sock = claim_socket(path)
+    if sock is None:
+        # another task started a daemon for the same server first
+        report('ok')
+        return
+    inode = os.stat(path).st_ino
+
+    try:
+        conn = get_connection(host, port, username, password)
+        conn.open()
+        conn.transport.set_keepalive(30)
+    except Exception as err:
+        remove_socket(path, inode)
+        sock.close()
+        report(to_text(err) or 'login failed')
+        return
+
+    report('ok')
+    PoolServer(sock, path, conn, idle_timeout, inode=inode).serve()
+
+
+def main():
+    """Entry point of the daemon, the settings are read as JSON from stdin
+    so the password does not show in the process list."""
+    settings = json.loads(sys.stdin.readline())
+
+    def report(message):
+        sys.stdout.write(message + '\n')
+        sys.stdout.flush()
+        # close the pipe so the task reading the status can go on
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+
+    try:
+        run_daemon(report=report, **settings)
+    except Exception as err:
+        report(to_text(err))
+
+
+def spawn(path, host, port, username, password, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Start a daemon for the server in the background and wait until it
+    is logged in.
+
+    Raises:
+        PoolError: The daemon could not log in.
+    """
+    env = dict(os.environ)
+    root = collection_root()
+    if root:
+        env['PYTHONPATH'] = os.pathsep.join([root] + [p for p in [env.get('PYTHONPATH')] if p])
+    process = subprocess.Popen([sys.executable, '-c', DAEMON_CODE], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, env=env, close_fds=True, start_new_session=True)
+    settings = dict(path=path, host=host, port=port, username=username, password=password, idle_timeout=idle_timeout)
+    process.stdin.write(to_bytes(json.dumps(settings)) + b'\n')
+    process.stdin.close()
+    status = to_text(process.stdout.readline()).strip()
+    process.stdout.close()
+    if status != 'ok':
+        process.wait()
+        raise PoolError('Could not start the SFTP connection pool: %s' % (status or 'no reply'))
+
+
+def is_running(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+
+def connect(host, port, username, password, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """The socket of a running daemon for the server, started if needed."""
+    path = socket_path(host, port, username, password)
+    if not is_running(path):
+        spawn(path, host, port, username, password, idle_timeout)
+    return path
+
+
+def read_reply(stream):
+    reply = stream.readline()
+    if not reply:
+        raise PoolError('The SFTP connection pool closed the connection')
+    return json.loads(to_text(reply))
+
+
+def send(path, source, dest, compare=None, **options):
+    """Stream one file through the daemon listening on `path`.
+
+    Args:
+        compare: Skip the file if the server already has it, as for
+            sftp.sync_fileobj.
+        options: The `chunk_size` and `atomic` options of
+            sftp.send_fileobj.
+
+    Returns:
+        The reply of the daemon, see PoolServer, with `changed` set as by
+        sftp.sync_fileobj.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(STARTUP_TIMEOUT)
+    sock.connect(path)
+    try:
+        sock.settimeout(None)
+        stream = sock.makefile('rb')
+        with source() as src:
+            header = dict(options, dest=dest)
+            if compare:
+                header['size'], header['digest'] = local_signature(src, compare)
+                header['compare'] = compare
+            sock.sendall(to_bytes(json.dumps(header)) + b'\n')
+            if compare:
+                reply = read_reply(stream)
+                if not reply.get('changed'):
+                    return reply
+            try:
+                while True:
+                    data = src.read(CHUNK_SIZE * 8)
+                    if not data:
+                        break
+                    sock.sendall(data)
+                sock.shutdown(socket.SHUT_WR)
+            except socket.error:
+                # the daemon gave up on the file, its reply says why
+                pass
+        reply = read_reply(stream)
+    finally:
+        sock.close()
+    if compare and not reply.get('failed'):
+        reply['changed'] = True
+    return reply
+
+
+def upload_files(host, port, username, password, files, workers=1, idle_timeout=DEFAULT_IDLE_TIMEOUT, compare=None,
+                 **options):
+    """Upload many files through the pooled connection to the server.
+
+    Takes the same `files`, `compare` and `options` and returns the same
+    results as sftp.send_files, apart from `resume`.
+    """
+    state = {'path': connect(host, port, username, password, idle_timeout)}
+
+    def upload(item):
+        source, dest = item
+        try:
+            try:
+                result = send(state['path'], source, dest, compare, **options)
+            except (OSError, socket.error) as err:
+                if err.errno not in (errno.ENOENT, errno.ECONNREFUSED):
+                    raise
+                # the daemon stopped after being idle, start a new one
+                state['path'] = connect(host, port, username, password, idle_timeout)
+                result = send(state['path'], source, dest, compare, **options)
+        except Exception as err:
+            result = {'failed': True, 'msg': to_text(err)}
+        result['dest'] = dest
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+        return list(pool.map(upload, files))
@@ -0,0 +1,384 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import errno
+import hashlib
+import io
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.six.moves import shlex_quote
+
+try:
+    from fabric import Connection
+    HAS_FABRIC = True
+except ImportError:
+    HAS_FABRIC = False
+
+# the largest write paramiko sends in one SFTP request
+CHUNK_SIZE = 32768
+
+
+def get_connection(host, port, username, password):
+    """Create a password authenticated fabric connection.
+
+    Key and agent lookups are disabled so only the given password is tried.
+
+    Returns:
+        An unopened `fabric.Connection`.
+    """
+    return Connection(
+        host=host,
+        user=username,
+        port=port,
+        connect_kwargs={
+            'password': password,
+            'look_for_keys': False,
+            'allow_agent': False,
+        },
+        connect_timeout=30
+    )
+
+
+def upload(host, port, username, password, filename, data):
+    """Write bytes to a file on a SFTP server over a new connection, in
+    pipelined chunks like upload_fileobj."""
+    upload_fileobj(host, port, username, password, filename, io.BytesIO(data))
+
+
+def temp_filename(filename):
+    """The hidden name a file is written to before it is renamed into
+    place, in the same directory so the rename does not move data."""
+    head, tail = posixpath.split(filename)
+    return posixpath.join(head, '.%s.part' % tail)
+
+
+def replace(sftp, src, dest):
+    """Rename a file over another in one step."""
+    try:
+        sftp.posix_rename(src, dest)
+    except IOError as err:
+        # plain SFTP rename fails when dest exists, servers without the
+        # posix-rename extension need it removed first
+        if 'unsupported' not in to_text(err).lower():
+            raise
+        try:
+            sftp.remove(dest)
+        except IOError:
+            pass
+        sftp.rename(src, dest)
+
+
+def resume_offset(sftp, src, filename, chunk_size=CHUNK_SIZE):
+    """Where to go on with a partly written file.
+
+    The size of the file on the server is taken from `src` and the digests
+    of both are compared, so a partial file of other content is written
+    again from the start.
+
+    Returns:
+        The size of the partial file with `src` read up to it, or 0 with
+        `src` at its start.
+    """
+    try:
+        size = sftp.stat(filename).st_size
+    except IOError as err:
+        if getattr(err, 'errno', None) == errno.ENOENT:
+            return 0
+        raise
+    if not size:
+        return 0
+    digest = hashlib.sha256()
+    read = 0
+    while read < size:
+        data = src.read(min(chunk_size, size - read))
+        if not data:
+            break
+        digest.update(data)
+        read += len(data)
+    if read == size:
+        with sftp.file(filename, 'rb') as f:
+            f.prefetch(size)
+            if file_digest(f) == digest.hexdigest():
+                return size
+    src.seek(0)
+    return 0
+
+
+def send_fileobj(sftp, src, filename, chunk_size=CHUNK_SIZE, atomic=False, resume=False):
+    """Stream a file-like object to a file over an open SFTP client.
+
+    The writes are pipelined, every chunk is sent without waiting for the
+    reply to the one before.  paramiko splits chunks larger than
+    CHUNK_SIZE into several requests.
+
+    Args:
+        chunk_size: The number of bytes read and written at once.
+        atomic: Write to temp_filename and rename it over `filename` once
+            complete, so the file is never seen half written.
+        resume: Go on from the end of a partial file left by an interrupted
+            upload, see resume_offset.  `src` must be seekable.
+
+    Returns:
+        The transfer metrics, the number of `bytes` and write `requests`
+        sent, the `duration` in seconds, the `throughput` in bytes per second
+        and the largest number of requests in flight in `pipeline_depth`.
+        With `resume` the number of bytes that were already on the server
+        is added as `resumed`.
+    """
+    started = time.time()
+    size = 0
+    requests = 0
+    depth = 0
+    target = temp_filename(filename) if atomic else filename
+    offset = resume_offset(sftp, src, target, chunk_size) if resume else 0
+    with sftp.file(target, 'r+b' if offset else 'wb') as f:
+        if offset:
+            f.seek(offset)
+        f.set_pipelined(True)
+        while True:
+            data = src.read(chunk_size)
+            if not data:
+                break
+            f.write(data)
+            size += len(data)
+            requests += (len(data) + CHUNK_SIZE - 1) // CHUNK_SIZE
+            # paramiko keeps the write requests waiting for a reply in _reqs
+            depth = max(depth, len(getattr(f, '_reqs', ())))
+    if atomic:
+        replace(sftp, target, filename)
+    duration = time.time() - started
+    result = {
+        'bytes': size,
+        'requests': requests,
+        'duration': round(duration, 3),
+        'throughput': int(size / duration) if duration > 0 else size,
+        'pipeline_depth': depth,
+    }
+    if resume:
+        result['resumed'] = offset
+    return result
+
+
+def file_digest(f):
+    """The SHA-256 hex digest of the rest of a file-like object."""
+    return read_digest(f)[1]
+
+
+def read_digest(f):
+    """The size and SHA-256 hex digest of the rest of a file-like object."""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        data = f.read(CHUNK_SIZE * 8)
+        if not data:
+            return size, digest.hexdigest()
+        digest.update(data)
+        size += len(data)
+
+
+def local_signature(src, compare='hash'):
+    """The size and, unless `compare` is `size`, the SHA-256 digest of a
+    seekable file-like object, which is rewound afterwards."""
+    if compare == 'size':
+        src.seek(0, os.SEEK_END)
+        size, digest = src.tell(), None
+    else:
+        size, digest = read_digest(src)
+    src.seek(0)
+    return size, digest
+
+
+def remote_digest(conn, filename):
+    """The SHA-256 digest of a file computed by `sha256sum` on the server,
+    or None if the server does not allow running it."""
+    try:
+        dummy, stdout, dummy = conn.client.exec_command('sha256sum -- %s' % shlex_quote(filename))
+        output = to_text(stdout.read()).split()
+        if stdout.channel.recv_exit_status() or not output:
+            return None
+    except Exception:
+        return None
+    return output[0]
+
+
+def is_unchanged(conn, sftp, filename, size, digest, compare='hash'):
+    """Whether a file on the server already has the given content.
+
+    The sizes are compared first with a stat, only files of the same size
+    are hashed.
+
+    Args:
+        conn: The fabric connection, used to hash the file on the server.
+        sftp: An open SFTP client.
+        size: The size of the new content.
+        digest: The SHA-256 digest of the new content, see local_signature.
+        compare: `size` to trust a matching size, `hash` to read the file
+            back and hash it, `remote_hash` to hash it on the server with
+            `sha256sum`, falling back to `hash` where that can not run.
+    """
+    try:
+        attr = sftp.stat(filename)
+    except IOError as err:
+        if getattr(err, 'errno', None) == errno.ENOENT:
+            return False
+        raise
+    if attr.st_size != size:
+        return False
+    if compare == 'size':
+        return True
+    remote = remote_digest(conn, filename) if compare == 'remote_hash' else None
+    if remote is None:
+        with sftp.file(filename, 'rb') as f:
+            f.prefetch(size)
+            remote = file_digest(f)
+    return remote == digest
+
+
+def sync_fileobj(conn, sftp, src, filename, compare=None, **options):
+    """Send a file-like object with send_fileobj unless the file on the
+    server already has the same content, see is_unchanged.  The `options`
+    are passed on to send_fileobj.
+
+    Returns:
+        The send_fileobj result with `changed` set to True, or only
+        `changed` set to False when the file was left alone.  Without
+        `compare` the file is always sent and `changed` is not set.
+    """
+    if not compare:
+        return send_fileobj(sftp, src, filename, **options)
+    size, digest = local_signature(src, compare)
+    if is_unchanged(conn, sftp, filename, size, digest, compare):
+        return {'changed': False}
+    result = send_fileobj(sftp, src, filename, **options)
+    result['changed'] = True
+    return result
+
+
+def upload_fileobj(host, port, username, password, filename, src, **options):
+    """Stream a file-like object to a file on a SFTP server over a new
+    connection, the data is sent in pipelined chunks as it is read.  The
+    `options` are passed on to send_fileobj.
+
+    Returns:
+        The result of send_fileobj.
+    """
+    conn = get_connection(host, port, username, password)
+    try:
+        with conn.sftp() as sftp:
+            return send_fileobj(sftp, src, filename, **options)
+    finally:
+        conn.close()
+
+
+def map_channels(conn, function, items, workers=1):
+    """Call a function for every item with an SFTP channel of one
+    connection.
+
+    Every worker opens its own SFTP channel on the SSH transport of the
+    connection and takes the next item when done with one, so the items
+    are handled in parallel without another login.
+
+    Args:
+        conn: An open fabric connection.
+        function: Called as function(client, item) and returning a dict.
+        items: The items to call the function for.
+        workers: The number of items handled at the same time.
+
+    Returns:
+        A list with the result of every item, in order.  Items the function
+        raised an error for have `failed` and `msg`.
+    """
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+
+    def work():
+        client = conn.client.open_sftp()
+        try:
+            while True:
+                with lock:
+                    index, item = next(pending, (None, None))
+                if index is None:
+                    return
+                try:
+                    results[index] = function(client, item)
+                except Exception as err:
+                    results[index] = {'failed': True, 'msg': to_text(err)}
+        finally:
+            client.close()
+
+    count = max(1, min(workers, len(items)))
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        for future in [pool.submit(work) for dummy in range(count)]:
+            future.result()
+    return results
+
+
+def send_files(conn, files, workers=1, compare=None, **options):
+    """Upload many files over one authenticated connection, in parallel
+    over SFTP channels of its transport, see map_channels.
+
+    Args:
+        conn: A fabric connection.
+        files: A list of (source, dest) tuples, where source is a function
+            returning a file-like object to read the content from.  It is
+            only called when the file is sent, so at most `workers` sources
+            are open at once.
+        workers: The number of files sent at the same time.
+        compare: Skip files the server already has, see sync_fileobj.  The
+            sources must be seekable.
+        options: Passed on to send_fileobj.
+
+    Returns:
+        A list with the sync_fileobj result of every file, in the order of
+        `files`, with the `dest` added.  Files that could not be sent have
+        `failed` and `msg` instead of the metrics.
+    """
+    def send(client, item):
+        source, dest = item
+        with source() as src:
+            return sync_fileobj(conn, client, src, dest, compare, **options)
+
+    conn.open()
+    results = map_channels(conn, send, files, workers)
+    for result, item in zip(results, files):
+        result['dest'] = item[1]
+    return results
+
+
+def upload_files(host, port, username, password, files, workers=1, compare=None, **options):
+    """Upload many files over a new connection, see send_files."""
+    conn = get_connection(host, port, username, password)
+    try:
+        return send_files(conn, files, workers=workers, compare=compare, **options)
+    finally:
+        conn.close()
+
+
+def download(host, port, username, password, filename, dest):
+    """Stream a file on a SFTP server into a file-like object over a new
+    connection.
+
+    Returns:
+        False if the file does not exist, True otherwise.
+    """
+    conn = get_connection(host, port, username, password)
+    try:
+        with conn.sftp() as sftp:
+            try:
+                sftp.getfo(filename, dest)
+            except IOError as err:
+                if getattr(err, 'errno', None) == errno.ENOENT:
+                    return False
+                raise
+    finally:
+        conn.close()
+    return True
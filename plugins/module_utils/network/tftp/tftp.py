@@ -0,0 +1,562 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import socket
+import struct
+import threading
+import time
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer.compress import GzipReader
+
+try:
+    from tftpy import TftpException, TftpServer
+    from tftpy.TftpContexts import TftpContextClientDownload
+    HAS_TFTPY = True
+except ImportError:
+    HAS_TFTPY = False
+
+# read size of the buffered reader used for files, many blocks per read
+READ_BUFFER_SIZE = 256 * 1024
+
+OP_WRQ = 2
+OP_DATA = 3
+OP_ACK = 4
+OP_ERROR = 5
+OP_OACK = 6
+ERROR_UNKNOWN_TID = 5
+ERROR_OPTIONS = 8
+
+DEFAULT_BLKSIZE = 512
+MIN_BLKSIZE = 8
+MAX_BLKSIZE = 65464
+# the largest block that fits an Ethernet frame with the IP, UDP and TFTP headers
+AUTO_BLKSIZE = 1468
+MAX_WINDOWSIZE = 65535
+
+# retransmission timeout bounds in seconds, the upper one is the timeout option
+INITIAL_RTO = 1.0
+MIN_RTO = 0.05
+CLOCK_GRANULARITY = 0.01
+
+
+class TftpError(Exception):
+    """An error sent by the server or a transfer that could not complete.
+
+    Args:
+        msg: The error message.
+        code: The TFTP error code sent by the server, if any.
+    """
+
+    def __init__(self, msg, code=None):
+        super(TftpError, self).__init__(msg)
+        self.code = code
+
+
+def encode_request(opcode, filename, options):
+    parts = [to_bytes(filename), b'octet']
+    for key in sorted(options):
+        parts.extend([to_bytes(key), to_bytes(str(options[key]))])
+    return struct.pack('!H', opcode) + b'\0'.join(parts) + b'\0'
+
+
+def decode_options(data):
+    fields = data.split(b'\0')
+    return dict((to_text(key).lower(), to_text(value)) for key, value in zip(fields[0::2], fields[1::2]) if key)
+
+
+class RetransmitTimer(object):
+    """Compute the retransmission timeout from measured round trip times
+    the way TCP does (RFC 6298).
+
+    The timeout follows the smoothed round trip time and its variation, so
+    a lost packet on a local link is sent again after a few milliseconds
+    while a slow WAN link gets the time it needs.  Every timeout doubles it
+    up to `maximum`.
+
+    Args:
+        maximum: The largest timeout in seconds.
+        initial: The timeout before the first measurement.
+        minimum: The smallest timeout in seconds.
+    """
+
+    def __init__(self, maximum, initial=INITIAL_RTO, minimum=MIN_RTO):
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.rto = min(initial, maximum)
+        self.srtt = None
+        self.rttvar = None
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        rto = self.srtt + max(CLOCK_GRANULARITY, 4 * self.rttvar)
+        self.rto = max(self.minimum, min(self.maximum, rto))
+
+    def backoff(self):
+        self.rto = min(self.maximum, self.rto * 2)
+
+
+class WindowedUpload(object):
+    """Send a file-like object to a TFTP server in octet mode.
+
+    The block size and the window size are negotiated as options (RFC 2347,
+    2348 and 7440).  Up to `windowsize` blocks are sent before waiting for
+    an acknowledgement, so over links with latency the transfer is not held
+    to one block per round trip.  With the defaults no option is requested
+    and 512 byte blocks are sent one at a time as in RFC 1350, as do servers
+    that ignore or refuse the options.  Only the blocks of the current
+    window are held in memory.
+
+    Packets are sent again after a timeout computed from the measured round
+    trip time, see RetransmitTimer.  Only acknowledgements of blocks sent
+    once are measured.
+
+    Args:
+        host: The IP address or hostname of the TFTP server.
+        port: The port of the TFTP server.
+        filename: The destination filename on the server.
+        src: A file-like object to read the content from.
+        blocksize: The block size to request, `AUTO_BLKSIZE` fits an
+            Ethernet frame.  The server may accept a smaller one.
+        windowsize: The number of blocks to send per acknowledgement.
+        timeout: The longest time in seconds to wait for a reply before
+            sending again.
+        retries: The number of times a packet is sent again without a reply
+            before giving up.
+        deadline: Give up when the whole transfer takes longer than this
+            many seconds, no limit if None.
+    """
+
+    def __init__(self, host, port, filename, src, blocksize=DEFAULT_BLKSIZE, windowsize=1, timeout=5, retries=5,
+                 deadline=None):
+        if not MIN_BLKSIZE <= blocksize <= MAX_BLKSIZE:
+            raise ValueError('blocksize must be between %d and %d' % (MIN_BLKSIZE, MAX_BLKSIZE))
+        if not 1 <= windowsize <= MAX_WINDOWSIZE:
+            raise ValueError('windowsize must be between 1 and %d' % MAX_WINDOWSIZE)
+
+        self.filename = filename
+        self.src = src
+        self.options = dict()
+        if blocksize != DEFAULT_BLKSIZE:
+            self.options['blksize'] = blocksize
+        if windowsize != 1:
+            self.options['windowsize'] = windowsize
+        self.blksize = DEFAULT_BLKSIZE
+        self.windowsize = 1
+        self.timer = RetransmitTimer(timeout)
+        self.retries = retries
+        self.deadline = deadline
+        self.expires = None
+        self.retransmits = 0
+        self.timeouts = 0
+
+        family, dummy, dummy, dummy, self.address = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0]
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.peer = None
+
+    def close(self):
+        self.sock.close()
+
+    def receive(self):
+        """Wait for the next packet from the server.
+
+        Returns:
+            A tuple of the opcode and the rest of the packet, None on timeout.
+        """
+        now = time.time()
+        if self.expires is not None and now >= self.expires:
+            raise TftpError('The transfer did not complete within %s seconds' % self.deadline)
+        deadline = now + self.timer.rto
+        if self.expires is not None:
+            deadline = min(deadline, self.expires)
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                data, address = self.sock.recvfrom(MAX_BLKSIZE + 4)
+            except socket.timeout:
+                return None
+            if self.peer is None:
+                # the server answers from a new port, its transfer ID
+                self.peer = address
+            elif address[:2] != self.peer[:2]:
+                self.sock.sendto(struct.pack('!HH', OP_ERROR, ERROR_UNKNOWN_TID) + b'Unknown transfer ID\0', address)
+                continue
+            if len(data) < 2:
+                continue
+            opcode = struct.unpack('!H', data[:2])[0]
+            if opcode == OP_ERROR:
+                code = struct.unpack('!H', data[2:4])[0] if len(data) >= 4 else None
+                message = to_text(data[4:].split(b'\0')[0], errors='surrogate_then_replace')
+                raise TftpError(message or 'TFTP error %s' % code, code)
+            return opcode, data[2:]
+
+    def request(self, options):
+        """Send the write request and wait for the server to accept it.
+
+        Returns:
+            The options accepted by the server, empty if it ignored them.
+        """
+        packet = encode_request(OP_WRQ, self.filename, options)
+        self.peer = None
+        for attempt in range(self.retries + 1):
+            sent_at = time.time()
+            self.sock.sendto(packet, self.address)
+            reply = self.receive()
+            if reply is None:
+                self.timeouts += 1
+                self.timer.backoff()
+                self.peer = None
+                continue
+            opcode, data = reply
+            if opcode in (OP_OACK, OP_ACK) and attempt == 0:
+                self.timer.sample(time.time() - sent_at)
+            if opcode == OP_OACK:
+                return decode_options(data)
+            if opcode == OP_ACK and data[:2] == b'\0\0':
+                return dict()
+            self.peer = None
+        raise TftpError('Timed out waiting for the server to accept %s' % self.filename)
+
+    def negotiate(self):
+        try:
+            accepted = self.request(self.options)
+        except TftpError as err:
+            # servers without option support may refuse the request instead of ignoring the options
+            if not self.options or err.code not in (0, 4, ERROR_OPTIONS):
+                raise
+            accepted = self.request(dict())
+
+        try:
+            blksize = int(accepted.get('blksize', DEFAULT_BLKSIZE))
+            windowsize = int(accepted.get('windowsize', 1))
+        except ValueError:
+            raise TftpError('The server sent invalid options: %s' % accepted)
+        if not MIN_BLKSIZE <= blksize <= self.options.get('blksize', DEFAULT_BLKSIZE) \
+                or not 1 <= windowsize <= self.options.get('windowsize', 1):
+            raise TftpError('The server sent options that were not requested: %s' % accepted)
+        self.blksize = blksize
+        self.windowsize = windowsize
+
+    def send_block(self, number, data):
+        self.sock.sendto(struct.pack('!HH', OP_DATA, number & 0xffff) + data, self.peer)
+
+    def run(self):
+        """Negotiate and send the whole file.
+
+        Returns:
+            The transfer metrics, the number of `bytes` and `blocks` sent,
+            the `duration` in seconds, the `throughput` in bytes per second,
+            the number of blocks sent again in `retransmits`, the number of
+            `timeouts`, the smoothed round trip time in `rtt` and the last
+            retransmission timeout in `rto`, both in seconds, and the
+            negotiated `options`.
+        """
+        started = time.time()
+        if self.deadline is not None:
+            self.expires = started + self.deadline
+        self.negotiate()
+
+        window = list()
+        sent = 0
+        last = 0
+        acked = 0
+        size = 0
+        finished = False
+        failures = 0
+        # the highest block sent so far and when the last burst of blocks
+        # sent for the first time went out, to measure the round trip time
+        highest = 0
+        sent_at = None
+        while not finished or window:
+            while not finished and len(window) < self.windowsize:
+                data = self.src.read(self.blksize)
+                last += 1
+                size += len(data)
+                finished = len(data) < self.blksize
+                window.append(data)
+            if sent < len(window):
+                first = acked + sent + 1
+                for index in range(sent, len(window)):
+                    self.send_block(acked + index + 1, window[index])
+                sent = len(window)
+                sent_at = time.time() if first > highest else None
+                highest = max(highest, acked + sent)
+
+            reply = self.receive()
+            if reply is None:
+                self.timeouts += 1
+                failures += 1
+                if failures > self.retries:
+                    raise TftpError('Timed out waiting for block %d to be acknowledged' % (acked + 1))
+                self.timer.backoff()
+                self.retransmits += len(window)
+                sent = 0
+                continue
+
+            opcode, data = reply
+            if opcode == OP_OACK:
+                # the server did not see the first block and sent its options again
+                number = 0
+            elif opcode == OP_ACK and len(data) >= 2:
+                number = struct.unpack('!H', data[:2])[0]
+            else:
+                continue
+
+            # acknowledgements carry the block number modulo 2**16
+            progress = (number - acked) & 0xffff
+            if progress == 0 or progress > len(window):
+                continue
+            failures = 0
+            if sent_at is not None:
+                self.timer.sample(time.time() - sent_at)
+                sent_at = None
+            del window[:progress]
+            acked += progress
+            # after a partial acknowledgement a block was lost, the server
+            # dropped the rest of the window so go on from the next block
+            self.retransmits += len(window)
+            sent = 0
+
+        duration = time.time() - started
+        return {
+            'bytes': size,
+            'blocks': last,
+            'duration': round(duration, 3),
+            'throughput': int(size / duration) if duration > 0 else size,
+            'retransmits': self.retransmits,
+            'timeouts': self.timeouts,
+            'rtt': round(self.timer.srtt, 4) if self.timer.srtt is not None else None,
+            'rto': round(self.timer.rto, 4),
+            'options': {'blksize': self.blksize, 'windowsize': self.windowsize},
+        }
+
+
+def upload(host, port, filename, src, blocksize=DEFAULT_BLKSIZE, windowsize=1, timeout=5, retries=5, deadline=None,
+           compress=False):
+    """Upload a file-like object to a TFTP server.
+
+    Args:
+        host: The IP address or hostname of the TFTP server.
+        port: The port of the TFTP server.
+        filename: The destination filename on the server.
+        src: A file-like object to read the content from.
+        blocksize: The TFTP blocksize to request.
+        windowsize: The number of blocks to send per acknowledgement.
+        timeout: The longest time in seconds to wait for a reply before
+            sending again.
+        retries: The number of times a packet is sent again without a reply
+            before giving up.
+        deadline: Give up when the whole transfer takes longer than this
+            many seconds, no limit if None.
+        compress: Send the content gzip compressed as it is read, the
+            filename is used as given.
+
+    Returns:
+        The result of WindowedUpload.run.
+    """
+    if compress:
+        src = GzipReader(src)
+    transfer = WindowedUpload(host, port, filename, src, blocksize=blocksize, windowsize=windowsize,
+                              timeout=timeout, retries=retries, deadline=deadline)
+    try:
+        return transfer.run()
+    finally:
+        transfer.close()
+
+
+def upload_file(host, port, filename, path, blocksize=DEFAULT_BLKSIZE, windowsize=1, timeout=5, retries=5, deadline=None,
+                compress=False):
+    """Stream a local file to a TFTP server.
+
+    The file is sent byte for byte in octet mode, so binary files such as
+    firmware images arrive unchanged.  It is read through a buffered binary
+    reader one block at a time, so memory use does not depend on the size of
+    the file.
+
+    Args:
+        host: The IP address or hostname of the TFTP server.
+        port: The port of the TFTP server.
+        filename: The destination filename on the server.
+        path: The path of the local file to send.
+        blocksize: The TFTP blocksize to request.
+        windowsize: The number of blocks to send per acknowledgement.
+        timeout: The longest time in seconds to wait for a reply.
+        retries: The number of times a packet is sent again without a reply.
+        deadline: The longest time in seconds the transfer may take.
+        compress: Send the content gzip compressed.
+
+    Returns:
+        The result of WindowedUpload.run.
+    """
+    with open(path, 'rb', READ_BUFFER_SIZE) as src:
+        return upload(host, port, filename, src, blocksize=blocksize, windowsize=windowsize,
+                      timeout=timeout, retries=retries, deadline=deadline, compress=compress)
+
+
+def download(host, port, filename, dest, blocksize=512):
+    """Download a file from a TFTP server into a file-like object.
+
+    Args:
+        host: The IP address or hostname of the TFTP server.
+        port: The port of the TFTP server.
+        filename: The filename on the server.
+        dest: A file-like object to write the content to.
+        blocksize: The TFTP blocksize to request.
+
+    Returns:
+        False if the server does not have the file, True otherwise.
+    """
+    context = TftpContextClientDownload(host, port, filename, dest, {'blksize': blocksize},
+                                        None, 5, flock=False)
+    try:
+        with context:
+            context.start()
+    except TftpException as err:
+        if 'not found' in str(err).lower():
+            return False
+        raise
+    return True
+
+
+class _Upload(object):
+    """File object handed to tftpy for an incoming upload.
+
+    Data is written to a temporary name that is only moved into place, and
+    reported to the server, once the transfer has completed.
+    """
+
+    def __init__(self, server, path, context):
+        self._server = server
+        self._path = path
+        self._context = context
+        self._file = open(path + '.part', 'wb')
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def close(self):
+        if self._file.closed:
+            return
+        size = self._file.tell()
+        self._file.close()
+        # tftpy clears the session state once the last block is acknowledged
+        if self._context.state is None:
+            os.rename(self._path + '.part', self._path)
+            self._server._completed(self._path, size, self._context.host)
+        else:
+            os.remove(self._path + '.part')
+
+
+class LocalTftpServer(object):
+    """Run a short-lived TFTP server on the controller.
+
+    The server is started in a background thread when the context is entered
+    and stopped once all running sessions are complete when it is left.
+    Uploads from any number of clients are accepted concurrently and every
+    completed upload is recorded in `received`.
+
+    Args:
+        root: The directory to serve files from and write uploads to.
+        listen_ip: The address to listen on, all addresses if empty.
+        port: The UDP port to listen on, 0 picks a free port.
+        timeout: Socket timeout used by the server loop and its sessions.
+        allowed: The filenames, relative to root, that may be uploaded.
+            Uploads of other files are refused with an access violation
+            and recorded in `rejected`.  Any file may be uploaded if None.
+    """
+
+    def __init__(self, root, listen_ip='', port=69, timeout=5, allowed=None):
+        self.server = TftpServer(root, upload_open=self._upload_open)
+        self.root = self.server.root
+        self.listen_ip = listen_ip
+        self.port = port
+        self.timeout = timeout
+        self.allowed = None if allowed is None else set(os.path.normpath(f.lstrip('/')) for f in allowed)
+        self.error = None
+        self.received = {}
+        self.rejected = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _upload_open(self, path, context):
+        filename = os.path.relpath(path, self.root)
+        if self.allowed is not None and filename not in self.allowed:
+            with self._lock:
+                self.rejected.append({'filename': filename, 'host': context.host})
+            # tftpy answers None with an access violation
+            return None
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        return _Upload(self, path, context)
+
+    def _completed(self, path, size, host):
+        filename = os.path.relpath(path, self.root)
+        with self._lock:
+            self.received[filename] = {'filename': filename, 'path': path, 'size': size, 'host': host}
+
+    def _listen(self):
+        try:
+            self.server.listen(self.listen_ip, self.port, timeout=self.timeout)
+        except Exception as err:
+            self.error = err
+
+    def start(self):
+        self._thread = threading.Thread(target=self._listen)
+        self._thread.daemon = True
+        self._thread.start()
+        while not self.server.is_running.wait(0.1):
+            if not self._thread.is_alive():
+                raise self.error or RuntimeError('TFTP server stopped unexpectedly')
+        self.port = self.server.listenport
+
+    def wait(self, filenames, timeout):
+        """Wait until all of the given files have been received.
+
+        Returns:
+            The list of filenames still missing when the timeout expired.
+        """
+        deadline = time.time() + timeout
+        while True:
+            with self._lock:
+                missing = [f for f in filenames if f not in self.received]
+            if not missing or time.time() >= deadline:
+                return missing
+            time.sleep(min(0.5, max(0, deadline - time.time())))
+
+    def stop(self):
+        if self._thread and self._thread.is_alive():
+            self.server.stop(now=False)
+            # wake the select loop so an idle server exits right away
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.sendto(b'', (self.listen_ip or '127.0.0.1', self.port))
+                sock.close()
+            except socket.error:
+                pass
+            self._thread.join(self.timeout * 2)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
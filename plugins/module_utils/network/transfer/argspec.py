@@ -0,0 +1,91 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""The options of the transfer modules.
+
+The modules also run as action plugins on the controller, both validate
+their options with the same keyword arguments, given to AnsibleModule or to
+ActionBase.validate_argument_spec, so the two can not drift apart.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+TFTP_SEND = dict(
+    argument_spec=dict(
+        host=dict(type='str', required=True),
+        port=dict(default=69, type='int'),
+        src=dict(type='str'),
+        src_path=dict(type='path'),
+        dest_filename=dict(type='str', required=True),
+        blocksize=dict(default=512, type='int'),
+        windowsize=dict(default=1, type='int'),
+        timeout=dict(default=5, type='int'),
+        retries=dict(default=5, type='int'),
+        deadline=dict(type='int'),
+        compress=dict(default=False, type='bool')
+    ),
+    mutually_exclusive=[('src', 'src_path')],
+    required_one_of=[('src', 'src_path')],
+)
+
+SFTP_SEND = dict(
+    argument_spec=dict(
+        host=dict(type='str', required=True),
+        port=dict(default=22, type='int'),
+        username=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        src=dict(type='str'),
+        src_path=dict(type='path'),
+        dest_filename=dict(type='str'),
+        files=dict(type='list', elements='dict', options=dict(
+            src=dict(type='str'),
+            src_path=dict(type='path'),
+            dest=dict(type='str', required=True)
+        ), mutually_exclusive=[('src', 'src_path')], required_one_of=[('src', 'src_path')]),
+        concurrency=dict(default=1, type='int'),
+        pool=dict(default=False, type='bool'),
+        pool_idle_timeout=dict(default=60, type='int'),
+        skip_unchanged=dict(default=False, type='bool'),
+        compare=dict(default='hash', choices=['size', 'hash', 'remote_hash']),
+        compress=dict(default=False, type='bool'),
+        chunk_size=dict(default=32768, type='int'),
+        atomic=dict(default=True, type='bool'),
+        resume=dict(default=False, type='bool')
+    ),
+    mutually_exclusive=[('src', 'src_path', 'files')],
+    required_one_of=[('src', 'src_path', 'files')],
+    required_by={'src': 'dest_filename', 'src_path': 'dest_filename'},
+)
+
+SFTP_FETCH = dict(
+    argument_spec=dict(
+        host=dict(type='str', required=True),
+        port=dict(default=22, type='int'),
+        username=dict(type='str', required=True),
+        password=dict(type='str', required=True, no_log=True),
+        src=dict(type='list', elements='str', required=True),
+        dest=dict(type='path', required=True),
+        concurrency=dict(default=1, type='int'),
+        skip_unchanged=dict(default=True, type='bool'),
+        compare=dict(default='mtime', choices=['mtime', 'hash', 'remote_hash'])
+    ),
+)
+
+FANOUT_SEND = dict(
+    argument_spec=dict(
+        src=dict(type='str'),
+        src_path=dict(type='path'),
+        dest=dict(type='list', elements='str', required=True, no_log=True),
+        username=dict(type='str'),
+        password=dict(type='str', no_log=True),
+        compress=dict(default=False, type='bool'),
+        atomic=dict(default=True, type='bool'),
+        blocksize=dict(default=512, type='int'),
+        windowsize=dict(default=1, type='int'),
+        timeout=dict(default=5, type='int'),
+        retries=dict(default=5, type='int')
+    ),
+    mutually_exclusive=[('src', 'src_path')],
+    required_one_of=[('src', 'src_path')],
+)
@@ -0,0 +1,93 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import zlib
+
+READ_SIZE = 64 * 1024
+GZIP_SUFFIX = '.gz'
+
+
+def gzip_filename(filename):
+    """The destination filename of compressed content."""
+    if filename.endswith(GZIP_SUFFIX):
+        return filename
+    return filename + GZIP_SUFFIX
+
+
+class GzipReader(object):
+    """Compress a file-like object into the gzip format as it is read.
+
+    Only the data of one read and its compressed output are held in memory,
+    a compressed copy of the whole file is never built.  Every read of
+    `size` bytes returns exactly that many until the end, like a file, so
+    senders that take a short read as the last block work unchanged.
+
+    The header holds no name or time stamp, so the same content always
+    compresses to the same bytes and can be compared with a digest.
+
+    Args:
+        src: A file-like object to read the content from.  It must be
+            seekable for seek to work.
+        level: The zlib compression level.
+    """
+
+    def __init__(self, src, level=6):
+        self.src = src
+        self.level = level
+        self.reset()
+
+    def reset(self):
+        self.compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.buffer = bytearray()
+        self.position = 0
+        self.done = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.src.close()
+
+    def read(self, size=-1):
+        while not self.done and (size is None or size < 0 or len(self.buffer) < size):
+            data = self.src.read(READ_SIZE)
+            if data:
+                self.buffer += self.compressor.compress(data)
+            else:
+                self.buffer += self.compressor.flush()
+                self.done = True
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        self.position += len(data)
+        return data
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        """Rewind to the start or compress up to the end, as needed to find
+        the size and digest of the compressed content."""
+        if offset != 0 or whence not in (os.SEEK_SET, os.SEEK_END):
+            raise IOError('A gzip stream can only seek to its start or end')
+        if whence == os.SEEK_SET:
+            self.src.seek(0)
+            self.reset()
+        else:
+            while self.read(READ_SIZE):
+                pass
+        return self.position
+
+
+def gzip_source(source):
+    """Wrap a function returning a file-like object, as taken by
+    sftp.send_files, into one returning its GzipReader."""
+    return lambda: GzipReader(source())
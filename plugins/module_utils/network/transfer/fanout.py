@@ -0,0 +1,208 @@
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Send one source to several TFTP and SFTP servers at once.
+
+The source is read, and compressed, a single time.  Every chunk is handed
+to a bounded queue per destination, the chunks are shared and not copied,
+and each destination is sent from its own thread reading its queue like a
+file.  A slow destination holds the others back once its queue is full,
+so memory use stays at `depth` chunks per destination whatever the size of
+the source.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.six.moves import queue
+from ansible.module_utils.six.moves.urllib.parse import quote, unquote, urlsplit, urlunsplit
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+READ_SIZE = 64 * 1024
+QUEUE_DEPTH = 16
+DEFAULT_PORTS = {'sftp': 22, 'tftp': 69}
+
+
+def parse_destination(url, username=None, password=None):
+    """Split a `sftp://[user[:password]@]host[:port]/path` or
+    `tftp://host[:port]/filename` URL.
+
+    The SFTP path is used as given, starting at the root, the leading slash
+    of a TFTP filename is dropped as servers take it relative to their
+    root.  `username` and `password` are used where the URL has none.
+
+    Returns:
+        A dict with the `protocol`, `host`, `port`, `username`, `password`,
+        `filename` and the `url` without the password.
+
+    Raises:
+        ValueError: The URL can not be used.
+    """
+    parts = urlsplit(url)
+    protocol = parts.scheme.lower()
+    if protocol not in DEFAULT_PORTS:
+        raise ValueError('%s: the protocol must be sftp or tftp' % url)
+    if not parts.hostname:
+        raise ValueError('%s: the host is missing' % url)
+    filename = unquote(parts.path)
+    if protocol == 'tftp':
+        filename = filename.lstrip('/')
+    if not filename or filename.endswith('/'):
+        raise ValueError('%s: the filename is missing' % url)
+    destination = {
+        'protocol': protocol,
+        'host': parts.hostname,
+        'port': parts.port or DEFAULT_PORTS[protocol],
+        'username': unquote(parts.username) if parts.username else username,
+        'password': unquote(parts.password) if parts.password else password,
+        'filename': filename,
+    }
+    if protocol == 'sftp' and not (destination['username'] and destination['password']):
+        raise ValueError('%s: SFTP needs a username and password' % url)
+    netloc = parts.hostname
+    if ':' in netloc:
+        netloc = '[%s]' % netloc
+    if parts.port:
+        netloc = '%s:%d' % (netloc, parts.port)
+    if parts.username:
+        netloc = '%s@%s' % (parts.username, netloc)
+    destination['url'] = urlunsplit((protocol, netloc, parts.path, '', ''))
+    return destination
+
+
+def with_filename(destination, filename):
+    """A copy of a parsed destination sending to another filename."""
+    parts = urlsplit(destination['url'])
+    path = quote(filename if filename.startswith('/') else '/' + filename)
+    return dict(destination, filename=filename, url=urlunsplit((parts.scheme, parts.netloc, path, '', '')))
+
+
+class BroadcastReader(object):
+    """One destination's view of a Broadcast, read like a file.
+
+    Every read of `size` bytes returns exactly that many until the end, so
+    the TFTP sender sees a short read only at the last block.
+    """
+
+    def __init__(self, depth=QUEUE_DEPTH):
+        self.queue = queue.Queue(depth)
+        self.buffer = bytearray()
+        self.done = False
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def put(self, data):
+        # a closed reader is dropped so a failed destination does not stall the rest
+        while not self.closed:
+            try:
+                self.queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def read(self, size=-1):
+        while not self.done and (size is None or size < 0 or len(self.buffer) < size):
+            data = self.queue.get()
+            if isinstance(data, Exception):
+                self.done = True
+                raise IOError('Could not read the source: %s' % to_text(data))
+            if data:
+                self.buffer += data
+            else:
+                self.done = True
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class Broadcast(object):
+    """Read a source once and hand every chunk to a number of readers.
+
+    Args:
+        src: A file-like object to read the content from.
+        count: The number of readers.
+        chunk_size: The number of bytes read at once.
+        depth: The number of chunks a reader may fall behind.
+    """
+
+    def __init__(self, src, count, chunk_size=READ_SIZE, depth=QUEUE_DEPTH):
+        self.src = src
+        self.chunk_size = chunk_size
+        self.readers = [BroadcastReader(depth) for dummy in range(count)]
+
+    def run(self):
+        try:
+            while True:
+                data = self.src.read(self.chunk_size)
+                for reader in self.readers:
+                    reader.put(data)
+                if not data:
+                    return
+        except Exception as err:
+            for reader in self.readers:
+                reader.put(err)
+
+
+def upload(destination, src, sftp_options=None, tftp_options=None):
+    """Send a file-like object to one parsed destination.
+
+    Returns:
+        The transfer metrics of sftp.send_fileobj or tftp.upload.
+    """
+    if destination['protocol'] == 'sftp':
+        return sftp.upload_fileobj(destination['host'], destination['port'], destination['username'],
+                                   destination['password'], destination['filename'], src, **(sftp_options or {}))
+    return tftp.upload(destination['host'], destination['port'], destination['filename'], src, **(tftp_options or {}))
+
+
+def fan_out(src, destinations, sftp_options=None, tftp_options=None, chunk_size=READ_SIZE):
+    """Send one file-like object to all of the parsed destinations at once.
+
+    Args:
+        src: A file-like object to read the content from.
+        destinations: A list of parse_destination results.
+        sftp_options: Keyword arguments for sftp.send_fileobj.
+        tftp_options: Keyword arguments for tftp.upload.
+        chunk_size: The number of bytes read from `src` at once.
+
+    Returns:
+        A list with the metrics of every destination, in order, with its
+        `url` added as `dest`.  Destinations that could not be sent to have
+        `failed` and `msg` instead of the metrics.
+    """
+    broadcast = Broadcast(src, len(destinations), chunk_size=chunk_size)
+
+    def send(item):
+        destination, reader = item
+        try:
+            with reader:
+                result = upload(destination, reader, sftp_options, tftp_options)
+        except Exception as err:
+            result = {'failed': True, 'msg': to_text(err)}
+        result['dest'] = destination['url']
+        return result
+
+    producer = threading.Thread(target=broadcast.run)
+    producer.daemon = True
+    # every destination needs its own thread, the readers are fed in step
+    with ThreadPoolExecutor(max_workers=max(1, len(destinations))) as pool:
+        results = pool.map(send, zip(destinations, broadcast.readers))
+        producer.start()
+        results = list(results)
+    producer.join()
+    return results
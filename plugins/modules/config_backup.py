@@ -0,0 +1 @@
+network/backup/config_backup.py
\ No newline at end of file
@@ -0,0 +1 @@
+network/edgeswitch/edgeswitch_copy.py
\ No newline at end of file
@@ -0,0 +1 @@
+network/edgeswitch/edgeswitch_counters.py
\ No newline at end of file
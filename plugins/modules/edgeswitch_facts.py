@@ -0,0 +1 @@
+network/edgeswitch/edgeswitch_facts.py
\ No newline at end of file
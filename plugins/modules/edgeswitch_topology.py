@@ -0,0 +1 @@
+network/edgeswitch/edgeswitch_topology.py
\ No newline at end of file
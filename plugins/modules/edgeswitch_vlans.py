@@ -0,0 +1 @@
+network/edgeswitch/edgeswitch_vlans.py
\ No newline at end of file
@@ -0,0 +1 @@
+network/transfer/fanout_send.py
\ No newline at end of file
@@ -0,0 +1,266 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: config_backup
+author:
+  - Matt Haught (@haught)
+short_description: Back up the output of a device command straight to a TFTP or SFTP server
+description:
+  - This module runs a command, C(show running-config) by default, over the
+    connection to a network device and uploads its output to a TFTP or SFTP
+    server in one step.
+  - The output is read from the connection and uploaded by the module
+    itself and is never returned, so the config does not become a task
+    variable and is not passed through module arguments again.  The whole
+    output is held in memory while it is uploaded.
+  - The file already on the server is read and hashed first, and the output
+    is only uploaded when it differs.  Lines matching I(ignore_lines), such
+    as the uptime comment in EdgeSwitch configs, are left out of the
+    comparison.
+  - It works with any device that has a C(network_cli) connection, such as
+    EdgeSwitch and APC NMC devices.
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  command:
+    description:
+      - The command whose output is backed up.
+    required: False
+    default: show running-config
+    type: str
+  protocol:
+    description:
+      - The protocol used to upload the output.
+    required: False
+    default: tftp
+    choices: ['tftp', 'sftp']
+    type: str
+  host:
+    description:
+      - The IP address or hostname of the backup server.
+    required: True
+    type: str
+  port:
+    description:
+      - The port of the backup server, 69 for TFTP and 22 for SFTP if not
+        given.
+    required: False
+    type: int
+  username:
+    description:
+      - The username for SFTP.
+    required: False
+    type: str
+  password:
+    description:
+      - The password for SFTP.
+    required: False
+    type: str
+  filename:
+    description:
+      - The destination filename on the server.
+    required: True
+    type: str
+  ignore_lines:
+    description:
+      - Regular expressions of lines that are not compared to decide whether
+        the backup changed.  The lines are still uploaded.
+    required: False
+    default: ['^!System Up Time', '^!Current SNTP Synchronized Time']
+    type: list
+    elements: str
+  force:
+    description:
+      - Upload the output even when it is the same as the file on the
+        server.
+    required: False
+    default: False
+    type: bool
+requirements:
+  - tftpy for TFTP
+  - python fabric (fabric) for SFTP
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+'''
+
+EXAMPLES = """
+- name: Back up changed configs to the TFTP server
+  ncstate.network.config_backup:
+    host: 10.0.0.5
+    filename: "backups/{{ inventory_hostname }}.cfg"
+
+- name: Back up an APC NMC over SFTP
+  ncstate.network.config_backup:
+    command: cat config.ini
+    protocol: sftp
+    host: backup.example.com
+    username: backup
+    password: "{{ backup_password }}"
+    filename: "/srv/backups/{{ inventory_hostname }}.ini"
+"""
+
+RETURN = """
+filename:
+  description: The destination filename on the server
+  returned: always
+  type: str
+  sample: backups/sw1.cfg
+size:
+  description: The size of the output in bytes
+  returned: always
+  type: int
+  sample: 24311
+checksum:
+  description: The SHA1 checksum of the compared lines of the output
+  returned: always
+  type: str
+  sample: 2d7a1c8b4f1e38f5f7c0f5b1d8a4c3e2b1a09f7e
+uploaded:
+  description: Whether the output was uploaded
+  returned: always
+  type: bool
+  sample: true
+"""
+import hashlib
+import io
+import re
+
+from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.connection import Connection, ConnectionError
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+
+class LineDigest(object):
+    """A write-only file object hashing the lines written to it, leaving
+    out the lines that match any of the ignore expressions."""
+
+    def __init__(self, ignore_lines=None):
+        self.ignore = [re.compile(to_bytes(item)) for item in ignore_lines or []]
+        self.size = 0
+        self._sha1 = hashlib.sha1()
+        self._partial = b''
+
+    def write(self, data):
+        self.size += len(data)
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._update(line)
+        return len(data)
+
+    def _update(self, line):
+        line = line.rstrip(b'\r')
+        if not any(regex.match(line) for regex in self.ignore):
+            self._sha1.update(line + b'\n')
+
+    def hexdigest(self):
+        if self._partial:
+            self._update(self._partial)
+            self._partial = b''
+        return self._sha1.hexdigest()
+
+
+def get_output(module):
+    try:
+        out = Connection(module._socket_path).get(command=module.params['command'])
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc))
+    data = to_bytes(out, errors='surrogate_then_replace')
+    if not data.endswith(b'\n'):
+        data += b'\n'
+    return data
+
+
+def get_existing_checksum(module):
+    """ stream the file on the server into a hash, None if there is no file
+    """
+    params = module.params
+    digest = LineDigest(params['ignore_lines'])
+    if params['protocol'] == 'sftp':
+        found = sftp.download(params['host'], params['port'] or 22, params['username'],
+                              params['password'], params['filename'], digest)
+    else:
+        found = tftp.download(params['host'], params['port'] or 69, params['filename'], digest)
+    return digest.hexdigest() if found else None
+
+
+def upload(module, data):
+    params = module.params
+    src = io.BytesIO(data)
+    if params['protocol'] == 'sftp':
+        sftp.upload_fileobj(params['host'], params['port'] or 22, params['username'],
+                            params['password'], params['filename'], src)
+    else:
+        tftp.upload(params['host'], params['port'] or 69, params['filename'], src)
+
+
+def main():
+    """ main entry point for module execution
+    """
+    argument_spec = dict(
+        command=dict(default='show running-config'),
+        protocol=dict(default='tftp', choices=['tftp', 'sftp']),
+        host=dict(required=True),
+        port=dict(type='int'),
+        username=dict(),
+        password=dict(no_log=True),
+        filename=dict(required=True),
+        ignore_lines=dict(type='list', elements='str',
+                          default=['^!System Up Time', '^!Current SNTP Synchronized Time']),
+        force=dict(type='bool', default=False)
+    )
+
+    required_if = [('protocol', 'sftp', ['username', 'password'])]
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_if=required_if,
+                           supports_check_mode=True)
+
+    if module.params['protocol'] == 'sftp' and not sftp.HAS_FABRIC:
+        module.fail_json(msg=missing_required_lib('fabric'))
+    if module.params['protocol'] == 'tftp' and not tftp.HAS_TFTPY:
+        module.fail_json(msg=missing_required_lib('tftpy'))
+
+    data = get_output(module)
+    digest = LineDigest(module.params['ignore_lines'])
+    digest.write(data)
+    checksum = digest.hexdigest()
+
+    result = {
+        'changed': False,
+        'filename': module.params['filename'],
+        'size': len(data),
+        'checksum': checksum,
+        'uploaded': False,
+    }
+
+    if not module.params['force']:
+        try:
+            existing = get_existing_checksum(module)
+        except Exception as err:
+            module.fail_json(msg='Failed to read the existing backup: %s' % to_native(err), **result)
+        if existing == checksum:
+            module.exit_json(**result)
+
+    if not module.check_mode:
+        try:
+            upload(module, data)
+        except Exception as err:
+            module.fail_json(msg='Failed to upload the backup: %s' % to_native(err), **result)
+        result['uploaded'] = True
+
+    result['changed'] = True
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
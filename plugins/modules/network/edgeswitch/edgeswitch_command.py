@@ -65,6 +65,30 @@ options:
     required: False
     default: 1
     type: int
+  parse:
+    description:
+      - Also return the output of the commands that have a parser as a list
+        of records in C(parsed).  Parsers exist for C(show interfaces status),
+        C(show mac-addr-table), C(show lldp remote-device), C(show vlan brief)
+        and C(show port-channel brief).
+    required: False
+    default: False
+    type: bool
+  output_file:
+    description:
+      - Path on the controller to write the output of the commands to
+        instead of returning it in C(stdout) and C(stdout_lines).  The
+        commands are run one at a time and every response is written as
+        soon as it is received, so only one response is held in memory.
+      - This argument is mutually exclusive with C(wait_for).
+    required: False
+    type: path
+  compress:
+    description:
+      - Compress C(output_file) with gzip.
+    required: False
+    default: False
+    type: bool
 
 notes:
   - Tested against EdgeSwitch 1.9.2
@@ -82,27 +106,66 @@ tasks:
     loop:
       - 0/1
       - 0/2
+
+  - name: Read the MAC address table as records
+    ncstate.network.edgeswitch_command:
+      commands: show mac-addr-table all
+      parse: yes
+    register: mac_table
+
+  - name: Save the tech-support output without returning it
+    ncstate.network.edgeswitch_command:
+      commands: show tech-support
+      output_file: "support/{{ inventory_hostname }}.txt.gz"
+      compress: yes
 """
 
 RETURN = """
 stdout:
   description: The set of responses from the commands
-  returned: always apart from low level errors (such as action plugin)
+  returned: when output_file is not set, apart from low level errors (such as action plugin)
   type: list
   sample: ['...', '...']
 stdout_lines:
   description: The value of stdout split into a list
-  returned: always
+  returned: when output_file is not set
   type: list
   sample: [['...', '...'], ['...'], ['...']]
+output_file:
+  description: The full path of the file the output was written to
+  returned: when output_file is set
+  type: str
+  sample: /playbooks/support/sw1.txt.gz
+output_sizes:
+  description: The number of bytes of output of each command, before compression
+  returned: when output_file is set
+  type: list
+  sample: [48213, 1922]
+parsed:
+  description: The parsed output of each command, null for commands without a parser
+  returned: when parse is yes
+  type: list
+  sample: [[{'vlan_id': '1', 'mac_address': '74:AC:B9:11:22:33', 'interface': '0/1',
+             'ifindex': '1', 'status': 'Learned'}]]
 """
+import gzip
+import os
+import tempfile
 import time
 
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.parsing import Conditional
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import transform_commands, to_lines
 from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.parsers import ParseError, parse_command
+
+
+def parse_output(module, command, output):
+    try:
+        return parse_command(command, output)
+    except ParseError as err:
+        module.fail_json(msg=to_text(err))
 
 
 def parse_commands(module, warnings):
@@ -120,22 +183,72 @@ def parse_commands(module, warnings):
     return commands
 
 
+def write_output(module, commands):
+    """ run the commands one by one and write every response to output_file
+    as it is received, returning the sizes and the parsed responses
+    """
+    path = os.path.abspath(module.params['output_file'])
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    sizes = list()
+    parsed = list()
+    fd, tmp = tempfile.mkstemp(dir=dirname)
+    written = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            out = gzip.GzipFile(fileobj=f, mode='wb', mtime=0) if module.params['compress'] else f
+            try:
+                for item in commands:
+                    response = to_text(run_commands(module, [item])[0])
+                    data = to_bytes(response.rstrip('\n') + '\n')
+                    out.write(data)
+                    sizes.append(len(data))
+                    if module.params['parse']:
+                        parsed.append(parse_output(module, item['command'], response))
+            finally:
+                if out is not f:
+                    out.close()
+        written = True
+    finally:
+        # fail_json exits with SystemExit, which is no Exception
+        if not written:
+            os.remove(tmp)
+    module.atomic_move(tmp, path)
+    return path, sizes, parsed
+
+
 def main():
     spec = dict(
         commands=dict(type='list', elements='str', required=True),
         wait_for=dict(type='list', elements='str'),
         match=dict(default='all', choices=['all', 'any']),
         retries=dict(default=10, type='int'),
-        interval=dict(default=1, type='int')
+        interval=dict(default=1, type='int'),
+        parse=dict(default=False, type='bool'),
+        output_file=dict(type='path'),
+        compress=dict(default=False, type='bool')
     )
 
-    module = AnsibleModule(argument_spec=spec, supports_check_mode=True)
+    mutually_exclusive = [('output_file', 'wait_for')]
+
+    module = AnsibleModule(argument_spec=spec,
+                           mutually_exclusive=mutually_exclusive,
+                           supports_check_mode=True)
 
     warnings = list()
     result = {'changed': False, 'warnings': warnings}
     commands = parse_commands(module, warnings)
     wait_for = module.params['wait_for'] or list()
 
+    if module.params['output_file']:
+        path, sizes, parsed = write_output(module, commands)
+        result.update({'output_file': path, 'output_sizes': sizes})
+        if module.params['parse']:
+            result['parsed'] = parsed
+        module.exit_json(**result)
+
     try:
         conditionals = [Conditional(c) for c in wait_for]
     except AttributeError as exc:
@@ -171,6 +284,10 @@ def main():
         'stdout_lines': list(to_lines(responses)),
     })
 
+    if module.params['parse']:
+        result['parsed'] = [parse_output(module, item['command'], to_text(response))
+                            for item, response in zip(commands, responses)]
+
     module.exit_json(**result)
 
 
@@ -19,6 +19,10 @@ description:
     for segmenting configuration into sections.  This module provides
     an implementation for working with Edgeswitch configuration sections
     in a deterministic way.
+  - With I(match=line) and I(replace=line) the running-config is split into
+    its sections once and every section is hashed, only the sections of
+    the candidate whose hash differs from the device are compared line by
+    line.
 
 options:
   lines:
@@ -47,6 +51,42 @@ options:
         path from the playbook or role root directory.  This argument is mutually
         exclusive with I(lines), I(parents).
     type: path
+  aggregate:
+    description:
+      - List of configuration blocks, each made up of I(lines) and optional
+        I(parents), I(before) and I(after).  Every block is matched against
+        a single fetch of the running-config and the resulting updates are
+        pushed to the device as one combined command set.  This argument is
+        mutually exclusive with I(lines), I(parents) and I(src).
+    type: list
+    elements: dict
+    suboptions:
+      lines:
+        description:
+          - The ordered set of commands that should be configured in the
+            section.
+        aliases: ['commands']
+        type: list
+        elements: str
+        required: True
+      parents:
+        description:
+          - The ordered set of parents that uniquely identify the section
+            the commands should be checked against.
+        type: list
+        elements: str
+      before:
+        description:
+          - The ordered set of commands to push on to the command stack if
+            a change needs to be made to this block.
+        type: list
+        elements: str
+      after:
+        description:
+          - The ordered set of commands to append to the command stack if
+            a change needs to be made to this block.
+        type: list
+        elements: str
   before:
     description:
       - The ordered set of commands to push on to the command stack if
@@ -85,8 +125,14 @@ options:
         mode.  If the replace argument is set to I(block) then the entire
         command block is pushed to the device in configuration mode if any
         line is not correct.
+      - If the replace argument is set to I(config) then I(src) is the
+        complete intended config.  Every section of the running-config is
+        made to match it, lines that are not in I(src) are removed with
+        their EdgeSwitch C(no) form, access lists that differ are removed and
+        added again and VLANs are created and removed by ID.  All changes
+        are pushed in a single batch and I(match) is ignored.
     default: line
-    choices: ['line', 'block']
+    choices: ['line', 'block', 'config']
     type: str
   backup:
     description:
@@ -136,6 +182,9 @@ options:
       - When this option is configured as I(running), the module will
         return the before and after diff of the running-config with respect
         to any changes made to the device configuration.
+      - The diff is returned as a list with a C(before) and C(after) dict
+        per section, not as a single C(before) and C(after) of the whole
+        config, and only the sections that differ are included.
     choices: ['startup', 'intended', 'running']
     type: str
   diff_ignore_lines:
@@ -178,6 +227,95 @@ options:
             and backup configuration will be copied in C(filename) within I(backup) directory.
         type: path
     type: dict
+  transfer:
+    description:
+      - Instead of sending the updates line by line through the CLI, stage them
+        as a configuration script on a TFTP or SFTP server and have the device
+        fetch it with C(copy) and run it with C(script apply).  The output of
+        the script apply is returned in C(transfer_log), the task fails if it
+        reports an error for any line of the script.
+      - Large pushes complete in seconds this way, while the CLI path sends and
+        waits for every line separately.
+    suboptions:
+      protocol:
+        description:
+          - The protocol the script is staged and fetched with.
+        choices: ['tftp', 'sftp']
+        default: tftp
+        type: str
+      host:
+        description:
+          - The IP address or hostname of the server as reached by the device.
+        required: True
+        type: str
+      port:
+        description:
+          - The port used to stage the script on the server.  The device always
+            fetches the script on the default port of the protocol.
+          - With I(serve) the local server always listens on port 69, any other
+            port is refused.
+        type: int
+      username:
+        description:
+          - The username for the SFTP server.
+        type: str
+      password:
+        description:
+          - The password for the SFTP server.
+        type: str
+      filename:
+        description:
+          - The path of the staged script on the server.
+        default: ansible.scr
+        type: str
+      script:
+        description:
+          - The name the script is stored under on the device.  EdgeSwitch
+            requires script names to end in C(.scr).
+        default: ansible.scr
+        type: str
+      serve:
+        description:
+          - Run a short-lived TFTP server on the controller to serve the script
+            instead of uploading it to I(host).  I(host) must then be an
+            address of the controller that the device can reach.
+          - The server listens on UDP port 69, binding it requires root, or
+            the C(CAP_NET_BIND_SERVICE) capability, on the controller.
+        type: bool
+        default: False
+      min_lines:
+        description:
+          - Only use the transfer when at least this many commands are to be
+            pushed, smaller updates are sent through the CLI.
+        default: 0
+        type: int
+    type: dict
+  checkpoint:
+    description:
+      - Path on the controller to store the running-config in before any
+        change is pushed.  The snapshot is the same config the updates are
+        computed against, so no extra fetch from the device is needed.
+      - The file is only written when there are changes to push, and never in
+        check mode.
+      - The file can be restored later with I(rollback).
+    type: path
+  rollback:
+    description:
+      - Path of a checkpoint written by I(checkpoint) to restore.  The
+        running-config is made to match the checkpoint like with
+        I(replace=config), so only the commands that undo the changes made
+        since the checkpoint are pushed.
+      - This argument is mutually exclusive with I(src), I(lines),
+        I(parents) and I(aggregate).
+    type: path
+  rollback_on_failure:
+    description:
+      - When the device rejects the pushed commands, read the running-config
+        again and push the commands that return it to the config from before
+        the change, then fail.
+      - This only covers updates pushed through the CLI, not I(transfer).
+    type: bool
+    default: False
 
 notes:
   - Tested against EdgeSwitch 1.9.2
@@ -209,6 +347,40 @@ EXAMPLES = """
     before: no ip access-list EXAMPLE
     match: exact
 
+- name: Configure many interfaces against a single running-config
+  ncstate.network.edgeswitch_config:
+    aggregate:
+      - parents: interface 0/1
+        lines:
+          - description uplink
+          - no shutdown
+      - parents: interface 0/2
+        lines:
+          - description access
+          - shutdown
+
+- name: Make the running-config match the generated config
+  ncstate.network.edgeswitch_config:
+    src: "{{ inventory_hostname }}.cfg"
+    replace: config
+
+- name: Store a checkpoint and undo the change if the device rejects it
+  ncstate.network.edgeswitch_config:
+    src: "{{ inventory_hostname }}.cfg"
+    checkpoint: "checkpoints/{{ inventory_hostname }}.cfg"
+    rollback_on_failure: yes
+
+- name: Roll back to the checkpoint
+  ncstate.network.edgeswitch_config:
+    rollback: "checkpoints/{{ inventory_hostname }}.cfg"
+
+- name: Push a large config as a script fetched over TFTP
+  ncstate.network.edgeswitch_config:
+    src: access-switch.cfg
+    transfer:
+      host: 10.0.0.5
+      filename: "{{ inventory_hostname }}.scr"
+
 - name: Configurable backup path
   ncstate.network.edgeswitch_config:
     backup: yes
@@ -234,13 +406,58 @@ backup_path:
   returned: when backup is yes
   type: str
   sample: /playbooks/ansible/backup/edgeswitch_config.2016-07-16@22:28:34
+checkpoint_path:
+  description: The full path to the checkpoint file
+  returned: when checkpoint is set and changes were pushed
+  type: str
+  sample: /playbooks/checkpoints/sw1.cfg
+rollback_commands:
+  description: The commands pushed to undo a failed change
+  returned: when a push failed and rollback_on_failure is yes
+  type: list
+  sample: ['interface 0/1', 'no shutdown', 'exit']
+transfer_log:
+  description: The output of applying the staged configuration script
+  returned: when the updates were pushed using transfer
+  type: list
+  sample: ['Configuration script ansible.scr applied.']
 """
 
+import io
+import os
 import re
-
-from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands, get_config, load_config
-from ansible.module_utils.basic import AnsibleModule
+import shutil
+import tempfile
+
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import (
+    get_config,
+    get_connection,
+    load_config,
+    run_commands,
+)
+from ansible.module_utils.connection import ConnectionError
+from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import NetworkConfig, dumps
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.config import (
+    SectionConfig,
+    indent_config,
+    dumps as section_dumps,
+)
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+CONFIRM_PROMPT = r'\(y/n\)'
+
+# the errors the edgeswitch terminal plugin fails commands on, script apply
+# reports them for the script lines but does not fail itself
+SCRIPT_ERRORS = [
+    re.compile(r'% ?Error'),
+    re.compile(r'invalid input', re.I),
+    re.compile(r'(?:incomplete|ambiguous) command', re.I),
+    re.compile(r'An invalid'),
+    re.compile(r'\S.* not found'),
+]
 
 
 def get_running_config(module, config=None):
@@ -253,29 +470,29 @@ def get_running_config(module, config=None):
     return NetworkConfig(contents=indent_config(contents))
 
 
-def indent_config(config):
-    """ indent the config so we can modify sections natively
+def get_running_sections(module, contents=None):
+    contents = module.params['running_config'] or contents or get_config(module)
+    return SectionConfig(contents=contents)
+
+
+def use_sections(module):
+    """ the section engine covers line matching one section deep, which is
+    every EdgeSwitch section, anything else goes through NetworkConfig
     """
-    parent_re = [
-        re.compile(r"^(?:vlan\sdatabase)$"),
-        re.compile(r"^(?:ip\saccess-list\s\S+)$"),
-        re.compile(r"^(?:line\s\S+)$"),
-        re.compile(r"^(?:interface\s\S+)$"),
-        re.compile(r"^(?:interface\slag\s\S+)$"),
-        re.compile(r"^(?:service\s\S+)$"),
-    ]
-    config_indented = list()
-    indent = False
-    for line in str(config).split("\n"):
-        if any(regex.match(line) for regex in parent_re):
-            config_indented.append(line)
-            indent = True
-        elif line == 'exit':
-            config_indented.append(line)
-            indent = False
-        else:
-            config_indented.append(" %s" % line if indent else line)
-    return "\n".join(config_indented)
+    if module.params['match'] != 'line' or module.params['replace'] != 'line':
+        return False
+    blocks = module.params['aggregate'] or [module.params]
+    return all(len(block['parents'] or []) <= 1 for block in blocks)
+
+
+def get_section_candidate(module):
+    candidate = SectionConfig()
+
+    if module.params['src']:
+        candidate.load(module.params['src'])
+    elif module.params['lines']:
+        candidate.add(module.params['lines'], parents=module.params['parents'])
+    return candidate
 
 
 def get_candidate(module):
@@ -289,6 +506,182 @@ def get_candidate(module):
     return candidate
 
 
+def get_aggregate_candidate(block):
+    candidate = NetworkConfig()
+    candidate.add(block['lines'], parents=block['parents'] or list())
+    return candidate
+
+
+def get_commands(candidate, config, match, replace, path=None):
+    if match != 'none':
+        configobjs = candidate.difference(config, match=match, replace=replace, path=path)
+    else:
+        configobjs = candidate.items
+
+    if not configobjs:
+        return list()
+    return dumps(configobjs, 'commands').split('\n')
+
+
+def get_aggregate_commands(module, config):
+    """ diff every aggregate block against the same running config
+    """
+    match = module.params['match']
+    replace = module.params['replace']
+
+    commands = list()
+    for block in module.params['aggregate']:
+        parents = block['parents'] or list()
+        if isinstance(config, SectionConfig):
+            candidate = SectionConfig()
+            candidate.add(block['lines'], parents=parents)
+            updates = section_dumps(candidate.difference(config), exit=True)
+        else:
+            updates = get_commands(get_aggregate_candidate(block), config, match, replace, path=parents)
+            # leave the section so the next block starts from global config
+            updates.extend(['exit'] * len(parents))
+        if not updates:
+            continue
+
+        if block['before']:
+            commands.extend(block['before'])
+        commands.extend(updates)
+        if block['after']:
+            commands.extend(block['after'])
+    return commands
+
+
+def get_replace_commands(intended, running):
+    """ the commands that make the running sections match the intended config
+    """
+    return section_dumps(SectionConfig(contents=intended).replace(running), exit=True)
+
+
+def write_checkpoint(module, contents):
+    path = os.path.abspath(module.params['checkpoint'])
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    fd, tmp = tempfile.mkstemp(dir=dirname)
+    with os.fdopen(fd, 'w') as f:
+        f.write(contents)
+    module.atomic_move(tmp, path)
+    return path
+
+
+def read_checkpoint(module):
+    path = module.params['rollback']
+    try:
+        with open(path) as f:
+            return f.read()
+    except (IOError, OSError) as err:
+        module.fail_json(msg='Failed to read checkpoint %s: %s' % (path, to_native(err)))
+
+
+def push_config(module, commands):
+    """ like load_config, but leave a ConnectionError to the caller so a
+    failed change can be rolled back before failing
+    """
+    return get_connection(module).edit_config(commands)
+
+
+def rollback_config(module, snapshot):
+    """ return the device to snapshot, the running-config is read again as
+    the failed push may have applied part of the commands
+    """
+    # a failed edit_config leaves the session in config mode
+    run_commands(module, ['end'], check_rc=False)
+    running = SectionConfig(contents=run_commands(module, ['show running-config'])[0])
+    commands = get_replace_commands(snapshot, running)
+    if commands:
+        load_config(module, commands)
+    return commands
+
+
+def format_section(key, lines):
+    if not lines:
+        return ''
+    if key is None:
+        return '\n'.join(lines) + '\n'
+    return '\n'.join([key] + [' %s' % line for line in lines] + ['exit']) + '\n'
+
+
+def stage_script(module, script):
+    """ upload the script to the transfer server
+    """
+    transfer = module.params['transfer']
+    if transfer['protocol'] == 'sftp':
+        sftp.upload(transfer['host'], transfer['port'] or 22, transfer['username'],
+                    transfer['password'], transfer['filename'], to_bytes(script))
+    else:
+        tftp.upload(transfer['host'], transfer['port'] or 69, transfer['filename'],
+                    io.BytesIO(to_bytes(script)))
+
+
+def apply_script(module):
+    """ have the device fetch the staged script, apply and delete it
+    """
+    transfer = module.params['transfer']
+    if transfer['protocol'] == 'sftp':
+        url = 'sftp://%s@%s/%s' % (transfer['username'], transfer['host'], transfer['filename'].lstrip('/'))
+        copy = {'command': 'copy %s nvram:script %s' % (url, transfer['script']),
+                'prompt': [r'[Pp]assword:', CONFIRM_PROMPT],
+                'answer': [transfer['password'], 'y'],
+                'check_all': True}
+    else:
+        url = 'tftp://%s/%s' % (transfer['host'], transfer['filename'].lstrip('/'))
+        copy = {'command': 'copy %s nvram:script %s' % (url, transfer['script']),
+                'prompt': CONFIRM_PROMPT, 'answer': 'y'}
+
+    output = run_commands(module, [copy])[0]
+    if 'completed successfully' not in to_text(output):
+        module.fail_json(msg='Failed to copy configuration script to the device', output=output)
+
+    responses = run_commands(module, [
+        {'command': 'script apply %s' % transfer['script'], 'prompt': CONFIRM_PROMPT, 'answer': 'y'},
+        {'command': 'script delete %s' % transfer['script'], 'prompt': CONFIRM_PROMPT, 'answer': 'y'},
+    ])
+    lines = to_text(responses[0]).splitlines()
+    errors = [line for line in lines if any(regex.search(line) for regex in SCRIPT_ERRORS)]
+    if errors:
+        module.fail_json(msg='Failed to apply the configuration script: %s' % errors[0], changed=True,
+                         transfer_log=lines)
+    return lines
+
+
+def transfer_config(module, commands):
+    """ push the commands to the device as a configuration script
+    """
+    transfer = module.params['transfer']
+    script = '\n'.join(['configure'] + commands + ['end']) + '\n'
+
+    if transfer['serve']:
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, transfer['filename'].lstrip('/'))
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write(script)
+            server = tftp.LocalTftpServer(root, port=69)
+            try:
+                server.start()
+            except Exception as err:
+                module.fail_json(msg='Failed to start local TFTP server: %s' % to_native(err))
+            try:
+                return apply_script(module)
+            finally:
+                server.stop()
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    try:
+        stage_script(module, script)
+    except Exception as err:
+        module.fail_json(msg='Failed to stage configuration script: %s' % to_native(err))
+    return apply_script(module)
+
+
 def save_config(module, result):
     result['changed'] = True
     if not module.check_mode:
@@ -306,8 +699,26 @@ def main():
         filename=dict(),
         dir_path=dict(type='path')
     )
+    transfer_spec = dict(
+        protocol=dict(choices=['tftp', 'sftp'], default='tftp'),
+        host=dict(required=True),
+        port=dict(type='int'),
+        username=dict(),
+        password=dict(no_log=True),
+        filename=dict(default='ansible.scr'),
+        script=dict(default='ansible.scr'),
+        serve=dict(type='bool', default=False),
+        min_lines=dict(type='int', default=0),
+    )
+    aggregate_spec = dict(
+        lines=dict(aliases=['commands'], type='list', elements='str', required=True),
+        parents=dict(type='list', elements='str'),
+        before=dict(type='list', elements='str'),
+        after=dict(type='list', elements='str'),
+    )
     argument_spec = dict(
         src=dict(type='path'),
+        aggregate=dict(type='list', elements='dict', options=aggregate_spec),
 
         lines=dict(aliases=['commands'], type='list', elements='str'),
         parents=dict(type='list', elements='str'),
@@ -316,7 +727,7 @@ def main():
         after=dict(type='list', elements='str'),
 
         match=dict(default='line', choices=['line', 'strict', 'exact', 'none']),
-        replace=dict(default='line', choices=['line', 'block']),
+        replace=dict(default='line', choices=['line', 'block', 'config']),
 
         running_config=dict(aliases=['config']),
         intended_config=dict(),
@@ -328,14 +739,29 @@ def main():
 
         diff_against=dict(choices=['running', 'startup', 'intended']),
         diff_ignore_lines=dict(type='list', elements='str'),
+
+        transfer=dict(type='dict', options=transfer_spec,
+                      required_if=[('protocol', 'sftp', ['username', 'password'])]),
+
+        checkpoint=dict(type='path'),
+        rollback=dict(type='path'),
+        rollback_on_failure=dict(type='bool', default=False),
     )
 
     mutually_exclusive = [('lines', 'src'),
-                          ('parents', 'src')]
-
-    required_if = [('match', 'strict', ['lines']),
-                   ('match', 'exact', ['lines']),
-                   ('replace', 'block', ['lines']),
+                          ('parents', 'src'),
+                          ('aggregate', 'src'),
+                          ('aggregate', 'lines'),
+                          ('aggregate', 'parents'),
+                          ('rollback', 'src'),
+                          ('rollback', 'lines'),
+                          ('rollback', 'parents'),
+                          ('rollback', 'aggregate')]
+
+    required_if = [('match', 'strict', ['lines', 'aggregate'], True),
+                   ('match', 'exact', ['lines', 'aggregate'], True),
+                   ('replace', 'block', ['lines', 'aggregate'], True),
+                   ('replace', 'config', ['src']),
                    ('diff_against', 'intended', ['intended_config'])]
 
     module = AnsibleModule(argument_spec=argument_spec,
@@ -343,34 +769,59 @@ def main():
                            required_if=required_if,
                            supports_check_mode=True)
 
+    transfer = module.params['transfer']
+    if transfer:
+        if transfer['protocol'] == 'tftp' and not tftp.HAS_TFTPY:
+            module.fail_json(msg=missing_required_lib('tftpy'))
+        if transfer['protocol'] == 'sftp' and not sftp.HAS_FABRIC:
+            module.fail_json(msg=missing_required_lib('fabric'))
+        if transfer['serve'] and transfer['protocol'] != 'tftp':
+            module.fail_json(msg='transfer.serve is only supported with protocol tftp')
+        if transfer['serve'] and transfer['port'] not in (None, 69):
+            module.fail_json(msg='transfer.port must be 69 with transfer.serve, the device always fetches on port 69')
+
     warnings = list()
 
     result = {'changed': False, 'warnings': warnings}
 
     config = None
+    contents = None
 
-    if module.params['backup'] or (module._diff and module.params['diff_against'] == 'running'):
+    snapshot = module.params['checkpoint'] or module.params['rollback_on_failure']
+    if module.params['backup'] or snapshot or (module._diff and module.params['diff_against'] == 'running'):
         contents = get_config(module)
         config = NetworkConfig(contents=contents)
         if module.params['backup']:
             result['__backup__'] = contents
 
-    if any((module.params['src'], module.params['lines'])):
+    if any((module.params['src'], module.params['lines'], module.params['aggregate'], module.params['rollback'])):
         match = module.params['match']
         replace = module.params['replace']
 
-        candidate = get_candidate(module)
-
-        if match != 'none':
-            config = get_running_config(module, config)
-            path = module.params['parents']
-            configobjs = candidate.difference(config, match=match, replace=replace, path=path)
+        if module.params['rollback']:
+            running = get_running_sections(module, contents)
+            commands = get_replace_commands(read_checkpoint(module), running)
+        elif replace == 'config':
+            running = get_running_sections(module, contents)
+            commands = get_replace_commands(module.params['src'], running)
+        elif use_sections(module):
+            running = get_running_sections(module, contents)
+            if module.params['aggregate']:
+                commands = get_aggregate_commands(module, running)
+            else:
+                commands = section_dumps(get_section_candidate(module).difference(running), exit=True)
+        elif module.params['aggregate']:
+            if match != 'none':
+                config = get_running_config(module, config)
+            commands = get_aggregate_commands(module, config)
         else:
-            configobjs = candidate.items
-
-        if configobjs:
-            commands = dumps(configobjs, 'commands').split('\n')
+            if match != 'none':
+                config = get_running_config(module, config)
+            candidate = get_candidate(module)
+            path = module.params['parents']
+            commands = get_commands(candidate, config, match, replace, path=path)
 
+        if commands:
             if module.params['before']:
                 commands[:0] = module.params['before']
 
@@ -381,7 +832,20 @@ def main():
             result['updates'] = commands
 
             if not module.check_mode:
-                load_config(module, commands)
+                if module.params['checkpoint']:
+                    result['checkpoint_path'] = write_checkpoint(module, contents)
+                transfer = module.params['transfer']
+                if transfer and len(commands) >= transfer['min_lines']:
+                    result['transfer_log'] = transfer_config(module, commands)
+                elif module.params['rollback_on_failure']:
+                    try:
+                        push_config(module, commands)
+                    except ConnectionError as exc:
+                        result['changed'] = True
+                        result['rollback_commands'] = rollback_config(module, contents)
+                        module.fail_json(msg='Failed to push the configuration, rolled back: %s' % to_text(exc), **result)
+                else:
+                    load_config(module, commands)
 
             result['changed'] = True
 
@@ -415,7 +879,7 @@ def main():
             contents = running_config.config_text
 
         # recreate the object in order to process diff_ignore_lines
-        running_config = NetworkConfig(contents=contents, ignore_lines=diff_ignore_lines)
+        running_config = SectionConfig(contents=contents, ignore_lines=diff_ignore_lines)
 
         if module.params['diff_against'] == 'running':
             if module.check_mode:
@@ -435,13 +899,16 @@ def main():
             contents = module.params['intended_config']
 
         if contents is not None:
-            base_config = NetworkConfig(contents=contents, ignore_lines=diff_ignore_lines)
-
-            if running_config.sha1 != base_config.sha1:
-                result.update({
-                    'changed': True,
-                    'diff': {'before': str(base_config), 'after': str(running_config)}
-                })
+            base_config = SectionConfig(contents=contents, ignore_lines=diff_ignore_lines)
+
+            diff = list()
+            for key, before, after in running_config.changed_sections(base_config):
+                header = key or 'global'
+                diff.append({'before_header': header, 'after_header': header,
+                             'before': format_section(key, before),
+                             'after': format_section(key, after)})
+            if diff:
+                result.update({'changed': True, 'diff': diff})
 
     module.exit_json(**result)
 
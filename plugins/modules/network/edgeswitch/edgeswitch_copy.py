@@ -0,0 +1,163 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: edgeswitch_copy
+author:
+  - Matt Haught (@haught)
+short_description: Have EdgeSwitch devices copy their configuration to a TFTP server
+description:
+  - This module tells a device running EdgeSwitch to upload its running or
+    startup configuration to a TFTP server with the C(copy) command.
+  - The device pushes the file itself, which is much faster than reading
+    the configuration through the CLI.  Use it together with
+    M(ncstate.network.tftp_receive) to collect the configurations of many
+    devices in parallel.
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  server:
+    description:
+      - The IP address or hostname of the TFTP server as reached by the device.
+    required: True
+    type: str
+  filename:
+    description:
+      - The destination filename on the TFTP server.
+      - The text C({hostname}) is replaced with the system name reported by
+        the device.
+    required: True
+    type: str
+  source:
+    description:
+      - The configuration to copy.
+    required: False
+    default: running-config
+    choices: ['running-config', 'startup-config']
+    type: str
+  retries:
+    description:
+      - Number of times the copy is tried before it is considered failed, for
+        example while the TFTP server is still starting.
+      - Must be at least C(1).
+    required: False
+    default: 3
+    type: int
+  interval:
+    description:
+      - The number of seconds to wait between C(retries) of the copy.
+    required: False
+    default: 5
+    type: int
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+  - The device always connects to the TFTP server on UDP port 69.
+'''
+
+EXAMPLES = """
+tasks:
+  - name: Copy the running-config to the backup server
+    ncstate.network.edgeswitch_copy:
+      server: 10.0.0.5
+      filename: "backups/{{ inventory_hostname }}.cfg"
+
+  - name: Copy the startup-config named after the device system name
+    ncstate.network.edgeswitch_copy:
+      server: 10.0.0.5
+      filename: "{hostname}-startup.cfg"
+      source: startup-config
+"""
+
+RETURN = """
+url:
+  description: The destination the configuration was copied to
+  returned: always
+  type: str
+  sample: tftp://10.0.0.5/backups/sw1.cfg
+stdout:
+  description: The output of the copy command
+  returned: when the copy was run
+  type: str
+  sample: 'File transfer operation completed successfully.'
+"""
+import re
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands
+
+SOURCES = {
+    'running-config': 'system:running-config',
+    'startup-config': 'nvram:startup-config',
+}
+
+
+def get_hostname(module):
+    output = run_commands(module, ['show sysinfo'])[0]
+    match = re.search(r'^System Name\.+\s*(\S+)', output, re.M)
+    if not match:
+        module.fail_json(msg='Unable to find the system name of the device')
+    return match.group(1)
+
+
+def main():
+    spec = dict(
+        server=dict(type='str', required=True),
+        filename=dict(type='str', required=True),
+        source=dict(default='running-config', choices=['running-config', 'startup-config']),
+        retries=dict(default=3, type='int'),
+        interval=dict(default=5, type='int')
+    )
+
+    module = AnsibleModule(argument_spec=spec, supports_check_mode=True)
+
+    if module.params['retries'] < 1:
+        module.fail_json(msg='retries must be at least 1')
+
+    warnings = list()
+    result = {'changed': False, 'warnings': warnings}
+
+    filename = module.params['filename']
+    if '{hostname}' in filename:
+        filename = filename.replace('{hostname}', get_hostname(module))
+
+    result['url'] = 'tftp://%s/%s' % (module.params['server'], filename.lstrip('/'))
+
+    if module.check_mode:
+        warnings.append(
+            'TFTP transfer cannot occur using check mode'
+        )
+        module.exit_json(**result)
+
+    command = {
+        'command': 'copy %s %s' % (SOURCES[module.params['source']], result['url']),
+        'prompt': r'\(y/n\)',
+        'answer': 'y'
+    }
+
+    copied = False
+    for attempt in range(module.params['retries']):
+        if attempt:
+            time.sleep(module.params['interval'])
+        output = run_commands(module, [command])[0]
+        if 'completed successfully' in output:
+            copied = True
+            break
+
+    result['stdout'] = output
+
+    if not copied:
+        module.fail_json(msg='File transfer to %s failed' % result['url'], **result)
+
+    result['changed'] = True
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
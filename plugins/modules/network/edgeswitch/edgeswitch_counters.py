@@ -0,0 +1,204 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: edgeswitch_counters
+author:
+  - Matt Haught (@haught)
+short_description: Sample interface counters on EdgeSwitch devices
+description:
+  - This module runs C(show interface counters) a number of times over the
+    persistent connection to the device and computes the rate of every
+    counter and the increase of the error counters over the sampled time.
+  - Every sample is kept as a compact flat array of counters, so long
+    sampling runs stay small in memory.
+  - The samples can be written to a CSV or binary file for graphing, for
+    example during a migration before SNMP polling is set up.
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  interfaces:
+    description:
+      - The ports to sample.  All ports found in the first sample are used
+        if not given.
+    required: False
+    type: list
+    elements: str
+  samples:
+    description:
+      - The number of samples to take, at least 2 are needed for rates.
+    required: False
+    default: 2
+    type: int
+  interval:
+    description:
+      - The number of seconds between the start of two samples.
+    required: False
+    default: 10
+    type: int
+  dest:
+    description:
+      - Path on the controller to write the samples to.
+    required: False
+    type: path
+  format:
+    description:
+      - The format of I(dest).
+      - With I(csv) there is one row per port and sample.
+      - With I(binary) the file starts with C(ESCNT1), a JSON header line
+        with the ports and columns, and then one record per sample, a little
+        endian double timestamp followed by every counter of every port as
+        little endian unsigned 64 bit integers.
+    required: False
+    default: csv
+    choices: ['csv', 'binary']
+    type: str
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+'''
+
+EXAMPLES = """
+- name: Watch the uplinks for a minute while moving them
+  ncstate.network.edgeswitch_counters:
+    interfaces:
+      - 0/15
+      - 0/16
+    samples: 7
+    interval: 10
+    dest: "counters/{{ inventory_hostname }}.csv"
+  register: uplinks
+
+- name: Fail on errors
+  ansible.builtin.assert:
+    that: uplinks.errors == {}
+"""
+
+RETURN = """
+ports:
+  description: The sampled ports
+  returned: always
+  type: list
+  sample: ['0/15', '0/16']
+samples:
+  description: The number of samples taken
+  returned: always
+  type: int
+  sample: 7
+elapsed:
+  description: The number of seconds between the first and the last sample
+  returned: always
+  type: float
+  sample: 60.04
+rates:
+  description: The average rate per second of every counter by port, octet counters are in bits per second
+  returned: always
+  type: dict
+  sample: {'0/15': {'in_octets': 81723.2, 'in_ucast_pkts': 112.3}}
+errors:
+  description: The increase of the error and discard counters by port, only ports with errors are included
+  returned: always
+  type: dict
+  sample: {'0/16': {'in_errors': 12}}
+dest:
+  description: The full path of the file the samples were written to
+  returned: when dest is set
+  type: str
+  sample: /playbooks/counters/sw1.csv
+"""
+import os
+import tempfile
+import time
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.counters import (
+    CounterSeries,
+    parse_counters,
+)
+
+COMMAND = 'show interface counters'
+
+
+def collect(module, warnings):
+    series = CounterSeries(module.params['interfaces'])
+    interval = module.params['interval']
+    for index in range(module.params['samples']):
+        started = time.time()
+        output = run_commands(module, [COMMAND])[0]
+        counters = parse_counters(to_text(output))
+        if index == 0:
+            for port in module.params['interfaces'] or []:
+                if port not in counters:
+                    warnings.append('No counters found for port %s' % port)
+        series.add(time.time(), counters)
+        if index + 1 < module.params['samples']:
+            time.sleep(max(0, interval - (time.time() - started)))
+    return series
+
+
+def write_samples(module, series):
+    path = os.path.abspath(module.params['dest'])
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    fd, tmp = tempfile.mkstemp(dir=dirname)
+    try:
+        if module.params['format'] == 'binary':
+            with os.fdopen(fd, 'wb') as f:
+                series.write_binary(f)
+        else:
+            with os.fdopen(fd, 'w') as f:
+                series.write_csv(f)
+    except Exception:
+        os.remove(tmp)
+        raise
+    module.atomic_move(tmp, path)
+    return path
+
+
+def main():
+    """ main entry point for module execution
+    """
+    argument_spec = dict(
+        interfaces=dict(type='list', elements='str'),
+        samples=dict(type='int', default=2),
+        interval=dict(type='int', default=10),
+        dest=dict(type='path'),
+        format=dict(default='csv', choices=['csv', 'binary'])
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+
+    if module.params['samples'] < 1:
+        module.fail_json(msg='samples must be at least 1')
+
+    warnings = list()
+    series = collect(module, warnings)
+
+    result = {
+        'changed': False,
+        'warnings': warnings,
+        'ports': series.ports,
+        'samples': len(series),
+        'elapsed': round(series.timestamps[-1] - series.timestamps[0], 3),
+        'rates': series.rates(),
+        'errors': series.errors(),
+    }
+
+    if module.params['dest']:
+        result['dest'] = write_samples(module, series)
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
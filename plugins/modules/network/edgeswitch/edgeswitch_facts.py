@@ -0,0 +1,342 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: edgeswitch_facts
+author:
+  - Matt Haught (@haught)
+short_description: Collect facts from remote devices running EdgeSwitch
+description:
+  - Collects a base set of device facts from a remote device that
+    is running EdgeSwitch.  This module prepends all of the
+    base network fact keys with C(ansible_net_<fact>).  The facts
+    module will always collect a base set of facts from the device
+    and can enable or disable collection of additional facts.
+  - The commands of all requested subsets are sent in a single request
+    to the device and their output is parsed into structured data.
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  gather_subset:
+    description:
+      - When supplied, this argument will restrict the facts collected
+        to a given subset.  Possible values for this argument include
+        all, config, interfaces, vlans, lag and lldp.  Can specify a list of
+        values to include a larger subset.  Values can also be used
+        with an initial C(!) to specify that a specific subset should
+        not be collected.
+    required: False
+    default: ['!config']
+    type: list
+    elements: str
+  table_format:
+    description:
+      - The layout of the interface, VLAN, LAG and neighbor facts.
+      - With I(dict) every table is a dict keyed by port or VLAN ID. When the
+        device lists the same port or VLAN ID more than once, its value is a
+        list of all of its rows instead of a single row.
+      - With I(columns) every table is a dict of equal length lists, one per
+        column, which is much smaller for large tables.
+    required: False
+    default: dict
+    choices: ['dict', 'columns']
+    type: str
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+'''
+
+EXAMPLES = """
+- name: Collect all facts from the device
+  ncstate.network.edgeswitch_facts:
+    gather_subset: all
+
+- name: Collect only the interfaces and neighbors as column lists
+  ncstate.network.edgeswitch_facts:
+    gather_subset:
+      - interfaces
+      - lldp
+    table_format: columns
+"""
+
+RETURN = """
+ansible_net_gather_subset:
+  description: The list of fact subsets collected from the device
+  returned: always
+  type: list
+
+# default
+ansible_net_model:
+  description: The model name returned from the device
+  returned: always
+  type: str
+ansible_net_serialnum:
+  description: The serial number of the remote device
+  returned: always
+  type: str
+ansible_net_version:
+  description: The operating system version running on the remote device
+  returned: always
+  type: str
+ansible_net_hostname:
+  description: The configured hostname of the device
+  returned: always
+  type: str
+
+# config
+ansible_net_config:
+  description: The current active config from the device
+  returned: when config is configured
+  type: str
+ansible_net_config_sections:
+  description:
+    - The current active config parsed into its sections, keyed by section
+      header, with the lines outside of any section under C(global).
+    - The lines of every section are stripped and do not include C(exit).
+  returned: when config is configured
+  type: dict
+  sample: {'global': ['domain-name bar'], 'interface 0/1': ['ip address 1.2.3.4 255.255.255.0', 'description test-string']}
+
+# interfaces
+ansible_net_interfaces:
+  description: The status of all interfaces keyed by port, a port listed more than once has a list of its rows
+  returned: when interfaces is configured
+  type: dict
+  sample: {'0/1': {'name': 'uplink', 'link_state': 'Up', 'physical_mode': 'Auto',
+           'physical_status': '1000 Full', 'media_type': '', 'flow_control_status': 'Inactive'}}
+
+# vlans
+ansible_net_vlans:
+  description: The VLANs configured on the device keyed by VLAN ID
+  returned: when vlans is configured
+  type: dict
+  sample: {'1': {'name': 'default', 'type': 'Default'}}
+
+# lag
+ansible_net_lags:
+  description: The port-channels of the device keyed by logical interface
+  returned: when lag is configured
+  type: dict
+  sample: {'3/1': {'name': 'ch1', 'link_state': 'Up', 'type': 'Dynamic',
+           'members': ['0/1', '0/2'], 'active_members': ['0/1']}}
+
+# lldp
+ansible_net_neighbors:
+  description: The LLDP neighbors of the device keyed by local port
+  returned: when lldp is configured
+  type: dict
+  sample: {'0/1': [{'host': 'core-sw1', 'port': '0/24', 'chassis_id': '74:AC:B9:11:22:33'}]}
+"""
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six import iteritems
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.config import SectionConfig
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.parsers import (
+    ParseError,
+    parse_dotted,
+    parse_interfaces_status,
+    parse_lldp_remote,
+    parse_port_channel_brief,
+    parse_vlan_brief,
+    to_columns,
+)
+
+
+class FactsBase(object):
+
+    COMMANDS = list()
+
+    def __init__(self, module):
+        self.module = module
+        self.facts = dict()
+        self.responses = None
+
+    def populate(self, responses):
+        self.responses = responses
+
+    def table(self, name, records, key):
+        """ store records as a dict keyed by key or as column lists
+        """
+        if self.module.params['table_format'] == 'columns':
+            self.facts[name] = to_columns(records)
+            return
+
+        table = dict()
+        for record in records:
+            value = record.pop(key)
+            if value not in table:
+                table[value] = record
+                continue
+            # a repeated key keeps all of its rows instead of the last one
+            if not isinstance(table[value], list):
+                table[value] = [table[value]]
+            table[value].append(record)
+        self.facts[name] = table
+
+
+class Default(FactsBase):
+
+    COMMANDS = ['show version', 'show sysinfo']
+
+    def populate(self, responses):
+        super(Default, self).populate(responses)
+        version = parse_dotted(self.responses[0])
+        sysinfo = parse_dotted(self.responses[1])
+        self.facts['version'] = version.get('software_version')
+        self.facts['serialnum'] = version.get('serial_number')
+        self.facts['model'] = version.get('machine_model')
+        self.facts['hostname'] = sysinfo.get('system_name')
+
+
+class Config(FactsBase):
+
+    COMMANDS = ['show running-config']
+
+    def populate(self, responses):
+        super(Config, self).populate(responses)
+        data = self.responses[0]
+        if data:
+            self.facts['config'] = data
+            sections = SectionConfig(data)
+            self.facts['config_sections'] = dict((key or 'global', sections.section(key)) for key in sections.keys())
+
+
+class Interfaces(FactsBase):
+
+    COMMANDS = ['show interfaces status all']
+
+    def populate(self, responses):
+        super(Interfaces, self).populate(responses)
+        self.table('interfaces', parse_interfaces_status(self.responses[0]), 'port')
+
+
+class Vlans(FactsBase):
+
+    COMMANDS = ['show vlan brief']
+
+    def populate(self, responses):
+        super(Vlans, self).populate(responses)
+        self.table('vlans', parse_vlan_brief(self.responses[0]), 'vlan_id')
+
+
+class Lag(FactsBase):
+
+    COMMANDS = ['show port-channel brief']
+
+    def populate(self, responses):
+        super(Lag, self).populate(responses)
+        self.table('lags', parse_port_channel_brief(self.responses[0]), 'interface')
+
+
+class Lldp(FactsBase):
+
+    COMMANDS = ['show lldp remote-device all']
+
+    def populate(self, responses):
+        super(Lldp, self).populate(responses)
+        records = parse_lldp_remote(self.responses[0])
+
+        if self.module.params['table_format'] == 'columns':
+            self.facts['neighbors'] = to_columns(records)
+            return
+
+        neighbors = dict()
+        for record in records:
+            neighbors.setdefault(record.pop('local_port'), list()).append(record)
+        self.facts['neighbors'] = neighbors
+
+
+FACT_SUBSETS = dict(
+    default=Default,
+    config=Config,
+    interfaces=Interfaces,
+    vlans=Vlans,
+    lag=Lag,
+    lldp=Lldp,
+)
+
+VALID_SUBSETS = frozenset(FACT_SUBSETS.keys())
+
+
+def main():
+    """main entry point for module execution
+    """
+    argument_spec = dict(
+        gather_subset=dict(default=['!config'], type='list', elements='str'),
+        table_format=dict(default='dict', choices=['dict', 'columns'])
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True)
+
+    gather_subset = module.params['gather_subset']
+
+    runable_subsets = set()
+    exclude_subsets = set()
+
+    for subset in gather_subset:
+        if subset == 'all':
+            runable_subsets.update(VALID_SUBSETS)
+            continue
+
+        if subset.startswith('!'):
+            subset = subset[1:]
+            if subset == 'all':
+                exclude_subsets.update(VALID_SUBSETS)
+                continue
+            exclude = True
+        else:
+            exclude = False
+
+        if subset not in VALID_SUBSETS:
+            module.fail_json(msg='Bad subset: %s' % subset)
+
+        if exclude:
+            exclude_subsets.add(subset)
+        else:
+            runable_subsets.add(subset)
+
+    if not runable_subsets:
+        runable_subsets.update(VALID_SUBSETS)
+
+    runable_subsets.difference_update(exclude_subsets)
+    runable_subsets.add('default')
+
+    facts = dict()
+    facts['gather_subset'] = sorted(runable_subsets)
+
+    instances = list()
+    commands = list()
+    for key in sorted(runable_subsets):
+        inst = FACT_SUBSETS[key](module)
+        instances.append(inst)
+        commands.extend(inst.COMMANDS)
+
+    # one request for every subset instead of one per subset
+    responses = run_commands(module, commands)
+
+    for inst in instances:
+        count = len(inst.COMMANDS)
+        try:
+            inst.populate(responses[:count])
+        except ParseError as err:
+            module.fail_json(msg=to_native(err))
+        responses = responses[count:]
+        facts.update(inst.facts)
+
+    ansible_facts = dict()
+    for key, value in iteritems(facts):
+        key = 'ansible_net_%s' % key
+        ansible_facts[key] = value
+
+    module.exit_json(ansible_facts=ansible_facts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: edgeswitch_topology
+author:
+  - Matt Haught (@haught)
+short_description: Discover the LLDP topology starting from EdgeSwitch devices
+description:
+  - This module reads the LLDP neighbors of the device it runs against and
+    then of every neighbor with a management address, breadth first, until
+    no new devices are found.  The result is a single graph of the devices
+    and the links between them.
+  - Neighbors are read by an action plugin on the controller, each over its
+    own C(ansible.netcommon.network_cli) connection with I(username) and
+    I(password), so devices that are not in the inventory are found as
+    well.  Several devices are read at the same time and every device is
+    read only once, even when it is seen by many neighbors or under several
+    addresses.
+  - Only neighbors with a management address in I(subnets) are logged in
+    to.  Their SSH host keys must already be in C(known_hosts), neighbors
+    with unknown keys are refused and reported in C(errors).
+  - Run the module against one or a few seed switches with C(run_once)
+    instead of looping over every host.
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  seeds:
+    description:
+      - More addresses to start from besides the device the module runs
+        against.
+    required: False
+    type: list
+    elements: str
+  username:
+    description:
+      - The user to log in to the neighbors with.
+    required: False
+    type: str
+  password:
+    description:
+      - The password to log in to the neighbors with, also used for
+        C(enable).
+    required: False
+    type: str
+  subnets:
+    description:
+      - The networks, in CIDR notation, the management address of a neighbor
+        must be in for it to be read.  Neighbors outside of them are still
+        reported but not logged in to.
+      - Required unless I(max_depth) is C(0) and there are no I(seeds). The
+        I(seeds) themselves are always read.
+    required: False
+    type: list
+    elements: str
+  port:
+    description:
+      - The SSH port of the neighbors.
+    required: False
+    default: 22
+    type: int
+  workers:
+    description:
+      - The maximum number of devices read at the same time.
+    required: False
+    default: 8
+    type: int
+  max_depth:
+    description:
+      - Do not read devices further than this many hops from the seeds.
+        With C(0) only the neighbors of the seeds are reported.
+    required: False
+    type: int
+  max_devices:
+    description:
+      - Stop after reading this many devices.
+    required: False
+    type: int
+  include:
+    description:
+      - A regular expression the system name of a neighbor must match for it
+        to be read.  Neighbors that do not match, such as phones and access
+        points, are still reported but not logged in to.
+    required: False
+    type: str
+  timeout:
+    description:
+      - Seconds to wait for the SSH connection and every command of a
+        neighbor.
+    required: False
+    default: 30
+    type: int
+  dest:
+    description:
+      - Path on the controller to write the graph to, relative paths are
+        taken from the playbook directory.
+    required: False
+    type: path
+  format:
+    description:
+      - The format of I(dest).
+    required: False
+    default: json
+    choices: ['json', 'graphml']
+    type: str
+requirements:
+  - ansible.netcommon collection
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+'''
+
+EXAMPLES = """
+- name: Map the campus from the core switch
+  ncstate.network.edgeswitch_topology:
+    username: "{{ ansible_user }}"
+    password: "{{ ansible_password }}"
+    include: '^sw-'
+    subnets:
+      - 10.0.0.0/16
+    dest: campus.graphml
+    format: graphml
+  run_once: true
+"""
+
+RETURN = """
+nodes:
+  description: The devices found, those not read have crawled set to false
+  returned: always
+  type: list
+  sample: [{'name': 'core-sw1', 'address': null, 'depth': 0, 'crawled': true},
+           {'name': 'sw-closet2', 'address': '10.0.0.12', 'depth': 1, 'crawled': true}]
+links:
+  description: The links between the devices, each link is listed once
+  returned: always
+  type: list
+  sample: [{'source': 'core-sw1', 'source_port': '0/16', 'target': 'sw-closet2', 'target_port': '0/1'}]
+errors:
+  description: The addresses that could not be read and why
+  returned: always
+  type: dict
+  sample: {'10.0.0.13': 'timed out'}
+dest:
+  description: The full path of the file the graph was written to
+  returned: when dest is set
+  type: str
+  sample: /playbooks/campus.graphml
+"""
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch import topology
+
+
+def main():
+    """ main entry point for module execution
+
+    The neighbors are crawled by the action plugin of the same name, run
+    on its own the module only reports the neighbors of the connected
+    device.
+    """
+    argument_spec = dict(
+        seeds=dict(type='list', elements='str'),
+        username=dict(type='str'),
+        password=dict(type='str', no_log=True),
+        port=dict(type='int', default=22),
+        subnets=dict(type='list', elements='str'),
+        workers=dict(type='int', default=8),
+        max_depth=dict(type='int'),
+        max_devices=dict(type='int'),
+        include=dict(type='str'),
+        timeout=dict(type='int', default=30),
+        dest=dict(type='path'),
+        format=dict(default='json', choices=['json', 'graphml'])
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_together=[('username', 'password')],
+                           supports_check_mode=True)
+
+    if module.params['max_depth'] != 0 or module.params['seeds'] or module.params['dest']:
+        module.fail_json(msg='Reading neighbors and writing dest are done by the edgeswitch_topology action plugin')
+
+    local = topology.parse_device(run_commands(module, topology.COMMANDS))
+    result = {'changed': False}
+    result.update(topology.crawl([None], lambda address: local, max_depth=0))
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
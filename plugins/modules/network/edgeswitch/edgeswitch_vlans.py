@@ -0,0 +1,235 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: edgeswitch_vlans
+author:
+  - Matt Haught (@haught)
+short_description: Manage the VLAN database on EdgeSwitch devices
+description:
+  - This module provides declarative management of the VLAN database on
+    devices running EdgeSwitch.
+  - The VLAN table is read once, the wanted and existing VLANs are compared
+    as sets and consecutive VLAN IDs are created and removed with range
+    commands such as C(vlan 100-199).
+  - "This is a network module and requires C(connection: network_cli)
+    in order to work properly."
+options:
+  config:
+    description:
+      - The list of VLANs.
+    type: list
+    elements: dict
+    suboptions:
+      vlan_id:
+        description:
+          - The ID of the VLAN.
+        required: True
+        type: int
+      name:
+        description:
+          - The name of the VLAN.
+          - The name is sent in double quotes, it can not contain one.
+        type: str
+  state:
+    description:
+      - With I(merged) the given VLANs are created and named, other VLANs are
+        left alone.
+      - With I(replaced) the given VLANs are created and their names are set
+        to exactly the given value, an omitted name resets it to the default.
+      - With I(overridden) the VLAN database is made to match I(config),
+        VLANs that are not given are removed.
+      - With I(deleted) the given VLANs are removed, or all VLANs if
+        I(config) is omitted.
+      - The default VLAN 1 and VLANs learned dynamically are never removed.
+    default: merged
+    choices: ['merged', 'replaced', 'overridden', 'deleted']
+    type: str
+
+notes:
+  - Tested against EdgeSwitch 1.9.2
+'''
+
+EXAMPLES = """
+- name: Create a block of VLANs, sent as a single 'vlan 100-103' command
+  ncstate.network.edgeswitch_vlans:
+    config:
+      - vlan_id: 100
+      - vlan_id: 101
+      - vlan_id: 102
+      - vlan_id: 103
+
+- name: Create and name VLANs
+  ncstate.network.edgeswitch_vlans:
+    config:
+      - vlan_id: 100
+        name: voice
+      - vlan_id: 200
+        name: data
+
+- name: Make the VLAN database match the source of truth
+  ncstate.network.edgeswitch_vlans:
+    config: "{{ site_vlans }}"
+    state: overridden
+
+- name: Remove VLANs
+  ncstate.network.edgeswitch_vlans:
+    config:
+      - vlan_id: 300
+      - vlan_id: 301
+    state: deleted
+"""
+
+RETURN = """
+commands:
+  description: The list of configuration mode commands to send to the device
+  returned: always
+  type: list
+  sample: ['vlan database', 'vlan 100-199', 'vlan name 100 "voice"', 'no vlan 300-301', 'exit']
+before:
+  description: The VLANs on the device before the module ran
+  returned: always
+  type: list
+  sample: [{'vlan_id': 1, 'name': 'default'}]
+after:
+  description: The VLANs on the device after the commands are applied
+  returned: always
+  type: list
+  sample: [{'vlan_id': 1, 'name': 'default'}, {'vlan_id': 100, 'name': 'voice'}]
+"""
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.community.network.plugins.module_utils.network.edgeswitch.edgeswitch import run_commands, load_config
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.config import vlan_ranges
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.parsers import ParseError, check_columns, parse_table
+
+DEFAULT_VLAN = 1
+
+
+def default_name(vlan_id):
+    return 'VLAN%04d' % vlan_id
+
+
+def get_vlans(module):
+    """ read the VLAN table, returning {vlan_id: name} and the set of dynamic VLANs
+    """
+    vlans = dict()
+    dynamic = set()
+    try:
+        rows = check_columns(parse_table(run_commands(module, ['show vlan brief'])[0]),
+                             ['vlan_id', 'vlan_name', 'vlan_type'], 'show vlan brief')
+    except ParseError as err:
+        module.fail_json(msg=to_native(err))
+    for row in rows:
+        vlan_id = int(row['vlan_id'])
+        vlans[vlan_id] = row['vlan_name']
+        if row['vlan_type'].lower().startswith('dynamic'):
+            dynamic.add(vlan_id)
+    return vlans, dynamic
+
+
+def build_commands(module, have, dynamic):
+    state = module.params['state']
+    want = dict((item['vlan_id'], item['name']) for item in module.params['config'] or [])
+
+    create = set()
+    remove = set()
+    names = list()
+
+    if state == 'deleted':
+        remove = set(want or have) & set(have)
+    else:
+        create = set(want) - set(have)
+        for vlan_id in sorted(want):
+            name = want[vlan_id]
+            current = have.get(vlan_id)
+            if name is not None:
+                if name != current:
+                    names.append('vlan name %d "%s"' % (vlan_id, name))
+            elif state != 'merged' and current is not None and current != default_name(vlan_id):
+                names.append('no vlan name %d' % vlan_id)
+        if state == 'overridden':
+            remove = set(have) - set(want)
+
+    remove -= dynamic
+    remove.discard(DEFAULT_VLAN)
+
+    commands = ['vlan %s' % r for r in vlan_ranges(create)]
+    commands.extend(names)
+    commands.extend('no vlan %s' % r for r in vlan_ranges(remove))
+
+    after = dict(have)
+    for vlan_id in remove:
+        del after[vlan_id]
+    if state != 'deleted':
+        for vlan_id, name in want.items():
+            if name is not None:
+                after[vlan_id] = name
+            elif state == 'merged':
+                after.setdefault(vlan_id, default_name(vlan_id))
+            else:
+                after[vlan_id] = default_name(vlan_id)
+
+    if commands:
+        commands.insert(0, 'vlan database')
+        commands.append('exit')
+    return commands, after
+
+
+def to_list(vlans):
+    return [{'vlan_id': vlan_id, 'name': vlans[vlan_id]} for vlan_id in sorted(vlans)]
+
+
+def main():
+    """ main entry point for module execution
+    """
+    element_spec = dict(
+        vlan_id=dict(type='int', required=True),
+        name=dict(type='str'),
+    )
+
+    argument_spec = dict(
+        config=dict(type='list', elements='dict', options=element_spec),
+        state=dict(default='merged', choices=['merged', 'replaced', 'overridden', 'deleted'])
+    )
+
+    required_if = [('state', 'merged', ['config']),
+                   ('state', 'replaced', ['config']),
+                   ('state', 'overridden', ['config'])]
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_if=required_if,
+                           supports_check_mode=True)
+
+    for item in module.params['config'] or []:
+        if not 1 <= item['vlan_id'] <= 4093:
+            module.fail_json(msg='vlan_id must be between 1 and 4093, got %d' % item['vlan_id'])
+        if item['name'] is not None and '"' in item['name']:
+            module.fail_json(msg='The name of VLAN %d can not contain a double quote' % item['vlan_id'])
+
+    result = {'changed': False}
+
+    have, dynamic = get_vlans(module)
+    commands, after = build_commands(module, have, dynamic)
+
+    result['commands'] = commands
+    result['before'] = to_list(have)
+    result['after'] = to_list(after)
+
+    if commands:
+        if not module.check_mode:
+            load_config(module, commands)
+
+        result['changed'] = True
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: sftp_fetch
+author:
+  - Matt Haught (@haught)
+
+short_description: Fetch many files from a SFTP server to where ansible runs.
+
+description:
+  - This module downloads files and glob matches from a SFTP server over a
+    single authenticated session.
+  - The files are fetched in parallel over their own SFTP channels with
+    I(concurrency), every file is read with many requests in flight and
+    streamed to disk as it arrives, so memory use does not grow with the
+    size of the files.
+  - Local files that already have the content are left alone, see
+    I(skip_unchanged).
+  - The transfer is done by an action plugin on the controller, the files
+    are written there.
+  - The module file only holds this documentation, the task can not run
+    on a target host.
+
+requirements:
+  - python fabric (fabric)
+
+options:
+  host:
+    description:
+    - The IP address or hostname of the SFTP server.
+    required: True
+    type: str
+  port:
+    description:
+    - The port of the SFTP server.
+    required: False
+    default: 22
+    type: int
+  username:
+    description:
+    - The username for the connection.
+    required: True
+    type: str
+  password:
+    description:
+    - The password for the connection.
+    required: True
+    type: str
+  src:
+    description:
+    - The remote files to fetch, as paths or glob patterns such as
+      C(/srv/configs/*.cfg) or C(/srv/configs/site1-*/*.cfg).
+    - Names starting with a dot are only matched by a pattern starting with
+      one.
+    required: True
+    type: list
+    elements: str
+  dest:
+    description:
+    - The local directory to place the files in.
+    - Every file keeps its path relative to the directory before the first
+      glob character of its pattern, a path without glob characters is
+      placed directly in I(dest).
+    - Relative paths are taken from the playbook directory.
+    required: True
+    type: path
+  concurrency:
+    description:
+    - The number of files fetched at the same time, each over its own SFTP
+      channel of the same session.
+    required: False
+    default: 1
+    type: int
+  skip_unchanged:
+    description:
+    - Leave local files that already have the content of the remote file
+      alone.
+    required: False
+    default: True
+    type: bool
+  compare:
+    description:
+    - How I(skip_unchanged) compares a local file of the same size.
+    - C(mtime) trusts the same modification time, fetched files are given
+      the modification time of the remote file.
+    - C(hash) reads the remote file and compares its SHA-256 digest, which
+      only saves writing the local file.
+    - C(remote_hash) runs C(sha256sum) on the server so the file is not
+      read, falling back to C(hash) when the server only allows SFTP.
+    required: False
+    default: mtime
+    choices: ['mtime', 'hash', 'remote_hash']
+    type: str
+'''
+
+EXAMPLES = r"""
+- name: Fetch the backups of every switch of a site for a rollback
+  ncstate.network.sftp_fetch:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src:
+        - /srv/configs/site1-*.cfg
+        - /srv/configs/site1/core.cfg
+      dest: restore/
+      concurrency: 8
+  run_once: true
+"""
+
+RETURN = r"""
+files:
+    description:
+    - The remote and local path of every file fetched or left alone, in the
+      order of I(src), with C(changed) set for the files that were written,
+      or would be in check mode.
+    - Written files have the number of bytes, the duration in seconds and
+      the throughput in bytes per second.
+    - Files that could not be fetched have C(failed) and C(msg).
+    returned: always apart from low level errors
+    type: list
+    sample: [{'src': '/srv/configs/site1-sw1.cfg', 'dest': 'restore/site1-sw1.cfg', 'changed': True,
+              'bytes': 24311, 'duration': 0.083, 'throughput': 292903}]
+"""
@@ -19,6 +19,11 @@ short_description: Send data directly to SFTP server from where ansible runs.
 description:
   - This module allows sending files and text using SFTP.
   - The module sends from wherever the playbook is run.
+  - The transfer is done by an action plugin on the controller, I(src) and
+    I(src_path) are read there in-process and are never packaged into a
+    module payload, so large files do not slow the task down.
+  - The module file only holds this documentation, the task can not run
+    on a target host.
 
 requirements:
   - python fabric (fabric)
@@ -48,13 +53,132 @@ options:
   src:
     description:
     - The text of the source file.
-    required: True
+    - One of I(src), I(src_path) or I(files) is required.
+    required: False
     type: str
+  src_path:
+    description:
+    - The path of a local file to send, searched for in the C(files)
+      directory of the role or playbook like other file sources.
+    - One of I(src), I(src_path) or I(files) is required.
+    required: False
+    type: path
   dest_filename:
     description:
     - The destination filename.
-    required: True
+    - Required with I(src) and I(src_path).
+    required: False
     type: str
+  files:
+    description:
+    - A list of files to send over a single SFTP session, instead of
+      I(src) or I(src_path) and I(dest_filename).
+    - The connection is opened and authenticated once for all of the files.
+    required: False
+    type: list
+    elements: dict
+    suboptions:
+      src:
+        description:
+        - The text of the file.
+        type: str
+      src_path:
+        description:
+        - The path of a local file to send, as for I(src_path).
+        type: path
+      dest:
+        description:
+        - The destination filename.
+        required: True
+        type: str
+  concurrency:
+    description:
+    - The number of files of I(files) sent at the same time, each over its
+      own SFTP channel of the same session.
+    required: False
+    default: 1
+    type: int
+  pool:
+    description:
+    - Keep the authenticated session open after the task and reuse it for
+      later uploads to the same server with the same credentials, from
+      any task or host of the play.
+    - The session is held by a small background process on the controller
+      that is reached over a UNIX socket only the user running Ansible can
+      open. It exits after I(pool_idle_timeout) seconds without an upload.
+    - The socket is placed in C($XDG_RUNTIME_DIR/ncstate-sftp), or in
+      C(~/.ansible/ncstate-sftp) without a runtime directory. The task fails
+      if that directory is not owned by the user or is open to others.
+    required: False
+    default: False
+    type: bool
+  pool_idle_timeout:
+    description:
+    - The number of seconds a pooled session is kept open without an upload.
+    - Only used when the session is started, with I(pool).
+    required: False
+    default: 60
+    type: int
+  skip_unchanged:
+    description:
+    - Check every destination file first and leave it alone when it already
+      has the content, instead of always writing it.
+    - When set, C(changed) reports whether any file was written.
+    required: False
+    default: False
+    type: bool
+  compare:
+    description:
+    - How I(skip_unchanged) compares a destination file of the same size.
+    - C(size) trusts a matching size and does not read the file.
+    - C(hash) reads the file back and compares its SHA-256 digest.
+    - C(remote_hash) runs C(sha256sum) on the server so the file is not
+      sent back, falling back to C(hash) when the server only allows SFTP.
+    required: False
+    default: hash
+    choices: ['size', 'hash', 'remote_hash']
+    type: str
+  compress:
+    description:
+    - Send the content gzip compressed, it is compressed as it is sent so
+      no compressed copy is built first.
+    - A C(.gz) suffix is added to every destination filename unless it
+      already ends with one.
+    - With I(skip_unchanged) the compressed content is compared, the same
+      content always compresses to the same bytes.
+    required: False
+    default: False
+    type: bool
+  chunk_size:
+    description:
+    - The number of bytes read and written at once. The writes are
+      pipelined, sent without waiting for the reply to the one before.
+    - Chunks larger than 32768 bytes are sent as several SFTP requests.
+    required: False
+    default: 32768
+    type: int
+  atomic:
+    description:
+    - Write every file to a hidden C(.<name>.part) file in the same
+      directory and rename it into place once complete, so a half written
+      file is never seen under the destination name.
+    - Servers without the C(posix-rename@openssh.com) extension can not
+      rename over a file, the old file is removed just before the rename.
+    required: False
+    default: True
+    type: bool
+  resume:
+    description:
+    - Go on with a partial file left by an interrupted upload instead of
+      starting over. The part already on the server is read back and
+      compared to the start of the source by SHA-256 digest, and written
+      again from the start if it differs.
+    - The partial file is the C(.part) file with I(atomic), otherwise the
+      destination file.
+    - Can not be used with I(pool).
+    required: False
+    default: False
+    type: bool
 '''
 
 EXAMPLES = r"""
@@ -65,6 +189,67 @@ EXAMPLES = r"""
       password: bar
       src: "{{ string }}"
       dest_filename: '/dest/file.txt'
+
+- name: Send a local file
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src_path: configs/sw1.cfg
+      dest_filename: '/dest/sw1.cfg'
+
+- name: Send several configs over one session
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      files:
+        - src_path: configs/sw1.cfg
+          dest: /srv/configs/sw1.cfg
+        - src: "{{ sw2_config }}"
+          dest: /srv/configs/sw2.cfg
+      concurrency: 4
+  run_once: true
+
+- name: Send every switch its config over one pooled session
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src_path: "configs/{{ inventory_hostname }}.cfg"
+      dest_filename: "/srv/configs/{{ inventory_hostname }}.cfg"
+      pool: true
+
+- name: Back up the running config only when it changed
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src: "{{ running_config }}"
+      dest_filename: "/srv/configs/{{ inventory_hostname }}.cfg"
+      skip_unchanged: true
+
+- name: Send a compressed backup to the off-site server as sw1.cfg.gz
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src: "{{ running_config }}"
+      dest_filename: /srv/configs/sw1.cfg
+      compress: true
+
+- name: Send a firmware image over a flaky link, resuming where it stopped
+  ncstate.network.sftp_send:
+      host: 1.2.3.4
+      username: foo
+      password: bar
+      src_path: images/edgeswitch-2.0.9.bin
+      dest_filename: /srv/images/edgeswitch-2.0.9.bin
+      chunk_size: 262144
+      resume: true
+  register: upload
+  retries: 3
+  until: upload is succeeded
 """
 
 RETURN = r"""
@@ -78,79 +263,25 @@ stdout_lines:
     returned: always
     type: list
     sample: [['...', '...'], ['...'], ['...']]
+metrics:
+    description:
+    - The transfer metrics, the number of bytes and write requests sent, the
+      duration in seconds, the throughput in bytes per second and the largest
+      number of write requests in flight at once.
+    - With I(resume) the number of bytes that were already on the server is
+      added as C(resumed).
+    returned: when the file was written
+    type: dict
+    sample: {'bytes': 24311, 'requests': 1, 'duration': 0.083, 'throughput': 292903, 'pipeline_depth': 1}
+files:
+    description:
+    - The destination and metrics of every file of I(files), in order.
+    - Files that could not be sent have C(failed) and C(msg) instead of
+      the metrics.
+    - With I(skip_unchanged) every file also has C(changed), files left
+      unchanged have no metrics.
+    returned: when files is set
+    type: list
+    sample: [{'dest': '/srv/configs/sw1.cfg', 'bytes': 24311, 'requests': 1, 'duration': 0.083,
+              'throughput': 292903, 'pipeline_depth': 1}]
 """
-
-try:
-    from fabric import Connection
-    HAS_FABRIC = True
-except ImportError:
-    HAS_FABRIC = False
-
-from ansible.module_utils._text import to_native, to_text
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
-
-
-def main():
-
-    spec = dict(
-        host=dict(type='str', required=True),
-        port=dict(default=22, type='int'),
-        username=dict(type='str', required=True),
-        password=dict(type='str', required=True, no_log=True),
-        src=dict(type='str', required=True),
-        dest_filename=dict(type='str', required=True)
-    )
-
-    module = AnsibleModule(
-        argument_spec=spec,
-        supports_check_mode=True
-    )
-
-    if not HAS_FABRIC:
-        module.fail_json(
-            msg=missing_required_lib("fabric"),
-        )
-
-    warnings = list()
-    result = {'changed': False, 'warnings': warnings}
-    responses = []
-
-    if module.check_mode:
-        warnings.append(
-            'SFTP transfer cannot occur using check mode'
-        )
-        module.exit_json(**result)
-
-    try:
-        conn = Connection(
-            host=module.params['host'],
-            user=module.params['username'],
-            port=module.params['port'],
-            connect_kwargs={
-                'password': module.params['password'],
-                'look_for_keys': False,
-                'allow_agent': False,
-            },
-            connect_timeout=30
-        )
-        try:
-            with conn.sftp() as sftp:
-                with sftp.file(module.params['dest_filename'], 'wb') as f:
-                    f.write(to_text(module.params['src']).encode('utf-8'))
-                responses.append('SFTP client uploaded to %s' % to_native(module.params['dest_filename']))
-        except Exception as err:
-            module.fail_json(msg='SFTP upload failed: %s' % to_native(err), **result)
-        finally:
-            conn.close()
-    except Exception as err:
-        module.fail_json(msg='Client error occured: %s' % to_native(err), **result)
-
-    result.update({
-        'stdout': "\n".join(responses)
-    })
-
-    module.exit_json(**result)
-
-
-if __name__ == '__main__':
-    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: tftp_receive
+author:
+  - Matt Haught (@haught)
+short_description: Receive files from devices with a short-lived TFTP server where ansible runs.
+description:
+  - This module runs a TFTP server for a limited time and writes the files
+    uploaded to it into a local directory.
+  - Uploads from many devices are accepted at the same time, so devices can
+    push their own configuration in parallel, for example with
+    M(ncstate.network.edgeswitch_copy).
+  - Run the module once, in the background with C(async) and C(poll=0), before
+    the tasks that make the devices upload.
+options:
+  dest:
+    description:
+      - The directory received files are written to.  Filenames requested by
+        the devices are relative to it.
+    required: True
+    type: path
+  listen_ip:
+    description:
+      - The IP address to listen on.  All addresses are used if not given.
+    required: False
+    type: str
+  port:
+    description:
+      - The UDP port to listen on.
+    required: False
+    default: 69
+    type: int
+  files:
+    description:
+      - The filenames that are expected to be uploaded.  The module returns as
+        soon as all of them are received and fails if any are missing when
+        I(timeout) expires.
+      - Uploads of any other filename are refused and reported in
+        C(rejected).
+      - If not given, the server accepts uploads of any file until
+        I(timeout) expires.
+    required: False
+    type: list
+    elements: str
+  timeout:
+    description:
+      - The number of seconds to run the server for.
+    required: False
+    default: 300
+    type: int
+'''
+
+EXAMPLES = """
+tasks:
+  - name: Start TFTP receiver for the switch configs
+    ncstate.network.tftp_receive:
+      dest: /srv/backups
+      files: "{{ ansible_play_hosts | map('regex_replace', '$', '.cfg') | list }}"
+      timeout: 600
+    delegate_to: localhost
+    run_once: true
+    async: 900
+    poll: 0
+    register: receiver
+
+  - name: Have each switch push its running-config
+    ncstate.network.edgeswitch_copy:
+      server: 10.0.0.5
+      filename: "{{ inventory_hostname }}.cfg"
+
+  - name: Wait for all configs to arrive
+    ansible.builtin.async_status:
+      jid: "{{ receiver.ansible_job_id }}"
+    delegate_to: localhost
+    run_once: true
+    register: received
+    until: received.finished
+    retries: 120
+    delay: 5
+"""
+
+RETURN = """
+received:
+  description: The files that were completely received
+  returned: always
+  type: list
+  sample: [{'filename': 'sw1.cfg', 'path': '/srv/backups/sw1.cfg', 'size': 10384, 'host': '10.1.1.2'}]
+missing:
+  description: The expected files that were not received before the timeout
+  returned: when files is given
+  type: list
+  sample: ['sw2.cfg']
+rejected:
+  description: The uploads of files not in I(files) that were refused
+  returned: when files is given
+  type: list
+  sample: [{'filename': 'other.cfg', 'host': '10.1.1.7'}]
+"""
+
+import os
+import time
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp import HAS_TFTPY, LocalTftpServer
+
+
+def main():
+
+    spec = dict(
+        dest=dict(type='path', required=True),
+        listen_ip=dict(type='str', default=''),
+        port=dict(default=69, type='int'),
+        files=dict(type='list', elements='str'),
+        timeout=dict(default=300, type='int')
+    )
+
+    module = AnsibleModule(
+        argument_spec=spec,
+        supports_check_mode=True
+    )
+
+    if not HAS_TFTPY:
+        module.fail_json(
+            msg=missing_required_lib("tftpy"),
+        )
+
+    warnings = list()
+    result = {'changed': False, 'warnings': warnings, 'received': []}
+
+    if module.check_mode:
+        warnings.append(
+            'TFTP transfer cannot occur using check mode'
+        )
+        module.exit_json(**result)
+
+    dest = module.params['dest']
+    if not os.path.isdir(dest):
+        module.fail_json(msg='Destination directory %s does not exist' % to_native(dest), **result)
+
+    files = [os.path.normpath(f.lstrip('/')) for f in module.params['files'] or []]
+
+    try:
+        server = LocalTftpServer(dest, module.params['listen_ip'], module.params['port'], allowed=files or None)
+        server.start()
+    except Exception as err:
+        module.fail_json(msg='TFTP server error occured: %s' % to_native(err), **result)
+
+    try:
+        if files:
+            missing = server.wait(files, module.params['timeout'])
+        else:
+            time.sleep(module.params['timeout'])
+    finally:
+        server.stop()
+
+    result['received'] = sorted(server.received.values(), key=lambda item: item['filename'])
+    result['changed'] = bool(result['received'])
+    if files:
+        result['rejected'] = server.rejected
+
+    if files:
+        result['missing'] = missing
+        if missing:
+            module.fail_json(msg='Timed out waiting for %d file(s)' % len(missing), **result)
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,11 @@ short_description: Send data directly to TFTP server from where ansible runs.
 description:
   - This module allows sending files and text using TFTP.
   - The module sends from wherever the playbook is run.
+  - The transfer is done by an action plugin on the controller, I(src) and
+    I(src_path) are read there in-process and are never packaged into a
+    module payload, so large files do not slow the task down.
+  - The module file only holds this documentation, the task can not run
+    on a target host.
 options:
   host:
     description:
@@ -29,8 +34,19 @@ options:
   src:
     description:
       - The text of the source file.
-    required: True
+      - One of I(src) or I(src_path) is required.
+    required: False
     type: str
+  src_path:
+    description:
+      - The path of a local file to send, searched for in the C(files)
+        directory of the role or playbook like other file sources.
+      - The file is streamed from disk in octet mode, so binary files such as
+        firmware images can be sent and memory use does not grow with the
+        size of the file.
+      - One of I(src) or I(src_path) is required.
+    required: False
+    type: path
   dest_filename:
     description:
       - The destination filename.
@@ -39,9 +55,55 @@ options:
   blocksize:
     description:
       - TFTP transfer blocksize.
+      - A size other than 512 is requested as in RFC 2348, 1468 is the
+        largest block that fits an Ethernet frame.  The server may answer
+        with a smaller size, and servers without option support fall back
+        to 512 bytes.
     required: False
     default: 512
     type: int
+  windowsize:
+    description:
+      - The number of blocks sent before waiting for an acknowledgement, as
+        in RFC 7440.  Larger windows speed up transfers over links with
+        latency.
+      - The default sends one block at a time as in RFC 1350, a window is
+        only requested when this is larger.  Servers without RFC 7440
+        support get one block at a time.
+    required: False
+    default: 1
+    type: int
+  timeout:
+    description:
+      - The longest time in seconds to wait for a reply before sending a
+        packet again.
+      - The actual wait follows the measured round trip time to the server,
+        starting at one second and doubling after every timeout up to this
+        value.
+    required: False
+    default: 5
+    type: int
+  retries:
+    description:
+      - The number of times a packet is sent again without a reply before
+        the transfer fails.
+    required: False
+    default: 5
+    type: int
+  deadline:
+    description:
+      - Fail the transfer when it takes longer than this many seconds.
+    required: False
+    type: int
+  compress:
+    description:
+      - Send the content gzip compressed, it is compressed as it is sent
+        so no compressed copy is built first.
+      - A C(.gz) suffix is added to I(dest_filename) unless it already
+        ends with one.
+    required: False
+    default: False
+    type: bool
 '''
 
 EXAMPLES = """
@@ -51,6 +113,27 @@ tasks:
       host: 1.2.3.4
       src: "{{ string }}"
       dest_filename: '/dest/file.txt'
+
+  - name: Send a local file
+    ncstate.network.tftp_send:
+      host: 1.2.3.4
+      src_path: configs/sw1.cfg
+      dest_filename: 'sw1.cfg'
+
+  - name: Send a firmware image with large blocks and a window of 8
+    ncstate.network.tftp_send:
+      host: 1.2.3.4
+      src_path: images/fw.bin
+      dest_filename: 'fw.bin'
+      blocksize: 1468
+      windowsize: 8
+
+  - name: Send a compressed backup as sw1.cfg.gz
+    ncstate.network.tftp_send:
+      host: 1.2.3.4
+      src: "{{ running_config }}"
+      dest_filename: 'sw1.cfg'
+      compress: true
 """
 
 RETURN = """
@@ -64,67 +147,15 @@ stdout_lines:
   returned: always
   type: list
   sample: [['...', '...'], ['...'], ['...']]
+metrics:
+  description:
+    - The transfer metrics, the number of bytes and blocks sent, the duration
+      in seconds, the throughput in bytes per second, the number of blocks
+      sent again, the number of timeouts, the smoothed round trip time and
+      the last retransmission timeout in seconds and the options accepted by
+      the server.
+  returned: when the file was sent
+  type: dict
+  sample: {'bytes': 24311, 'blocks': 17, 'duration': 0.412, 'throughput': 59007, 'retransmits': 0,
+           'timeouts': 0, 'rtt': 0.0214, 'rto': 0.0856, 'options': {'blksize': 512, 'windowsize': 1}}
 """
-
-try:
-    from tftpy import TftpClient
-    HAS_TFTPY = True
-except ImportError:
-    HAS_TFTPY = False
-
-import io
-from ansible.module_utils._text import to_native, to_text
-from ansible.module_utils.basic import AnsibleModule, missing_required_lib
-
-
-def main():
-
-    spec = dict(
-        host=dict(type='str', required=True),
-        port=dict(default=69, type='int'),
-        src=dict(type='str', required=True),
-        dest_filename=dict(type='str', required=True),
-        blocksize=dict(default=512, type='int')
-    )
-
-    module = AnsibleModule(
-        argument_spec=spec,
-        supports_check_mode=True
-    )
-
-    if not HAS_TFTPY:
-        module.fail_json(
-            msg=missing_required_lib("tftpy"),
-        )
-
-    warnings = list()
-    result = {'changed': False, 'warnings': warnings}
-    responses = []
-
-    if module.check_mode:
-        warnings.append(
-            'TFTP transfer cannot occur using check mode'
-        )
-        module.exit_json(**result)
-
-    try:
-        client = TftpClient(module.params['host'], module.params['port'], options={'blksize': module.params['blocksize']})
-        responses.append('TFTP client connected to %s:%s' % (to_native(module.params['host']), to_native(module.params['port'])))
-        try:
-            client.upload(module.params['dest_filename'], io.StringIO(to_text(module.params['src'])))
-            responses.append('TFTP client uploaded to %s' % to_native(module.params['dest_filename']))
-            result['changed'] = False
-        except Exception as err:
-            module.fail_json(msg='TFTP upload failed: %s' % to_native(err), **result)
-    except Exception as err:
-        module.fail_json(msg='Client error occured: %s' % to_native(err), **result)
-
-    result.update({
-        'stdout': "\n".join(responses)
-    })
-
-    module.exit_json(**result)
-
-
-if __name__ == '__main__':
-    main()
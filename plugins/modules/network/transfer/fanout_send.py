@@ -0,0 +1,148 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2018, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+module: fanout_send
+author:
+  - Matt Haught (@haught)
+short_description: Send one file to several TFTP and SFTP servers at once.
+description:
+  - This module sends the same text or file to a list of TFTP and SFTP
+    destinations, such as two backup servers and the TFTP server devices
+    restore from, in one task.
+  - The source is read, and compressed with I(compress), a single time and
+    every chunk is shared by the destinations, which are all sent to at the
+    same time from their own thread.
+  - A slow destination holds the others back by at most a few chunks, so
+    memory use does not grow with the size of the source.
+  - The transfer is done by an action plugin on the controller, I(src) and
+    I(src_path) are read there in-process and are never packaged into a
+    module payload.
+  - The module file only holds this documentation, the task can not run
+    on a target host.
+requirements:
+  - python fabric (fabric) for SFTP destinations
+options:
+  src:
+    description:
+      - The text of the source file.
+      - One of I(src) or I(src_path) is required.
+    required: False
+    type: str
+  src_path:
+    description:
+      - The path of a local file to send, searched for in the C(files)
+        directory of the role or playbook like other file sources.
+      - One of I(src) or I(src_path) is required.
+    required: False
+    type: path
+  dest:
+    description:
+      - The destinations as C(sftp://[user[:password]@]host[:port]/path) or
+        C(tftp://host[:port]/filename) URLs.
+      - The SFTP path starts at the root of the server, the leading slash of
+        a TFTP filename is left out.
+      - Prefer I(username) and I(password) over credentials in the URL, the
+        URLs are returned without the password but are part of the task
+        arguments.
+      - The URLs are not logged as they may hold a password.
+    required: True
+    type: list
+    elements: str
+  username:
+    description:
+      - The username for SFTP destinations without one in the URL.
+    required: False
+    type: str
+  password:
+    description:
+      - The password for SFTP destinations without one in the URL.
+    required: False
+    type: str
+  compress:
+    description:
+      - Send the content gzip compressed, it is compressed once as it is
+        sent.
+      - A C(.gz) suffix is added to every destination filename unless it
+        already ends with one.
+    required: False
+    default: False
+    type: bool
+  atomic:
+    description:
+      - Write SFTP destinations to a hidden C(.<name>.part) file and rename
+        it into place once complete, as the I(atomic) option of
+        M(ncstate.network.sftp_send).
+    required: False
+    default: True
+    type: bool
+  blocksize:
+    description:
+      - The blocksize of TFTP destinations, see M(ncstate.network.tftp_send).
+    required: False
+    default: 512
+    type: int
+  windowsize:
+    description:
+      - The number of blocks sent to TFTP destinations before waiting for an
+        acknowledgement, see M(ncstate.network.tftp_send).
+    required: False
+    default: 1
+    type: int
+  timeout:
+    description:
+      - The longest time in seconds to wait for a reply from a TFTP
+        destination before sending a packet again.
+    required: False
+    default: 5
+    type: int
+  retries:
+    description:
+      - The number of times a packet is sent again to a TFTP destination
+        without a reply before its transfer fails.
+    required: False
+    default: 5
+    type: int
+'''
+
+EXAMPLES = """
+- name: Back up the config to both backup servers and the restore server
+  ncstate.network.fanout_send:
+    src: "{{ running_config }}"
+    dest:
+      - "sftp://backup@backup1.example.com/srv/configs/{{ inventory_hostname }}.cfg"
+      - "sftp://backup@backup2.example.com/srv/configs/{{ inventory_hostname }}.cfg"
+      - "tftp://10.0.0.5/configs/{{ inventory_hostname }}.cfg"
+    password: "{{ backup_password }}"
+    compress: true
+"""
+
+RETURN = """
+stdout:
+  description: The set of responses from the commands
+  returned: always apart from low level errors (such as action plugin)
+  type: list
+  sample: ['...', '...']
+stdout_lines:
+  description: The value of stdout split into a list
+  returned: always
+  type: list
+  sample: [['...', '...'], ['...'], ['...']]
+destinations:
+  description:
+    - The URL without the password and the transfer metrics of every
+      destination, in the order of I(dest), see M(ncstate.network.sftp_send)
+      and M(ncstate.network.tftp_send) for the metrics.
+    - Destinations that could not be sent to have C(failed) and C(msg)
+      instead of the metrics.
+  returned: when the file was sent
+  type: list
+  sample: [{'dest': 'sftp://backup@backup1.example.com/srv/configs/sw1.cfg.gz', 'bytes': 2431, 'requests': 1,
+            'duration': 0.083, 'throughput': 29289, 'pipeline_depth': 1},
+           {'dest': 'tftp://10.0.0.5/configs/sw1.cfg.gz', 'failed': True, 'msg': 'Timed out waiting for a reply'}]
+"""
@@ -0,0 +1 @@
+network/sftp/sftp_fetch.py
\ No newline at end of file
@@ -0,0 +1 @@
+network/tftp/tftp_receive.py
\ No newline at end of file
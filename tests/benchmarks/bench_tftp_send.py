@@ -0,0 +1,82 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measure the time and peak memory of tftp_send style uploads of a large
+file to a local TFTP server.
+
+Run it as a module from the directory holding `ansible_collections`:
+
+    python -m ansible_collections.ncstate.network.tests.benchmarks.bench_tftp_send --size 64
+
+The `file` case streams the file through tftp.upload_file the way src_path
+does, the `memory` case reads the whole file first the way src did.  Peak
+memory is the largest amount allocated by Python during the transfer as
+reported by tracemalloc.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+
+def make_image(path, size):
+    with open(path, 'wb') as f:
+        chunk = os.urandom(1024 * 1024)
+        for dummy in range(size):
+            f.write(chunk)
+
+
+def send_file(port, path, blocksize):
+    tftp.upload_file('127.0.0.1', port, 'image.bin', path, blocksize=blocksize)
+
+
+def send_memory(port, path, blocksize):
+    with open(path, 'rb') as f:
+        data = f.read()
+    tftp.upload('127.0.0.1', port, 'image.bin', io.BytesIO(data), blocksize=blocksize)
+
+
+def measure(server, case, path, blocksize):
+    server.received.clear()
+    tracemalloc.start()
+    started = time.time()
+    case(server.port, path, blocksize)
+    elapsed = time.time() - started
+    dummy, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if server.wait(['image.bin'], 30):
+        raise RuntimeError('the server did not receive the image')
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=32, help='image size in MiB')
+    parser.add_argument('--blocksize', type=int, default=1468)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'image.bin')
+        make_image(path, args.size)
+        root = os.path.join(workdir, 'server')
+        os.mkdir(root)
+        with tftp.LocalTftpServer(root, listen_ip='127.0.0.1', port=0) as server:
+            print('%-8s %10s %10s %12s' % ('case', 'seconds', 'MiB/s', 'peak KiB'))
+            for name, case in (('file', send_file), ('memory', send_memory)):
+                elapsed, peak = measure(server, case, path, args.blocksize)
+                print('%-8s %10.2f %10.2f %12d' % (name, elapsed, args.size / elapsed, peak // 1024))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measure tftp_send throughput by block size and window size against a
+local TFTP server stand-in that adds a delay before every acknowledgement.
+
+Run it as a module from the directory holding `ansible_collections`:
+
+    python -m ansible_collections.ncstate.network.tests.benchmarks.bench_tftp_window --delay 20
+
+The delay stands in for the round trip time of the link, a transfer sent
+one block at a time waits for it after every block, a windowed transfer
+only once per window.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import io
+import os
+import time
+
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+from ansible_collections.ncstate.network.tests.unit.plugins.module_utils.network.tftp.test_tftp import WindowedTftpServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=256, help='file size in KiB')
+    parser.add_argument('--delay', type=float, default=10, help='delay before every acknowledgement in ms')
+    parser.add_argument('--blocksize', type=int, action='append', help='block sizes to try')
+    parser.add_argument('--windowsize', type=int, action='append', help='window sizes to try')
+    args = parser.parse_args()
+
+    data = os.urandom(args.size * 1024)
+    print('%-10s %-10s %10s %10s' % ('blksize', 'window', 'seconds', 'KiB/s'))
+    for blocksize in args.blocksize or [512, tftp.AUTO_BLKSIZE]:
+        for windowsize in args.windowsize or [1, 4, 16, 64]:
+            with WindowedTftpServer(delay=args.delay / 1000.0) as server:
+                started = time.time()
+                tftp.upload('127.0.0.1', server.port, 'image.bin', io.BytesIO(data),
+                            blocksize=blocksize, windowsize=windowsize)
+                elapsed = time.time() - started
+            print('%-10d %-10d %10.2f %10.1f' % (blocksize, windowsize, elapsed, args.size / elapsed))
+
+
+if __name__ == '__main__':
+    main()
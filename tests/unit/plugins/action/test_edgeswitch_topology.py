@@ -0,0 +1,122 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.community.network.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.ncstate.network.plugins.action import edgeswitch_topology
+from ansible_collections.ncstate.network.tests.unit.plugins.action.test_send import get_action
+from ansible_collections.ncstate.network.tests.unit.plugins.modules.network.edgeswitch.test_edgeswitch_topology import NETWORK, emulate
+
+UNREACHABLE = set(['10.0.0.14'])
+
+
+class FakeConnection(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def run_commands(self, commands):
+        return emulate(self.name)
+
+    def close(self):
+        self.closed = True
+
+
+class TestEdgeswitchTopologyAction(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.lock = threading.Lock()
+        self.logins = list()
+
+    def connect(self, address, args):
+        if address in UNREACHABLE:
+            raise socket.timeout('timed out')
+        with self.lock:
+            self.logins.append(address)
+        return FakeConnection([name for name, (host, ports) in NETWORK.items() if host == address][0])
+
+    def run_action(self, **args):
+        action = get_action(edgeswitch_topology, args)
+        action._loader = MagicMock()
+        action._loader.path_dwim.side_effect = lambda path: os.path.join(self.root, path)
+        with patch.object(edgeswitch_topology.ActionModule, '_local_connection', return_value=FakeConnection('core-sw1')):
+            with patch.object(edgeswitch_topology.ActionModule, '_remote_connection', side_effect=self.connect):
+                return action.run(task_vars=dict())
+
+    def test_edgeswitch_topology_crawl(self):
+        result = self.run_action(username='admin', password='secret', include='^sw-', subnets=['10.0.0.0/24'])
+        self.assertNotIn('failed', result)
+        nodes = dict((node['name'], node) for node in result['nodes'])
+        self.assertEqual(sorted(nodes), ['ap-1', 'core-sw1', 'sw-a', 'sw-b', 'sw-c', 'sw-d'])
+        self.assertFalse(nodes['ap-1']['crawled'])
+        self.assertEqual(nodes['sw-c']['depth'], 2)
+        # sw-c is seen by two neighbors but read once, the access point is never logged in to
+        self.assertEqual(sorted(self.logins), ['10.0.0.11', '10.0.0.12', '10.0.0.13'])
+        self.assertEqual(len(result['links']), 6)
+        self.assertIn({'source': 'core-sw1', 'source_port': '0/1', 'target': 'sw-a', 'target_port': '0/24'}, result['links'])
+        self.assertEqual(list(result['errors']), ['10.0.0.14'])
+
+    def test_edgeswitch_topology_subnets(self):
+        result = self.run_action(username='admin', password='secret', subnets=['10.0.0.11/32', '10.0.0.13'])
+        self.assertEqual(sorted(self.logins), ['10.0.0.11', '10.0.0.13'])
+        self.assertEqual(result['errors'], {})
+
+    def test_edgeswitch_topology_subnets_required(self):
+        result = self.run_action(username='admin', password='secret')
+        self.assertTrue(result['failed'])
+        self.assertEqual(self.logins, [])
+
+    def test_edgeswitch_topology_subnets_invalid(self):
+        result = self.run_action(username='admin', password='secret', subnets=['10.0.0.0/33'])
+        self.assertTrue(result['failed'])
+
+    def test_edgeswitch_topology_max_depth(self):
+        result = self.run_action(username='admin', password='secret', max_depth=1, subnets=['10.0.0.0/24'])
+        self.assertEqual(sorted(self.logins), ['10.0.0.11', '10.0.0.12', '10.0.0.50'])
+        self.assertEqual(result['errors'], {})
+
+    def test_edgeswitch_topology_neighbors_only(self):
+        result = self.run_action(max_depth=0)
+        self.assertEqual(self.logins, [])
+        self.assertEqual(len(result['links']), 3)
+
+    def test_edgeswitch_topology_graphml(self):
+        result = self.run_action(username='admin', password='secret', subnets=['10.0.0.0/24'],
+                                 dest='campus.graphml', format='graphml')
+        self.assertEqual(result['dest'], os.path.join(self.root, 'campus.graphml'))
+        with open(result['dest']) as f:
+            data = f.read()
+        self.assertIn('<node id="sw-c">', data)
+        self.assertIn('<edge source="sw-a" target="sw-c">', data)
+
+    def test_edgeswitch_topology_json(self):
+        result = self.run_action(username='admin', password='secret', subnets=['10.0.0.0/24'], dest='maps/campus.json')
+        with open(os.path.join(self.root, 'maps', 'campus.json')) as f:
+            self.assertEqual(json.load(f)['links'], result['links'])
+
+    def test_edgeswitch_topology_remote_connection(self):
+        action = get_action(edgeswitch_topology, dict())
+        action._play_context = MagicMock()
+        args = dict(port=22, username='admin', password='secret', timeout=10)
+        with patch.object(edgeswitch_topology, 'connection_loader') as loader:
+            connection = action._remote_connection('10.0.0.11', args)
+        self.assertEqual(loader.get.call_args[0][0], 'ansible.netcommon.network_cli')
+        play_context = loader.get.call_args[0][1]
+        self.assertEqual(play_context.network_os, 'community.network.edgeswitch')
+        self.assertTrue(play_context.become)
+        options = connection.set_options.call_args[1]['direct']
+        self.assertEqual((options['host'], options['host_key_checking'], options['host_key_auto_add']),
+                         ('10.0.0.11', True, False))
+        connection._connect.assert_called_once_with()
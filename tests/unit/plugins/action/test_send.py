@@ -0,0 +1,285 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+from ansible.errors import AnsibleActionFail
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.community.network.tests.unit.compat.mock import ANY, MagicMock, patch
+from ansible_collections.ncstate.network.plugins.action import fanout_send, sftp_fetch, sftp_send, tftp_send
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+
+def get_action(module, args, check_mode=False):
+    task = MagicMock(args=args, async_val=0, check_mode=check_mode)
+    return module.ActionModule(task, MagicMock(), MagicMock(), loader=None, templar=None, shared_loader_obj=None)
+
+
+class TestTftpSendAction(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.server = tftp.LocalTftpServer(self.root, listen_ip='127.0.0.1', port=0)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def run_action(self, check_mode=False, **args):
+        args.update(host='127.0.0.1', port=self.server.port)
+        return get_action(tftp_send, args, check_mode).run(task_vars=dict())
+
+    def read(self, filename):
+        self.assertEqual(self.server.wait([filename], 5), [])
+        with open(os.path.join(self.root, filename), 'rb') as f:
+            return f.read()
+
+    def test_tftp_send_src(self):
+        result = self.run_action(src='hostname sw1\n', dest_filename='sw1.cfg')
+        self.assertNotIn('failed', result)
+        self.assertFalse(result['changed'])
+        self.assertEqual(self.read('sw1.cfg'), b'hostname sw1\n')
+        self.assertEqual(result['metrics']['bytes'], 13)
+        self.assertEqual(result['metrics']['options'], {'blksize': 512, 'windowsize': 1})
+
+    def test_tftp_send_src_path(self):
+        path = os.path.join(self.root, 'image.bin')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(3000))
+        action = get_action(tftp_send, dict(host='127.0.0.1', port=self.server.port, src_path='image.bin',
+                                            dest_filename='out.bin'))
+        with patch.object(action, '_find_needle', return_value=path) as find_needle:
+            result = action.run(task_vars=dict())
+        find_needle.assert_called_with('files', 'image.bin')
+        self.assertNotIn('failed', result)
+        with open(path, 'rb') as f:
+            self.assertEqual(self.read('out.bin'), f.read())
+
+    def test_tftp_send_compress(self):
+        result = self.run_action(src='hostname sw1\n', dest_filename='sw1.cfg', compress=True)
+        self.assertNotIn('failed', result)
+        self.assertEqual(result['stdout_lines'][-1], 'TFTP client uploaded to sw1.cfg.gz')
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(self.read('sw1.cfg.gz'))).read(), b'hostname sw1\n')
+
+    def test_tftp_send_check_mode(self):
+        result = self.run_action(check_mode=True, src='hostname sw1\n', dest_filename='sw1.cfg')
+        self.assertEqual(result['warnings'], ['TFTP transfer cannot occur using check mode'])
+        self.assertEqual(self.server.wait(['sw1.cfg'], 0), ['sw1.cfg'])
+
+    def test_tftp_send_src_and_src_path(self):
+        with self.assertRaises(AnsibleActionFail):
+            self.run_action(src='a', src_path='b', dest_filename='sw1.cfg')
+
+
+class TestSftpSendAction(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_upload_files = patch.object(sftp_send.sftp, 'upload_files')
+        self.upload_files = self.mock_upload_files.start()
+        self.addCleanup(self.mock_upload_files.stop)
+
+    def test_sftp_send_src(self):
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='hostname sw1\n',
+                    dest_filename='/srv/sw1.cfg')
+        self.upload_files.return_value = [{'dest': '/srv/sw1.cfg', 'bytes': 13, 'requests': 1, 'duration': 0.01,
+                                           'throughput': 1300, 'pipeline_depth': 1}]
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertNotIn('failed', result)
+        self.assertEqual(result['metrics']['pipeline_depth'], 1)
+        self.assertNotIn('dest', result['metrics'])
+        self.assertEqual(result['stdout'], 'SFTP client uploaded to /srv/sw1.cfg')
+        self.upload_files.assert_called_with('10.0.0.5', 22, 'backup', 'secret', [(ANY, '/srv/sw1.cfg')], workers=1,
+                                             compare=None, resume=False, chunk_size=32768, atomic=True)
+        source = self.upload_files.call_args[0][4][0][0]
+        self.assertEqual(source().read(), b'hostname sw1\n')
+
+    def test_sftp_send_failure(self):
+        self.upload_files.side_effect = IOError('Authentication failed')
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='hostname sw1\n',
+                    dest_filename='/srv/sw1.cfg')
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'SFTP upload failed: Authentication failed')
+
+    def test_sftp_send_files(self):
+        self.upload_files.return_value = [
+            {'dest': '/srv/sw1.cfg', 'bytes': 1},
+            {'dest': '/srv/sw2.cfg', 'failed': True, 'msg': 'Permission denied'},
+        ]
+        args = dict(host='10.0.0.5', username='backup', password='secret', concurrency=4,
+                    files=[dict(src='a', dest='/srv/sw1.cfg'), dict(src='b', dest='/srv/sw2.cfg')])
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'SFTP upload failed for 1 of 2 files')
+        self.assertEqual(result['stdout'], 'SFTP client uploaded to /srv/sw1.cfg')
+        self.assertEqual(len(result['files']), 2)
+        self.assertEqual(self.upload_files.call_args[1], {'workers': 4, 'compare': None, 'resume': False,
+                                                          'chunk_size': 32768, 'atomic': True})
+
+    def test_sftp_send_pool(self):
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='hostname sw1\n',
+                    dest_filename='/srv/sw1.cfg', pool=True, pool_idle_timeout=300)
+        with patch.object(sftp_send.pool, 'upload_files') as pool_upload_files:
+            pool_upload_files.return_value = [{'dest': '/srv/sw1.cfg', 'bytes': 13}]
+            result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertNotIn('failed', result)
+        self.assertFalse(self.upload_files.called)
+        pool_upload_files.assert_called_with('10.0.0.5', 22, 'backup', 'secret', [(ANY, '/srv/sw1.cfg')],
+                                             workers=1, idle_timeout=300, compare=None,
+                                             chunk_size=32768, atomic=True)
+
+    def test_sftp_send_skip_unchanged(self):
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='hostname sw1\n',
+                    dest_filename='/srv/sw1.cfg', skip_unchanged=True)
+        self.upload_files.return_value = [{'dest': '/srv/sw1.cfg', 'changed': False}]
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertEqual(self.upload_files.call_args[1]['compare'], 'hash')
+        self.assertFalse(result['changed'])
+        self.assertNotIn('metrics', result)
+        self.assertEqual(result['stdout'], 'SFTP client left unchanged /srv/sw1.cfg')
+        self.assertEqual(result['stdout_lines'], ['SFTP client left unchanged /srv/sw1.cfg'])
+
+        self.upload_files.return_value = [{'dest': '/srv/sw1.cfg', 'changed': True, 'bytes': 13}]
+        result = get_action(sftp_send, dict(args, compare='remote_hash')).run(task_vars=dict())
+        self.assertEqual(self.upload_files.call_args[1]['compare'], 'remote_hash')
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['metrics'], {'bytes': 13})
+
+    def test_sftp_send_compress(self):
+        self.upload_files.return_value = [{'dest': '/srv/sw1.cfg.gz', 'bytes': 33}, {'dest': '/srv/sw2.cfg.gz', 'bytes': 33}]
+        args = dict(host='10.0.0.5', username='backup', password='secret', compress=True,
+                    files=[dict(src='a', dest='/srv/sw1.cfg'), dict(src='b', dest='/srv/sw2.cfg.gz')])
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertNotIn('failed', result)
+        files = self.upload_files.call_args[0][4]
+        self.assertEqual([dest for dummy, dest in files], ['/srv/sw1.cfg.gz', '/srv/sw2.cfg.gz'])
+        with files[0][0]() as src:
+            self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(src.read())).read(), b'a')
+
+    def test_sftp_send_resume(self):
+        self.upload_files.return_value = [{'dest': '/srv/image.bin', 'bytes': 1000, 'resumed': 5000}]
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='a', dest_filename='/srv/image.bin',
+                    chunk_size=262144, atomic=False, resume=True)
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertEqual(result['metrics']['resumed'], 5000)
+        self.assertEqual(self.upload_files.call_args[1], {'workers': 1, 'compare': None, 'resume': True,
+                                                          'chunk_size': 262144, 'atomic': False})
+
+    def test_sftp_send_resume_pool(self):
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='a', dest_filename='/srv/image.bin',
+                    resume=True, pool=True)
+        result = get_action(sftp_send, args).run(task_vars=dict())
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'resume can not be used with pool')
+        self.assertFalse(self.upload_files.called)
+
+    def test_sftp_send_dest_filename_required(self):
+        args = dict(host='10.0.0.5', username='backup', password='secret', src='hostname sw1\n')
+        with self.assertRaises(AnsibleActionFail):
+            get_action(sftp_send, args).run(task_vars=dict())
+
+
+class TestFanoutSendAction(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.server = tftp.LocalTftpServer(self.root, listen_ip='127.0.0.1', port=0)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.mock_upload_fileobj = patch.object(fanout_send.fanout.sftp, 'upload_fileobj')
+        self.upload_fileobj = self.mock_upload_fileobj.start()
+        self.addCleanup(self.mock_upload_fileobj.stop)
+        self.sftp_data = dict()
+        self.upload_fileobj.side_effect = self.store
+
+    def store(self, host, port, username, password, filename, src, **options):
+        self.sftp_data[filename] = src.read()
+        return {'bytes': len(self.sftp_data[filename])}
+
+    def test_fanout_send(self):
+        args = dict(src='hostname sw1\n', username='backup', password='secret', compress=True,
+                    dest=['sftp://backup1.example.com/srv/sw1.cfg', 'tftp://127.0.0.1:%d/sw1.cfg' % self.server.port])
+        result = get_action(fanout_send, args).run(task_vars=dict())
+        self.assertNotIn('failed', result)
+        self.assertTrue(result['changed'])
+        self.assertEqual(self.server.wait(['sw1.cfg.gz'], 5), [])
+        with open(os.path.join(self.root, 'sw1.cfg.gz'), 'rb') as f:
+            self.assertEqual(f.read(), self.sftp_data['/srv/sw1.cfg.gz'])
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(self.sftp_data['/srv/sw1.cfg.gz'])).read(), b'hostname sw1\n')
+        self.assertEqual(self.upload_fileobj.call_args[0][:5], ('backup1.example.com', 22, 'backup', 'secret', '/srv/sw1.cfg.gz'))
+        self.assertEqual(result['stdout_lines'], ['Uploaded to sftp://backup1.example.com/srv/sw1.cfg.gz',
+                                                  'Uploaded to tftp://127.0.0.1:%d/sw1.cfg.gz' % self.server.port])
+
+    def test_fanout_send_failure(self):
+        self.upload_fileobj.side_effect = IOError('Authentication failed')
+        args = dict(src='hostname sw1\n', username='backup', password='secret',
+                    dest=['sftp://backup1.example.com/srv/sw1.cfg', 'tftp://127.0.0.1:%d/sw1.cfg' % self.server.port])
+        result = get_action(fanout_send, args).run(task_vars=dict())
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'Upload failed for 1 of 2 destinations')
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['destinations'][0]['msg'], 'Authentication failed')
+        self.assertEqual(self.read('sw1.cfg'), b'hostname sw1\n')
+
+    def read(self, filename):
+        self.assertEqual(self.server.wait([filename], 5), [])
+        with open(os.path.join(self.root, filename), 'rb') as f:
+            return f.read()
+
+    def test_fanout_send_invalid_dest(self):
+        result = get_action(fanout_send, dict(src='a', dest=['sftp://10.0.0.5/srv/sw1.cfg'])).run(task_vars=dict())
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'sftp://10.0.0.5/srv/sw1.cfg: SFTP needs a username and password')
+        self.assertFalse(self.upload_fileobj.called)
+
+
+class TestSftpFetchAction(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_download_files = patch.object(sftp_fetch.fetch, 'download_files')
+        self.download_files = self.mock_download_files.start()
+        self.addCleanup(self.mock_download_files.stop)
+
+    def run_action(self, check_mode=False, **args):
+        args.update(host='10.0.0.5', username='backup', password='secret')
+        action = get_action(sftp_fetch, args, check_mode)
+        action._loader = MagicMock()
+        action._loader.path_dwim.side_effect = lambda path: os.path.join('/playbooks', path)
+        return action.run(task_vars=dict())
+
+    def test_sftp_fetch(self):
+        self.download_files.return_value = ([
+            {'src': '/srv/configs/sw1.cfg', 'dest': '/playbooks/restore/sw1.cfg', 'changed': False},
+            {'src': '/srv/configs/sw2.cfg', 'dest': '/playbooks/restore/sw2.cfg', 'changed': True, 'bytes': 13},
+        ], ['/srv/configs/site3-*'])
+        result = self.run_action(src=['/srv/configs/sw*.cfg', '/srv/configs/site3-*'], dest='restore', concurrency=4)
+        self.assertNotIn('failed', result)
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['warnings'], ['No files match /srv/configs/site3-*'])
+        self.download_files.assert_called_with('10.0.0.5', 22, 'backup', 'secret', ['/srv/configs/sw*.cfg', '/srv/configs/site3-*'],
+                                               '/playbooks/restore', workers=4, compare='mtime', check_mode=False)
+
+    def test_sftp_fetch_options(self):
+        self.download_files.return_value = ([{'src': '/srv/sw1.cfg', 'dest': '/playbooks/sw1.cfg', 'changed': False}], [])
+        result = self.run_action(check_mode=True, src=['/srv/sw1.cfg'], dest='.', skip_unchanged=False)
+        self.assertFalse(result['changed'])
+        self.assertEqual(self.download_files.call_args[1], {'workers': 1, 'compare': None, 'check_mode': True})
+
+    def test_sftp_fetch_failure(self):
+        self.download_files.return_value = ([
+            {'src': '/srv/sw1.cfg', 'dest': '/playbooks/sw1.cfg', 'failed': True, 'msg': 'No such file'},
+            {'src': '/srv/sw2.cfg', 'dest': '/playbooks/sw2.cfg', 'changed': True, 'bytes': 13},
+        ], [])
+        result = self.run_action(src=['/srv/sw1.cfg', '/srv/sw2.cfg'], dest='.')
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], 'SFTP fetch failed for 1 of 2 files')
+
+        self.download_files.side_effect = IOError('Authentication failed')
+        result = self.run_action(src=['/srv/sw1.cfg'], dest='.')
+        self.assertEqual(result['msg'], 'SFTP fetch failed: Authentication failed')
@@ -0,0 +1,39 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch import config
+
+
+class TestNegate(unittest.TestCase):
+
+    def test_rules(self):
+        cases = [
+            ('no shutdown', 'shutdown'),
+            ('description "uplink to core"', 'no description'),
+            ('domain-name example.com', 'no domain-name'),
+            ('addport 3/1', 'deleteport 3/1'),
+            ('vlan tagging 10', 'no vlan tagging 10'),
+            ('vlan participation include 22', 'vlan participation auto 22'),
+            ('ip name server 10.0.0.53', 'no ip name server 10.0.0.53'),
+            ('ip route 0.0.0.0 0.0.0.0 10.0.0.1 5', 'no ip route 0.0.0.0 0.0.0.0 10.0.0.1'),
+        ]
+        for line, expected in cases:
+            self.assertEqual(config.negate(line), expected, line)
+
+    def test_default_drops_value(self):
+        cases = [
+            ('shutdown', 'no shutdown'),
+            ('spanning-tree edgeport', 'no spanning-tree edgeport'),
+            ('lldp transmit 30', 'no lldp transmit'),
+            ('snmp-server engineid local "80001"', 'no snmp-server engineid local'),
+            ('ip access-group EXAMPLE in 1', 'no ip access-group EXAMPLE in'),
+        ]
+        for line, expected in cases:
+            self.assertEqual(config.negate(line), expected, line)
+
+    def test_replace_lines_changed_value(self):
+        self.assertEqual(config.replace_lines(['lldp transmit 30', 'vlan tagging 10'], ['lldp transmit 60']),
+                         ['no vlan tagging 10', 'lldp transmit 60'])
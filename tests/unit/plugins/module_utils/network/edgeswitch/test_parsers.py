@@ -0,0 +1,44 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch import parsers
+
+VLAN_BRIEF = '''Max. VLANs: 4093
+VLANs in use: 2
+VLAN ID VLAN Name                        VLAN Type
+------- -------------------------------- -------------------
+1       default                          Default
+100     voice                            Static
+'''
+
+PORT_CHANNEL_BRIEF = '''Logical                                                        Mbr       Active
+Interface  Port-Channel Name    Link  Trap Flag  Type          Ports     Ports
+---------  -------------------  ----  ---------  ------------  --------  --------
+3/1        ch1                  Up    Disabled   Dynamic       0/1       0/1
+                                                               0/2       0/2
+'''
+
+
+class TestParseTables(unittest.TestCase):
+
+    def test_preamble_is_not_header(self):
+        self.assertEqual(parsers.parse_vlan_brief(VLAN_BRIEF),
+                         [{'vlan_id': '1', 'name': 'default', 'type': 'Default'},
+                          {'vlan_id': '100', 'name': 'voice', 'type': 'Static'}])
+
+    def test_multi_line_header(self):
+        records = parsers.parse_port_channel_brief(PORT_CHANNEL_BRIEF)
+        self.assertEqual(records[0]['interface'], '3/1')
+        self.assertEqual(records[0]['members'], ['0/1', '0/2'])
+
+    def test_missing_column(self):
+        output = 'VLAN ID VLAN Name\n------- ---------\n1       default\n'
+        with self.assertRaises(parsers.ParseError) as exc:
+            parsers.parse_vlan_brief(output)
+        self.assertIn('vlan_type', str(exc.exception))
+
+    def test_missing_column_no_rows(self):
+        self.assertEqual(parsers.parse_lldp_remote('Local Interface\n---------\n'), [])
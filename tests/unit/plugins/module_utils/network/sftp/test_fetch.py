@@ -0,0 +1,158 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import os
+import shutil
+import tempfile
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.community.network.tests.unit.compat.mock import MagicMock
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import fetch
+
+
+class Attributes(object):
+
+    def __init__(self, info, filename=None):
+        self.filename = filename
+        self.st_mode = info.st_mode
+        self.st_size = info.st_size
+        self.st_mtime = int(info.st_mtime)
+        self.st_atime = int(info.st_atime)
+
+
+class ReadFile(io.FileIO):
+
+    def prefetch(self, file_size=None):
+        pass
+
+
+class LocalClient(object):
+    """An SFTP channel serving a local directory as the server root."""
+
+    def __init__(self, root, reads):
+        self.root = root
+        self.reads = reads
+
+    def path(self, path):
+        return os.path.join(self.root, path.lstrip('/'))
+
+    def stat(self, path):
+        return Attributes(os.stat(self.path(path)))
+
+    def listdir_attr(self, path):
+        path = self.path(path)
+        return [Attributes(os.stat(os.path.join(path, name)), name) for name in os.listdir(path)]
+
+    def file(self, path, mode):
+        self.reads.append(path)
+        return ReadFile(self.path(path), 'r')
+
+    def close(self):
+        pass
+
+
+class TestFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.remote = tempfile.mkdtemp()
+        self.local = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.remote)
+        self.addCleanup(shutil.rmtree, self.local)
+        self.reads = list()
+        self.conn = MagicMock()
+        self.conn.client.open_sftp.side_effect = lambda: LocalClient(self.remote, self.reads)
+        self.client = LocalClient(self.remote, self.reads)
+        for path, data in [('srv/configs/site1-sw1.cfg', b'hostname sw1\n'),
+                           ('srv/configs/site1-sw2.cfg', b'hostname sw2\n'),
+                           ('srv/configs/site2-sw1.cfg', b'hostname site2\n'),
+                           ('srv/configs/.site1-old.cfg', b'old\n'),
+                           ('srv/configs/site1/core.cfg', b'hostname core\n'),
+                           ('srv/configs/site1/edge/e1.cfg', b'hostname e1\n')]:
+            self.put(path, data)
+
+    def put(self, path, data):
+        path = os.path.join(self.remote, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (1500000000, 1500000000))
+
+    def read(self, path):
+        with open(os.path.join(self.local, path), 'rb') as f:
+            return f.read()
+
+    def fetch(self, patterns, **kwargs):
+        return fetch.fetch_files(self.conn, patterns, self.local, **kwargs)
+
+    def test_glob(self):
+        self.assertEqual([relative for dummy, relative, dummy in fetch.glob(self.client, '/srv/configs/site1*')],
+                         ['site1-sw1.cfg', 'site1-sw2.cfg'])
+        self.assertEqual([path for path, dummy, dummy in fetch.glob(self.client, '/srv/*/site1/*.cfg')],
+                         ['/srv/configs/site1/core.cfg'])
+        self.assertEqual([relative for dummy, relative, dummy in fetch.glob(self.client, '/srv/configs/site1/*/*.cfg')],
+                         ['edge/e1.cfg'])
+        self.assertEqual([relative for dummy, relative, dummy in fetch.glob(self.client, '/srv/configs/.site1*')],
+                         ['.site1-old.cfg'])
+        self.assertEqual(fetch.glob(self.client, '/srv/configs/missing.cfg'), [('/srv/configs/missing.cfg', 'missing.cfg', None)])
+
+    def test_fetch(self):
+        results, unmatched = self.fetch(['/srv/configs/site1-*.cfg', '/srv/configs/site1/*/*.cfg',
+                                         '/srv/configs/site2-sw1.cfg', '/srv/configs/site3-*'], workers=3)
+        self.assertEqual(unmatched, ['/srv/configs/site3-*'])
+        self.assertEqual([result['src'] for result in results],
+                         ['/srv/configs/site1-sw1.cfg', '/srv/configs/site1-sw2.cfg', '/srv/configs/site1/edge/e1.cfg',
+                          '/srv/configs/site2-sw1.cfg'])
+        self.assertTrue(all(result['changed'] for result in results))
+        self.assertEqual(results[0]['bytes'], 13)
+        self.assertEqual(self.read('site1-sw2.cfg'), b'hostname sw2\n')
+        self.assertEqual(self.read(os.path.join('edge', 'e1.cfg')), b'hostname e1\n')
+        self.assertEqual(int(os.stat(os.path.join(self.local, 'site2-sw1.cfg')).st_mtime), 1500000000)
+        self.assertEqual(sorted(os.listdir(self.local)), ['edge', 'site1-sw1.cfg', 'site1-sw2.cfg', 'site2-sw1.cfg'])
+
+    def test_fetch_missing_file(self):
+        results, unmatched = self.fetch(['/srv/configs/missing.cfg', '/srv/configs/site2-sw1.cfg'])
+        self.assertEqual(unmatched, [])
+        self.assertTrue(results[0]['failed'])
+        self.assertEqual(results[0]['src'], '/srv/configs/missing.cfg')
+        self.assertTrue(results[1]['changed'])
+
+    def test_fetch_skip_mtime(self):
+        self.fetch(['/srv/configs/site1-*.cfg'])
+        self.put('srv/configs/site1-sw2.cfg', b'hostname sw9\n')
+        os.utime(os.path.join(self.remote, 'srv/configs/site1-sw2.cfg'), (1600000000, 1600000000))
+        del self.reads[:]
+        results, dummy = self.fetch(['/srv/configs/site1-*.cfg'], compare='mtime')
+        self.assertEqual([result['changed'] for result in results], [False, True])
+        self.assertEqual(self.reads, ['/srv/configs/site1-sw2.cfg'])
+        self.assertEqual(self.read('site1-sw2.cfg'), b'hostname sw9\n')
+
+    def test_fetch_skip_hash(self):
+        self.fetch(['/srv/configs/site1-sw1.cfg'])
+        os.utime(os.path.join(self.local, 'site1-sw1.cfg'), (1700000000, 1700000000))
+        results, dummy = self.fetch(['/srv/configs/site1-sw1.cfg'], compare='hash')
+        self.assertFalse(results[0]['changed'])
+        self.assertEqual(int(os.stat(os.path.join(self.local, 'site1-sw1.cfg')).st_mtime), 1700000000)
+
+    def test_fetch_check_mode(self):
+        results, dummy = self.fetch(['/srv/configs/site1-*.cfg'], compare='mtime', check_mode=True)
+        self.assertEqual([result['changed'] for result in results], [True, True])
+        self.assertEqual(os.listdir(self.local), [])
+        self.assertEqual(self.reads, [])
+
+    def test_fetch_same_local_path(self):
+        with self.assertRaises(ValueError):
+            self.fetch(['/srv/configs/site1/core.cfg', '/srv/configs/site1/edge/../core.cfg'])
+        # the same file matched twice is fetched once
+        results, dummy = self.fetch(['/srv/configs/site1-sw1.cfg', '/srv/configs/site1-*.cfg'])
+        self.assertEqual(len(results), 2)
+
+    def test_fetch_outside_dest(self):
+        self.put('srv/top.cfg', b'hostname top\n')
+        for pattern in ['/srv/configs/*/../../*.cfg', '/srv/configs/..']:
+            with self.assertRaises(ValueError):
+                fetch.fetch_files(self.conn, [pattern], os.path.join(self.local, 'dest'))
+        self.assertEqual(os.listdir(self.local), [])
@@ -0,0 +1,171 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.community.network.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import pool
+from ansible_collections.ncstate.network.tests.unit.plugins.module_utils.network.sftp.test_sftp import FakeClient
+
+
+class TestPoolServer(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, 'pool.sock')
+        self.server = {'lock': threading.Lock(), 'files': dict()}
+        self.conn = MagicMock(is_connected=True)
+        self.conn.client.open_sftp.side_effect = lambda: FakeClient(self.server)
+
+    def start(self, idle_timeout=60):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        sock.listen(8)
+        thread = threading.Thread(target=pool.PoolServer(sock, self.path, self.conn, idle_timeout).serve)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def stop(self, thread):
+        self.conn.is_connected = False
+        thread.join(5)
+
+    def source(self, data):
+        return lambda: io.BytesIO(data)
+
+    def test_send(self):
+        thread = self.start()
+        data = os.urandom(pool.CHUNK_SIZE * 20 + 7)
+        result = pool.send(self.path, self.source(data), '/srv/image.bin')
+        self.stop(thread)
+        self.assertEqual(result['bytes'], len(data))
+        self.assertEqual(self.server['files']['/srv/image.bin'].data.getvalue(), data)
+        self.assertFalse(os.path.exists(self.path))
+        self.conn.close.assert_called_once_with()
+
+    def test_send_failure(self):
+        thread = self.start()
+        result = pool.send(self.path, self.source(b'a'), '/readonly/sw1.cfg')
+        self.stop(thread)
+        self.assertEqual(result, {'failed': True, 'msg': 'Permission denied'})
+
+    def test_send_compare(self):
+        thread = self.start()
+        first = pool.send(self.path, self.source(b'hostname sw1\n'), '/srv/sw1.cfg', compare='hash')
+        second = pool.send(self.path, self.source(b'hostname sw1\n'), '/srv/sw1.cfg', compare='hash')
+        third = pool.send(self.path, self.source(b'hostname sw2\n'), '/srv/sw1.cfg', compare='hash')
+        self.stop(thread)
+        self.assertTrue(first['changed'])
+        self.assertEqual(first['bytes'], 13)
+        self.assertEqual(second, {'changed': False})
+        self.assertTrue(third['changed'])
+        self.assertEqual(self.server['files']['/srv/sw1.cfg'].data.getvalue(), b'hostname sw2\n')
+
+    def test_send_options(self):
+        thread = self.start()
+        result = pool.send(self.path, self.source(b'a' * 100000), '/srv/fw.bin', chunk_size=65536, atomic=True)
+        self.stop(thread)
+        self.assertEqual(result['requests'], 4)
+        self.assertEqual(sorted(self.server['files']), ['/srv/fw.bin'])
+
+    def test_idle_timeout(self):
+        thread = self.start(idle_timeout=0)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(pool.is_running(self.path))
+        self.conn.close.assert_called_once_with()
+
+    def test_upload_files(self):
+        thread = self.start()
+        files = [(self.source(b'%d' % number), '/srv/sw%d.cfg' % number) for number in range(10)]
+        with patch.object(pool, 'connect', return_value=self.path):
+            results = pool.upload_files('10.0.0.5', 22, 'backup', 'secret', files, workers=4)
+        self.stop(thread)
+        self.assertEqual([result['dest'] for result in results], ['/srv/sw%d.cfg' % number for number in range(10)])
+        self.assertEqual(self.server['files']['/srv/sw7.cfg'].data.getvalue(), b'7')
+        self.assertEqual(self.conn.client.open_sftp.call_count, 10)
+
+    def test_upload_files_restarts_daemon(self):
+        paths = [os.path.join(self.root, 'gone.sock'), self.path]
+        thread = self.start()
+        with patch.object(pool, 'connect', side_effect=paths) as connect:
+            results = pool.upload_files('10.0.0.5', 22, 'backup', 'secret', [(self.source(b'a'), '/srv/sw1.cfg')])
+        self.stop(thread)
+        self.assertEqual(connect.call_count, 2)
+        self.assertEqual(results[0]['bytes'], 1)
+
+    def test_socket_path(self):
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.root}):
+            path = pool.socket_path('10.0.0.5', 22, 'backup', 'secret')
+            self.assertEqual(path, pool.socket_path('10.0.0.5', 22, 'backup', 'secret'))
+            self.assertNotEqual(path, pool.socket_path('10.0.0.5', 22, 'backup', 'other'))
+        self.assertNotIn('secret', path)
+        self.assertEqual(os.path.dirname(path), os.path.join(self.root, 'ncstate-sftp'))
+        self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+
+    def test_socket_path_home(self):
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': '', 'HOME': self.root}):
+            path = pool.socket_path('10.0.0.5', 22, 'backup', 'secret')
+        self.assertEqual(os.path.dirname(path), os.path.join(self.root, '.ansible', 'ncstate-sftp'))
+
+    def test_socket_path_insecure(self):
+        os.mkdir(os.path.join(self.root, 'ncstate-sftp'), 0o700)
+        os.chmod(os.path.join(self.root, 'ncstate-sftp'), 0o755)
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.root}):
+            self.assertRaises(pool.PoolError, pool.socket_path, '10.0.0.5', 22, 'backup', 'secret')
+
+    def test_socket_path_symlink(self):
+        os.mkdir(os.path.join(self.root, 'elsewhere'), 0o700)
+        os.symlink(os.path.join(self.root, 'elsewhere'), os.path.join(self.root, 'ncstate-sftp'))
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.root}):
+            self.assertRaises(pool.PoolError, pool.socket_path, '10.0.0.5', 22, 'backup', 'secret')
+
+    def test_run_daemon_socket_mode(self):
+        report = MagicMock()
+        with patch.object(pool, 'get_connection'), patch.object(pool, 'PoolServer'):
+            pool.run_daemon(self.path, '10.0.0.5', 22, 'backup', 'secret', report=report)
+        report.assert_called_once_with('ok')
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_run_daemon_concurrent(self):
+        def login(*args):
+            # the login takes a while, the other daemon starts meanwhile
+            time.sleep(0.2)
+            return MagicMock(is_connected=True)
+
+        reports = list()
+        with patch.object(pool, 'get_connection', side_effect=login) as get_connection:
+            threads = [threading.Thread(target=pool.run_daemon, args=(self.path, '10.0.0.5', 22, 'backup', 'secret'),
+                                        kwargs=dict(idle_timeout=1, report=reports.append)) for dummy in range(2)]
+            for thread in threads:
+                thread.start()
+            deadline = time.time() + 5
+            while len(reports) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(reports, ['ok', 'ok'])
+            self.assertTrue(pool.is_running(self.path))
+            for thread in threads:
+                thread.join(10)
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_serve_keeps_replaced_socket(self):
+        thread = self.start()
+        # a later daemon replaced the socket of this one
+        os.remove(self.path)
+        other = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(other.close)
+        other.bind(self.path)
+        other.listen(1)
+        self.stop(thread)
+        self.assertTrue(os.path.exists(self.path))
@@ -0,0 +1,279 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import collections
+import errno
+import io
+import threading
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.community.network.tests.unit.compat.mock import MagicMock
+from ansible_collections.ncstate.network.plugins.module_utils.network.sftp import sftp
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer.compress import GzipReader
+
+
+class FakeFile(object):
+    """Records writes and keeps up to `depth` of them waiting for a reply
+    like a pipelined paramiko SFTPFile."""
+
+    def __init__(self, depth):
+        self.depth = depth
+        self.data = io.BytesIO()
+        self.pipelined = False
+        self._reqs = collections.deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._reqs.clear()
+
+    def set_pipelined(self, pipelined):
+        self.pipelined = pipelined
+
+    def seek(self, offset):
+        self.data.seek(offset)
+
+    def write(self, data):
+        self.data.write(data)
+        self._reqs.append(len(data))
+        if not self.pipelined or len(self._reqs) > self.depth:
+            self._reqs.clear()
+
+
+class TestSendFileobj(unittest.TestCase):
+
+    def test_send_fileobj_metrics(self):
+        f = FakeFile(depth=4)
+        client = MagicMock()
+        client.file.return_value = f
+        data = b'a' * (sftp.CHUNK_SIZE * 10 + 100)
+
+        metrics = sftp.send_fileobj(client, io.BytesIO(data), '/srv/image.bin')
+
+        client.file.assert_called_with('/srv/image.bin', 'wb')
+        self.assertTrue(f.pipelined)
+        self.assertEqual(f.data.getvalue(), data)
+        self.assertEqual(metrics['bytes'], len(data))
+        self.assertEqual(metrics['requests'], 11)
+        self.assertEqual(metrics['pipeline_depth'], 4)
+
+
+class ReadFile(io.BytesIO):
+
+    def prefetch(self, file_size=None):
+        pass
+
+    def test_send_fileobj_chunk_size(self):
+        f = FakeFile(depth=4)
+        client = MagicMock()
+        client.file.return_value = f
+        data = b'a' * 300000
+
+        metrics = sftp.send_fileobj(client, io.BytesIO(data), '/srv/image.bin', chunk_size=100000)
+
+        self.assertEqual(f.data.getvalue(), data)
+        self.assertEqual(metrics['requests'], 12)
+
+
+class FakeClient(object):
+    """An SFTP channel writing into a shared dict of files."""
+
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+
+    def stat(self, filename):
+        if filename not in self.server['files']:
+            raise IOError(errno.ENOENT, 'No such file')
+        return MagicMock(st_size=len(self.server['files'][filename].data.getvalue()))
+
+    def file(self, filename, mode):
+        if mode == 'rb':
+            self.server.setdefault('reads', []).append(filename)
+            return ReadFile(self.server['files'][filename].data.getvalue())
+        if mode == 'r+b':
+            return self.server['files'][filename]
+        if filename.startswith('/readonly/'):
+            raise IOError('Permission denied')
+        f = FakeFile(depth=4)
+        with self.server['lock']:
+            self.server['files'][filename] = f
+        return f
+
+    def posix_rename(self, src, dest):
+        if self.server.get('posix_rename') is False:
+            raise IOError('Operation unsupported')
+        self.rename(src, dest, overwrite=True)
+
+    def rename(self, src, dest, overwrite=False):
+        with self.server['lock']:
+            if dest in self.server['files'] and not overwrite:
+                raise IOError('Failure')
+            self.server['files'][dest] = self.server['files'].pop(src)
+
+    def remove(self, filename):
+        with self.server['lock']:
+            del self.server['files'][filename]
+
+    def close(self):
+        self.closed = True
+
+
+class TestSendFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.server = {'lock': threading.Lock(), 'files': dict()}
+        self.clients = list()
+        self.conn = MagicMock()
+        self.conn.client.open_sftp.side_effect = self.open_sftp
+
+    def open_sftp(self):
+        client = FakeClient(self.server)
+        self.clients.append(client)
+        return client
+
+    def source(self, data):
+        return lambda: io.BytesIO(data)
+
+    def test_send_files(self):
+        files = [(self.source(b'%d' % number), '/srv/sw%d.cfg' % number) for number in range(20)]
+        results = sftp.send_files(self.conn, files, workers=4)
+        self.conn.open.assert_called_once_with()
+        self.assertEqual(len(self.clients), 4)
+        self.assertTrue(all(client.closed for client in self.clients))
+        self.assertEqual([result['dest'] for result in results], ['/srv/sw%d.cfg' % number for number in range(20)])
+        self.assertEqual(self.server['files']['/srv/sw12.cfg'].data.getvalue(), b'12')
+
+    def test_send_files_failure(self):
+        files = [(self.source(b'a'), '/srv/sw1.cfg'), (self.source(b'b'), '/readonly/sw2.cfg')]
+        results = sftp.send_files(self.conn, files, workers=8)
+        self.assertEqual(len(self.clients), 2)
+        self.assertEqual(results[0]['bytes'], 1)
+        self.assertEqual(results[1], {'dest': '/readonly/sw2.cfg', 'failed': True, 'msg': 'Permission denied'})
+
+
+class TestSyncFileobj(unittest.TestCase):
+
+    def setUp(self):
+        self.server = {'lock': threading.Lock(), 'files': dict()}
+        self.client = FakeClient(self.server)
+        self.conn = MagicMock()
+        self.client.file('/srv/sw1.cfg', 'wb').write(b'hostname sw1\n')
+
+    def sync(self, data, compare):
+        return sftp.sync_fileobj(self.conn, self.client, io.BytesIO(data), '/srv/sw1.cfg', compare)
+
+    def written(self):
+        return self.server['files']['/srv/sw1.cfg'].data.getvalue()
+
+    def test_missing_file_is_written(self):
+        result = sftp.sync_fileobj(self.conn, self.client, io.BytesIO(b'a'), '/srv/sw2.cfg', 'hash')
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['bytes'], 1)
+
+    def test_size_mismatch_is_written_without_reading(self):
+        result = self.sync(b'hostname core1\n', 'hash')
+        self.assertTrue(result['changed'])
+        self.assertEqual(self.written(), b'hostname core1\n')
+        self.assertNotIn('reads', self.server)
+
+    def test_hash(self):
+        self.assertEqual(self.sync(b'hostname sw1\n', 'hash'), {'changed': False})
+        self.assertEqual(self.server['reads'], ['/srv/sw1.cfg'])
+        result = self.sync(b'hostname sw2\n', 'hash')
+        self.assertTrue(result['changed'])
+        self.assertEqual(self.written(), b'hostname sw2\n')
+
+    def test_size(self):
+        self.assertEqual(self.sync(b'hostname sw2\n', 'size'), {'changed': False})
+        self.assertEqual(self.written(), b'hostname sw1\n')
+
+    def test_remote_hash(self):
+        stdout = MagicMock()
+        stdout.read.return_value = sftp.file_digest(io.BytesIO(b'hostname sw1\n')).encode() + b'  /srv/sw1.cfg\n'
+        stdout.channel.recv_exit_status.return_value = 0
+        self.conn.client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+        self.assertEqual(self.sync(b'hostname sw1\n', 'remote_hash'), {'changed': False})
+        self.conn.client.exec_command.assert_called_with("sha256sum -- /srv/sw1.cfg")
+        self.assertNotIn('reads', self.server)
+
+    def test_remote_hash_falls_back(self):
+        stdout = MagicMock()
+        stdout.read.return_value = b''
+        stdout.channel.recv_exit_status.return_value = 127
+        self.conn.client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+        self.assertEqual(self.sync(b'hostname sw1\n', 'remote_hash'), {'changed': False})
+        self.assertEqual(self.server['reads'], ['/srv/sw1.cfg'])
+
+    def test_compressed(self):
+        for compare in ('size', 'hash'):
+            result = sftp.sync_fileobj(self.conn, self.client, GzipReader(io.BytesIO(b'hostname sw1\n')),
+                                       '/srv/%s.cfg.gz' % compare, compare)
+            self.assertTrue(result['changed'])
+            result = sftp.sync_fileobj(self.conn, self.client, GzipReader(io.BytesIO(b'hostname sw1\n')),
+                                       '/srv/%s.cfg.gz' % compare, compare)
+            self.assertEqual(result, {'changed': False})
+
+    def test_without_compare(self):
+        result = self.sync(b'hostname sw1\n', None)
+        self.assertNotIn('changed', result)
+        self.assertNotIn('reads', self.server)
+
+
+class TestAtomicResume(unittest.TestCase):
+
+    def setUp(self):
+        self.server = {'lock': threading.Lock(), 'files': dict()}
+        self.client = FakeClient(self.server)
+        self.data = bytes(bytearray(range(256))) * 1000
+
+    def put(self, filename, data):
+        self.client.file(filename, 'wb').write(data)
+
+    def get(self, filename):
+        return self.server['files'][filename].data.getvalue()
+
+    def test_temp_filename(self):
+        self.assertEqual(sftp.temp_filename('/srv/images/fw.bin'), '/srv/images/.fw.bin.part')
+        self.assertEqual(sftp.temp_filename('fw.bin'), '.fw.bin.part')
+
+    def test_atomic(self):
+        self.put('/srv/fw.bin', b'old')
+        sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', atomic=True)
+        self.assertEqual(sorted(self.server['files']), ['/srv/fw.bin'])
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
+
+    def test_atomic_without_posix_rename(self):
+        self.server['posix_rename'] = False
+        self.put('/srv/fw.bin', b'old')
+        sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', atomic=True)
+        self.assertEqual(sorted(self.server['files']), ['/srv/fw.bin'])
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
+
+    def test_resume(self):
+        self.put('/srv/.fw.bin.part', self.data[:100000])
+        metrics = sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', atomic=True, resume=True)
+        self.assertEqual(metrics['resumed'], 100000)
+        self.assertEqual(metrics['bytes'], len(self.data) - 100000)
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
+
+    def test_resume_other_content(self):
+        self.put('/srv/fw.bin', b'x' * 100000)
+        metrics = sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', resume=True)
+        self.assertEqual(metrics['resumed'], 0)
+        self.assertEqual(metrics['bytes'], len(self.data))
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
+
+    def test_resume_longer_file(self):
+        self.put('/srv/fw.bin', self.data + b'trailer')
+        metrics = sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', resume=True)
+        self.assertEqual(metrics['resumed'], 0)
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
+
+    def test_resume_missing_file(self):
+        metrics = sftp.send_fileobj(self.client, io.BytesIO(self.data), '/srv/fw.bin', resume=True)
+        self.assertEqual(metrics['resumed'], 0)
+        self.assertEqual(self.get('/srv/fw.bin'), self.data)
@@ -0,0 +1,271 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+
+
+class WindowedTftpServer(object):
+    """A TFTP server stand-in that accepts uploads with the blksize and
+    windowsize options, used to test and benchmark the sender.
+
+    Args:
+        options: Accept options, with False the options are ignored and with
+            'refuse' the request is answered with error 8.
+        max_blksize: The largest block size accepted.
+        max_windowsize: The largest window size accepted, 1 to act like a
+            server without RFC 7440 support.
+        delay: Seconds to wait before every acknowledgement, to add latency.
+        drop: Block numbers to drop once, as if they were lost.
+    """
+
+    def __init__(self, options=True, max_blksize=tftp.MAX_BLKSIZE, max_windowsize=tftp.MAX_WINDOWSIZE,
+                 delay=0, drop=()):
+        self.options = options
+        self.max_blksize = max_blksize
+        self.max_windowsize = max_windowsize
+        self.delay = delay
+        self.drop = set(drop)
+        self.received = dict()
+        self.sessions = list()
+        self.requests = list()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._running = False
+        self._thread.join(5)
+        self.sock.close()
+
+    def _serve(self):
+        while self._running:
+            try:
+                packet, client = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            if struct.unpack('!H', packet[:2])[0] == tftp.OP_WRQ:
+                self._receive(packet[2:], client)
+
+    def _receive(self, request, client):
+        fields = request.split(b'\0')
+        filename = fields[0].decode('utf-8')
+        requested = tftp.decode_options(b'\0'.join(fields[2:]))
+        self.requests.append(requested)
+        session = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        session.bind(('127.0.0.1', 0))
+        session.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        session.settimeout(0.5)
+
+        blksize, windowsize = tftp.DEFAULT_BLKSIZE, 1
+        if requested and self.options == 'refuse':
+            session.sendto(struct.pack('!HH', tftp.OP_ERROR, tftp.ERROR_OPTIONS) + b'Options refused\0', client)
+            session.close()
+            return
+        accepted = dict()
+        if self.options:
+            if 'blksize' in requested:
+                blksize = min(int(requested['blksize']), self.max_blksize)
+                accepted['blksize'] = blksize
+            if 'windowsize' in requested and self.max_windowsize > 1:
+                windowsize = min(int(requested['windowsize']), self.max_windowsize)
+                accepted['windowsize'] = windowsize
+        self.sessions.append({'blksize': blksize, 'windowsize': windowsize})
+        if accepted:
+            last = struct.pack('!H', tftp.OP_OACK) + b''.join(
+                key.encode() + b'\0' + str(value).encode() + b'\0' for key, value in sorted(accepted.items()))
+        else:
+            last = struct.pack('!HH', tftp.OP_ACK, 0)
+        session.sendto(last, client)
+
+        data = io.BytesIO()
+        block = 0
+        count = 0
+        timeouts = 0
+        while True:
+            try:
+                packet, address = session.recvfrom(65536)
+            except socket.timeout:
+                timeouts += 1
+                if timeouts > 5 or not self._running:
+                    break
+                session.sendto(last, client)
+                continue
+            opcode, number = struct.unpack('!HH', packet[:4])
+            if opcode != tftp.OP_DATA:
+                continue
+            if number in self.drop:
+                self.drop.remove(number)
+                continue
+            if number != (block + 1) & 0xffff:
+                # out of order, acknowledge the last good block once
+                if count:
+                    count = 0
+                    time.sleep(self.delay)
+                    last = struct.pack('!HH', tftp.OP_ACK, block & 0xffff)
+                    session.sendto(last, client)
+                continue
+            block += 1
+            count += 1
+            data.write(packet[4:])
+            final = len(packet) - 4 < blksize
+            if count == windowsize or final:
+                count = 0
+                time.sleep(self.delay)
+                last = struct.pack('!HH', tftp.OP_ACK, block & 0xffff)
+                session.sendto(last, client)
+            if final:
+                self.received[filename] = data.getvalue()
+                break
+        session.close()
+
+
+class TestTftpUpload(unittest.TestCase):
+
+    def upload(self, server, data, **kwargs):
+        with server:
+            result = tftp.upload('127.0.0.1', server.port, 'image.bin', io.BytesIO(data), timeout=1, **kwargs)
+            deadline = time.time() + 5
+            while 'image.bin' not in server.received and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(server.received.get('image.bin'), data)
+        return result
+
+    def test_upload_defaults(self):
+        # the defaults ask for no option, as a plain RFC 1350 client
+        server = WindowedTftpServer()
+        result = self.upload(server, os.urandom(5000))
+        self.assertEqual(server.requests, [{}])
+        self.assertEqual(result['options'], {'blksize': 512, 'windowsize': 1})
+        self.assertEqual(result['blocks'], 10)
+
+    def test_upload_window(self):
+        data = os.urandom(100000)
+        result = self.upload(WindowedTftpServer(), data, blocksize=tftp.AUTO_BLKSIZE, windowsize=8)
+        self.assertEqual(result['options'], {'blksize': tftp.AUTO_BLKSIZE, 'windowsize': 8})
+        self.assertEqual(result['bytes'], 100000)
+        self.assertEqual(result['blocks'], 69)
+        self.assertEqual(result['retransmits'], 0)
+        self.assertEqual(result['timeouts'], 0)
+
+    def test_upload_exact_blocks(self):
+        # a file filling the last block is finished by an empty block
+        result = self.upload(WindowedTftpServer(), b'a' * 2048, blocksize=512, windowsize=4)
+        self.assertEqual(result['blocks'], 5)
+
+    def test_upload_smaller_blksize(self):
+        result = self.upload(WindowedTftpServer(max_blksize=1024, max_windowsize=4), os.urandom(5000),
+                             blocksize=tftp.AUTO_BLKSIZE, windowsize=16)
+        self.assertEqual(result['options'], {'blksize': 1024, 'windowsize': 4})
+
+    def test_upload_options_ignored(self):
+        result = self.upload(WindowedTftpServer(options=False), os.urandom(5000), windowsize=16)
+        self.assertEqual(result['options'], {'blksize': 512, 'windowsize': 1})
+
+    def test_upload_options_refused(self):
+        server = WindowedTftpServer(options='refuse')
+        result = self.upload(server, os.urandom(5000), windowsize=16)
+        self.assertEqual(result['options'], {'blksize': 512, 'windowsize': 1})
+        self.assertEqual(server.sessions, [{'blksize': 512, 'windowsize': 1}])
+
+    def test_upload_lost_block(self):
+        result = self.upload(WindowedTftpServer(drop=[3, 10]), os.urandom(20000), blocksize=1024, windowsize=8)
+        self.assertTrue(result['retransmits'] > 0)
+        self.assertTrue(result['throughput'] > 0)
+        # the timeout follows the round trip time on the loopback interface
+        self.assertTrue(result['rto'] < 0.5)
+
+    def test_upload_deadline(self):
+        with WindowedTftpServer(delay=0.1) as server:
+            with self.assertRaises(tftp.TftpError) as exc:
+                tftp.upload('127.0.0.1', server.port, 'image.bin', io.BytesIO(os.urandom(20000)), blocksize=512,
+                            deadline=0.5)
+        self.assertIn('did not complete within 0.5 seconds', str(exc.exception))
+
+    def test_upload_block_number_wraps(self):
+        result = self.upload(WindowedTftpServer(), os.urandom(70000 * 8), blocksize=8, windowsize=256)
+        self.assertEqual(result['blocks'], 70001)
+
+    def test_upload_tftpy_server(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        data = os.urandom(5000)
+        with tftp.LocalTftpServer(root, listen_ip='127.0.0.1', port=0) as server:
+            result = tftp.upload('127.0.0.1', server.port, 'image.bin', io.BytesIO(data),
+                                 blocksize=tftp.AUTO_BLKSIZE, windowsize=8)
+            self.assertEqual(server.wait(['image.bin'], 5), [])
+        self.assertEqual(result['options'], {'blksize': tftp.AUTO_BLKSIZE, 'windowsize': 1})
+        with open(os.path.join(root, 'image.bin'), 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_upload_file_round_trip(self):
+        # every byte value, line endings and NULs included, survives octet mode
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        data = bytes(bytearray(range(256))) * 8 + b'\r\n\n\r\0' + os.urandom(3000)
+        os.mkdir(os.path.join(root, 'srv'))
+        path = os.path.join(root, 'firmware.bin')
+        with open(path, 'wb') as f:
+            f.write(data)
+        with tftp.LocalTftpServer(os.path.join(root, 'srv'), listen_ip='127.0.0.1', port=0) as server:
+            result = tftp.upload_file('127.0.0.1', server.port, 'image.bin', path)
+            self.assertEqual(server.wait(['image.bin'], 5), [])
+            self.assertTrue(tftp.download('127.0.0.1', server.port, 'image.bin', os.path.join(root, 'back.bin')))
+        self.assertEqual(result['bytes'], len(data))
+        self.assertEqual(server.received['image.bin']['size'], len(data))
+        with open(os.path.join(root, 'back.bin'), 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_upload_compress(self):
+        data = b'interface Gi1/0/1\n shutdown\n' * 2000
+        with WindowedTftpServer() as server:
+            result = tftp.upload('127.0.0.1', server.port, 'sw1.cfg.gz', io.BytesIO(data), timeout=1, compress=True)
+            deadline = time.time() + 5
+            while 'sw1.cfg.gz' not in server.received and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(server.received['sw1.cfg.gz'])).read(), data)
+        self.assertTrue(result['bytes'] < len(data) / 10)
+
+    def test_upload_invalid_windowsize(self):
+        with self.assertRaises(ValueError):
+            tftp.upload('127.0.0.1', 69, 'image.bin', io.BytesIO(b''), windowsize=0)
+
+
+class TestRetransmitTimer(unittest.TestCase):
+
+    def test_sample(self):
+        timer = tftp.RetransmitTimer(5)
+        self.assertEqual(timer.rto, tftp.INITIAL_RTO)
+        timer.sample(0.2)
+        self.assertAlmostEqual(timer.rto, 0.6)
+        timer.sample(0.2)
+        self.assertAlmostEqual(timer.srtt, 0.2)
+        self.assertAlmostEqual(timer.rto, 0.5)
+
+    def test_bounds(self):
+        timer = tftp.RetransmitTimer(2)
+        timer.sample(0.001)
+        self.assertEqual(timer.rto, tftp.MIN_RTO)
+        for dummy in range(10):
+            timer.backoff()
+        self.assertEqual(timer.rto, 2)
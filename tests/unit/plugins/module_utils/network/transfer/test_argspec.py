@@ -0,0 +1,28 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import yaml
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import argspec
+from ansible_collections.ncstate.network.plugins.modules.network.sftp import sftp_fetch, sftp_send
+from ansible_collections.ncstate.network.plugins.modules.network.tftp import tftp_send
+from ansible_collections.ncstate.network.plugins.modules.network.transfer import fanout_send
+
+
+class TestArgspec(unittest.TestCase):
+
+    def check(self, module, spec):
+        options = yaml.safe_load(module.DOCUMENTATION)['options']
+        self.assertEqual(sorted(options), sorted(spec['argument_spec']))
+        for name, option in spec['argument_spec'].items():
+            self.assertEqual(options[name].get('type', 'str'), option.get('type', 'str'), name)
+            self.assertEqual(options[name].get('default'), option.get('default'), name)
+
+    def test_documented(self):
+        self.check(tftp_send, argspec.TFTP_SEND)
+        self.check(sftp_send, argspec.SFTP_SEND)
+        self.check(fanout_send, argspec.FANOUT_SEND)
+        self.check(sftp_fetch, argspec.SFTP_FETCH)
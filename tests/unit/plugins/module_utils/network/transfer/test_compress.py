@@ -0,0 +1,56 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import os
+
+from ansible_collections.community.network.tests.unit.compat import unittest
+from ansible_collections.ncstate.network.plugins.module_utils.network.transfer import compress
+
+
+def decompress(data):
+    return gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+
+
+class TestGzipReader(unittest.TestCase):
+
+    def setUp(self):
+        self.data = b''.join(b'interface Gi1/0/%d\n description uplink\n' % number for number in range(20000))
+
+    def test_read_all(self):
+        self.assertEqual(decompress(compress.GzipReader(io.BytesIO(self.data)).read()), self.data)
+
+    def test_read_exact_sizes(self):
+        reader = compress.GzipReader(io.BytesIO(os.urandom(100000)))
+        sizes = list()
+        while True:
+            block = reader.read(512)
+            sizes.append(len(block))
+            if len(block) < 512:
+                break
+        # only the last read is short
+        self.assertTrue(all(size == 512 for size in sizes[:-1]))
+        self.assertEqual(reader.tell(), sum(sizes))
+
+    def test_deterministic(self):
+        first = compress.GzipReader(io.BytesIO(self.data)).read()
+        second = compress.GzipReader(io.BytesIO(self.data)).read()
+        self.assertEqual(first, second)
+
+    def test_seek(self):
+        reader = compress.GzipReader(io.BytesIO(self.data))
+        size = reader.seek(0, os.SEEK_END)
+        self.assertEqual(reader.tell(), size)
+        reader.seek(0)
+        data = reader.read()
+        self.assertEqual(len(data), size)
+        self.assertEqual(decompress(data), self.data)
+        with self.assertRaises(IOError):
+            reader.seek(10)
+
+    def test_gzip_filename(self):
+        self.assertEqual(compress.gzip_filename('sw1.cfg'), 'sw1.cfg.gz')
+        self.assertEqual(compress.gzip_filename('sw1.cfg.gz'), 'sw1.cfg.gz')
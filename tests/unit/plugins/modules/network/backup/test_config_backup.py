@@ -0,0 +1,81 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import shutil
+import tempfile
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.backup import config_backup
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import AnsibleExitJson, ModuleTestCase, set_module_args
+
+CONFIG = '!Current Configuration:\n!\n!System Up Time          %s\n!\nhostname "sw1"\n%s'
+
+
+class TestConfigBackupModule(ModuleTestCase):
+
+    def setUp(self):
+        super(TestConfigBackupModule, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.server = tftp.LocalTftpServer(self.root, listen_ip='127.0.0.1', port=0, timeout=1)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        self.mock_connection = patch('ansible_collections.ncstate.network.plugins.modules.network.backup.config_backup.Connection')
+        self.connection = self.mock_connection.start()
+        self.addCleanup(self.mock_connection.stop)
+
+    def run_module(self, output, **kwargs):
+        self.connection.return_value.get.return_value = output
+        args = dict(host='127.0.0.1', port=self.server.port, filename='backups/sw1.cfg')
+        args.update(kwargs)
+        set_module_args(args)
+        self.server.received.clear()
+        with self.assertRaises(AnsibleExitJson) as exc:
+            config_backup.main()
+        result = exc.exception.args[0]
+        if result['uploaded']:
+            # the server finishes the file after the client saw the last ack
+            self.assertEqual(self.server.wait(['backups/sw1.cfg'], 5), [])
+        return result
+
+    def read_backup(self):
+        with open(os.path.join(self.root, 'backups', 'sw1.cfg'), 'rb') as f:
+            return f.read()
+
+    def test_config_backup_new(self):
+        output = CONFIG % ('1 days 2 hrs', 'vlan database\n' * 200)
+        result = self.run_module(output)
+        self.assertTrue(result['changed'])
+        self.assertTrue(result['uploaded'])
+        self.assertEqual(self.read_backup(), output.encode('utf-8'))
+        self.assertNotIn(output, str(result))
+
+    def test_config_backup_unchanged(self):
+        self.run_module(CONFIG % ('1 days 2 hrs', 'exit'))
+        # only the uptime differs
+        result = self.run_module(CONFIG % ('1 days 3 hrs', 'exit'))
+        self.assertFalse(result['changed'])
+        self.assertFalse(result['uploaded'])
+        self.assertIn(b'1 days 2 hrs', self.read_backup())
+
+    def test_config_backup_changed(self):
+        self.run_module(CONFIG % ('1 days 2 hrs', 'exit'))
+        result = self.run_module(CONFIG % ('1 days 3 hrs', 'domain-name foo'))
+        self.assertTrue(result['uploaded'])
+        self.assertIn(b'domain-name foo', self.read_backup())
+
+    def test_config_backup_force(self):
+        self.run_module(CONFIG % ('1 days 2 hrs', 'exit'))
+        result = self.run_module(CONFIG % ('1 days 2 hrs', 'exit'), force=True)
+        self.assertTrue(result['uploaded'])
+
+    def test_config_backup_check_mode(self):
+        result = self.run_module(CONFIG % ('1 days 2 hrs', 'exit'), _ansible_check_mode=True)
+        self.assertTrue(result['changed'])
+        self.assertFalse(result['uploaded'])
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'backups', 'sw1.cfg')))
@@ -19,7 +19,11 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 
+import gzip
 import json
+import os
+import shutil
+import tempfile
 
 from ansible_collections.community.network.tests.unit.compat.mock import patch
 from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_command
@@ -35,10 +39,12 @@ class TestEdgeswitchCommandModule(TestEdgeswitchModule):
         super(TestEdgeswitchCommandModule, self).setUp()
         self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_command.run_commands')
         self.run_commands = self.mock_run_commands.start()
+        self.tmpdir = tempfile.mkdtemp()
 
     def tearDown(self):
         super(TestEdgeswitchCommandModule, self).tearDown()
         self.mock_run_commands.stop()
+        shutil.rmtree(self.tmpdir)
 
     def load_fixtures(self, commands=None):
         def load_from_file(*args, **kwargs):
@@ -104,3 +110,53 @@ class TestEdgeswitchCommandModule(TestEdgeswitchModule):
         commands = ['show version', 'show version']
         set_module_args(dict(commands=commands, wait_for=wait_for, match='all'))
         self.execute_module(failed=True)
+
+    def test_edgeswitch_command_parse(self):
+        set_module_args(dict(commands=['show mac-addr-table all', 'show port-channel brief', 'show version'], parse=True))
+        result = self.execute_module()
+        macs = result['parsed'][0]
+        self.assertEqual(len(macs), 4)
+        self.assertEqual(macs[2], {'vlan_id': '100', 'mac_address': 'F0:9F:C2:AA:BB:CC', 'interface': '3/1',
+                                   'ifindex': '65', 'status': 'Learned'})
+        self.assertEqual(result['parsed'][1][0]['members'], ['0/1', '0/2'])
+        self.assertIsNone(result['parsed'][2])
+
+    def test_edgeswitch_command_no_parse(self):
+        set_module_args(dict(commands=['show version']))
+        result = self.execute_module()
+        self.assertNotIn('parsed', result)
+
+    def test_edgeswitch_command_output_file(self):
+        path = os.path.join(self.tmpdir, 'out', 'sw1.txt')
+        set_module_args(dict(commands=['show version', 'show mac-addr-table all'], output_file=path, parse=True))
+        result = self.execute_module()
+        self.assertNotIn('stdout', result)
+        self.assertEqual(self.run_commands.call_count, 2)
+        with open(path) as f:
+            data = f.read()
+        self.assertTrue(data.startswith('System Description'))
+        self.assertEqual(sum(result['output_sizes']), len(data))
+        self.assertIsNone(result['parsed'][0])
+        self.assertEqual(len(result['parsed'][1]), 4)
+
+    def test_edgeswitch_command_output_file_compress(self):
+        path = os.path.join(self.tmpdir, 'sw1.txt.gz')
+        set_module_args(dict(commands=['show version'], output_file=path, compress=True))
+        result = self.execute_module()
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(f.read(), load_fixture('edgeswitch_command_show_version').rstrip('\n') + '\n')
+        self.assertEqual(result['output_file'], path)
+
+    def test_edgeswitch_command_output_file_exit(self):
+        # a failing command ends the module with the SystemExit of fail_json
+        self.run_commands.side_effect = [[load_fixture('edgeswitch_command_show_version')], SystemExit(1)]
+        set_module_args(dict(commands=['show version', 'show mac-addr-table all'],
+                             output_file=os.path.join(self.tmpdir, 'sw1.txt')))
+        with self.assertRaises(SystemExit):
+            edgeswitch_command.main()
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_edgeswitch_command_output_file_wait_for(self):
+        set_module_args(dict(commands=['show version'], output_file=os.path.join(self.tmpdir, 'out'),
+                             wait_for='result[0] contains "EP-S16"'))
+        self.execute_module(failed=True)
@@ -20,7 +20,12 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from ansible_collections.community.network.tests.unit.compat.mock import patch
+import os
+import shutil
+import tempfile
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.community.network.tests.unit.compat.mock import ANY, patch
 from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_config
 from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
 from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule, load_fixture
@@ -42,9 +47,13 @@ class TestEdgeswitchConfigModule(TestEdgeswitchModule):
         self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_config.run_commands')
         self.run_commands = self.mock_run_commands.start()
 
+        self.tmpdir = tempfile.mkdtemp()
+
     def tearDown(self):
         super(TestEdgeswitchConfigModule, self).tearDown()
 
+        shutil.rmtree(self.tmpdir)
+
         self.mock_get_config.stop()
         self.mock_load_config.stop()
         self.mock_run_commands.stop()
@@ -64,7 +73,8 @@ class TestEdgeswitchConfigModule(TestEdgeswitchModule):
         set_module_args(dict(src=src))
         commands = ['domain-name foo',
                     'interface 0/1',
-                    'no ip address']
+                    'no ip address',
+                    'exit']
         self.execute_module(changed=True, commands=commands)
 
     def test_edgeswitch_config_backup(self):
@@ -87,7 +97,8 @@ class TestEdgeswitchConfigModule(TestEdgeswitchModule):
         set_module_args(dict(src=src, save_when='changed'))
         commands = ['domain-name foo',
                     'interface 0/1',
-                    'no ip address']
+                    'no ip address',
+                    'exit']
         self.execute_module(changed=True, commands=commands)
         self.assertEqual(self.run_commands.call_count, 1)
         self.assertEqual(self.get_config.call_count, 1)
@@ -109,7 +120,7 @@ class TestEdgeswitchConfigModule(TestEdgeswitchModule):
 
     def test_edgeswitch_config_lines_w_parents(self):
         set_module_args(dict(lines=['shutdown'], parents=['interface 0/1']))
-        commands = ['interface 0/1', 'shutdown']
+        commands = ['interface 0/1', 'shutdown', 'exit']
         self.execute_module(changed=True, commands=commands)
 
     def test_edgeswitch_config_before(self):
@@ -168,3 +179,163 @@ class TestEdgeswitchConfigModule(TestEdgeswitchModule):
         set_module_args(dict(lines=lines, parents=parents, match='exact'))
         commands = parents + lines
         self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_config_aggregate(self):
+        aggregate = [dict(lines=['shutdown'], parents=['interface 0/1']),
+                     dict(lines=['description test-string', 'shutdown'], parents=['interface 0/2']),
+                     dict(lines=['domain-name foo'])]
+        set_module_args(dict(aggregate=aggregate))
+        commands = ['interface 0/1', 'shutdown', 'exit', 'domain-name foo']
+        self.execute_module(changed=True, commands=commands, sort=False)
+        self.assertEqual(self.get_config.call_count, 1)
+        self.assertEqual(self.load_config.call_count, 1)
+
+    def test_edgeswitch_config_aggregate_before_after(self):
+        aggregate = [dict(lines=['shutdown'], parents=['interface 0/1'], before=['test1'], after=['test2']),
+                     dict(lines=['domain-name bar'], before=['test3'], after=['test4'])]
+        set_module_args(dict(aggregate=aggregate, before=['test0'], after=['test5']))
+        commands = ['test0', 'test1', 'interface 0/1', 'shutdown', 'exit', 'test2', 'test5']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_config_aggregate_no_change(self):
+        aggregate = [dict(lines=['description test-string'], parents=['interface 0/1']),
+                     dict(lines=['domain-name bar'])]
+        set_module_args(dict(aggregate=aggregate))
+        self.execute_module()
+        self.assertEqual(self.load_config.call_count, 0)
+
+    def test_edgeswitch_config_transfer_tftp(self):
+        self.run_commands.side_effect = [['File transfer operation completed successfully.'],
+                                         ['Configuration script applied.', 'Script deleted.']]
+        src = load_fixture('edgeswitch_config_src.cfg')
+        with patch('ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp.upload') as upload:
+            set_module_args(dict(src=src, transfer=dict(host='10.0.0.5', filename='sw1.scr')))
+            result = self.execute_module(changed=True)
+            self.assertEqual(upload.call_args[0][:3], ('10.0.0.5', 69, 'sw1.scr'))
+            script = upload.call_args[0][3].getvalue().decode('utf-8')
+        self.assertEqual(script, 'configure\ndomain-name foo\ninterface 0/1\nno ip address\nexit\nend\n')
+        self.assertEqual(self.load_config.call_count, 0)
+        copy = self.run_commands.call_args_list[0][0][1][0]
+        self.assertEqual(copy['command'], 'copy tftp://10.0.0.5/sw1.scr nvram:script ansible.scr')
+        self.assertEqual(result['transfer_log'], ['Configuration script applied.'])
+
+    def test_edgeswitch_config_transfer_copy_failed(self):
+        self.run_commands.return_value = ['File transfer failed!']
+        with patch('ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp.upload'):
+            set_module_args(dict(lines=['domain-name foo'], transfer=dict(host='10.0.0.5')))
+            self.execute_module(failed=True)
+
+    def test_edgeswitch_config_transfer_apply_error(self):
+        self.run_commands.side_effect = [['File transfer operation completed successfully.'],
+                                         ['% Invalid input detected at line 2.\nConfiguration script applied.', 'Script deleted.']]
+        with patch('ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp.upload'):
+            set_module_args(dict(lines=['domain-name foo'], transfer=dict(host='10.0.0.5')))
+            result = self.execute_module(failed=True)
+        self.assertIn('Invalid input', result['msg'])
+        self.assertEqual(self.run_commands.call_count, 2)
+
+    def test_edgeswitch_config_transfer_sftp_absolute(self):
+        self.run_commands.side_effect = [['File transfer operation completed successfully.'],
+                                         ['Configuration script applied.', 'Script deleted.']]
+        with patch('ansible_collections.ncstate.network.plugins.module_utils.network.sftp.sftp.upload') as upload:
+            set_module_args(dict(lines=['domain-name foo'],
+                                 transfer=dict(protocol='sftp', host='10.0.0.5', username='backup', password='secret',
+                                               filename='/srv/scripts/sw1.scr')))
+            self.execute_module(changed=True)
+        self.assertEqual(upload.call_args[0][4], '/srv/scripts/sw1.scr')
+        copy = self.run_commands.call_args_list[0][0][1][0]
+        self.assertEqual(copy['command'], 'copy sftp://backup@10.0.0.5/srv/scripts/sw1.scr nvram:script ansible.scr')
+
+    def test_edgeswitch_config_transfer_serve_port(self):
+        set_module_args(dict(lines=['domain-name foo'], transfer=dict(host='10.0.0.5', serve=True, port=6969)))
+        self.execute_module(failed=True)
+        self.assertEqual(self.run_commands.call_count, 0)
+
+    def test_edgeswitch_config_transfer_min_lines(self):
+        with patch('ansible_collections.ncstate.network.plugins.module_utils.network.tftp.tftp.upload') as upload:
+            set_module_args(dict(lines=['domain-name foo'], transfer=dict(host='10.0.0.5', min_lines=5000)))
+            self.execute_module(changed=True, commands=['domain-name foo'])
+            self.assertEqual(upload.call_count, 0)
+        self.assertEqual(self.load_config.call_count, 1)
+
+    def test_edgeswitch_config_src_flat(self):
+        src = 'domain-name foo\ninterface 0/2\nshutdown\nno shutdown\nexit\ninterface 0/3\nshutdown\nexit'
+        set_module_args(dict(src=src))
+        commands = ['domain-name foo', 'interface 0/2', 'no shutdown', 'exit', 'interface 0/3', 'shutdown', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_config_diff_intended(self):
+        self.run_commands.return_value = [load_fixture('edgeswitch_config_config.cfg')]
+        intended = load_fixture('edgeswitch_config_src.cfg')
+        set_module_args(dict(diff_against='intended', intended_config=intended, _ansible_diff=True))
+        result = self.execute_module(changed=True)
+        self.assertEqual([d['before_header'] for d in result['diff']], ['global', 'interface 0/1'])
+        self.assertEqual(result['diff'][1]['before'], 'interface 0/1\n no ip address\nexit\n')
+        self.assertEqual(result['diff'][1]['after'],
+                         'interface 0/1\n ip address 1.2.3.4 255.255.255.0\n description test-string\nexit\n')
+
+    def test_edgeswitch_config_replace_config(self):
+        src = load_fixture('edgeswitch_config_replace.cfg')
+        set_module_args(dict(src=src, replace='config'))
+        commands = ['no domain-name', 'hostname "sw1"',
+                    'interface 0/1', 'ip address 1.2.3.5 255.255.255.0', 'description uplink', 'exit',
+                    'interface 0/2', 'no shutdown', 'no ip address', 'exit',
+                    'no ip access-list EXAMPLE in',
+                    'ip access-list EXAMPLE in', 'deny any any any', 'any any any permit', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+        self.assertEqual(self.load_config.call_count, 1)
+
+    def test_edgeswitch_config_replace_config_unchanged(self):
+        src = load_fixture('edgeswitch_config_config.cfg')
+        set_module_args(dict(src=src, replace='config'))
+        self.execute_module()
+
+    def test_edgeswitch_config_replace_config_vlans(self):
+        config = 'vlan database\nvlan 10,20-22\nvlan name 22 "old"\nexit\ninterface 0/3\nvlan participation include 22\nexit'
+        src = 'vlan database\nvlan 10,20-21,30\nexit\ninterface 0/3\nvlan participation exclude 22\nexit'
+        set_module_args(dict(src=src, replace='config', running_config=config))
+        commands = ['vlan database', 'vlan 30', 'no vlan name 22', 'no vlan 22', 'exit',
+                    'interface 0/3', 'vlan participation exclude 22', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_config_checkpoint(self):
+        path = os.path.join(self.tmpdir, 'checkpoints', 'sw1.cfg')
+        set_module_args(dict(lines=['domain-name foo'], checkpoint=path))
+        result = self.execute_module(changed=True, commands=['domain-name foo'])
+        self.assertEqual(result['checkpoint_path'], path)
+        with open(path) as f:
+            self.assertEqual(f.read(), load_fixture('edgeswitch_config_config.cfg'))
+
+    def test_edgeswitch_config_checkpoint_check_mode(self):
+        path = os.path.join(self.tmpdir, 'sw1.cfg')
+        set_module_args(dict(lines=['domain-name foo'], checkpoint=path, _ansible_check_mode=True))
+        result = self.execute_module(changed=True, commands=['domain-name foo'])
+        self.assertNotIn('checkpoint_path', result)
+        self.assertFalse(os.path.exists(path))
+
+    def test_edgeswitch_config_checkpoint_unchanged(self):
+        path = os.path.join(self.tmpdir, 'sw1.cfg')
+        set_module_args(dict(lines=['domain-name bar'], checkpoint=path))
+        self.execute_module()
+        self.assertFalse(os.path.exists(path))
+
+    def test_edgeswitch_config_rollback(self):
+        path = os.path.join(self.tmpdir, 'sw1.cfg')
+        with open(path, 'w') as f:
+            f.write(load_fixture('edgeswitch_config_src.cfg'))
+        set_module_args(dict(rollback=path))
+        commands = ['domain-name foo',
+                    'interface 0/1', 'no description', 'no ip address', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_config_rollback_on_failure(self):
+        self.run_commands.return_value = [load_fixture('edgeswitch_config_config.cfg').replace('domain-name bar', 'domain-name foo')]
+        with patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_config.get_connection') as connection:
+            connection.return_value.edit_config.side_effect = ConnectionError('Invalid input detected')
+            set_module_args(dict(lines=['domain-name foo', 'ip routing'], rollback_on_failure=True))
+            result = self.execute_module(failed=True)
+        self.assertEqual(result['rollback_commands'], ['domain-name bar'])
+        self.load_config.assert_called_once_with(ANY, ['domain-name bar'])
+        # config mode is left before the running config is read again
+        self.assertEqual(self.run_commands.call_args_list[0][0][1], ['end'])
+        self.assertEqual(self.run_commands.call_args_list[0][1], {'check_rc': False})
@@ -0,0 +1,87 @@
+# (c) 2018 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_copy
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
+from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule, load_fixture
+
+
+class TestEdgeswitchCopyModule(TestEdgeswitchModule):
+
+    module = edgeswitch_copy
+
+    def setUp(self):
+        super(TestEdgeswitchCopyModule, self).setUp()
+        self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_copy.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+
+    def tearDown(self):
+        super(TestEdgeswitchCopyModule, self).tearDown()
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+        def load_from_file(*args, **kwargs):
+            module, commands = args
+            output = list()
+            for item in commands:
+                if isinstance(item, dict):
+                    output.append('File transfer operation completed successfully.')
+                else:
+                    output.append(load_fixture('edgeswitch_copy_' + item.replace(' ', '_')))
+            return output
+
+        self.run_commands.side_effect = load_from_file
+
+    def test_edgeswitch_copy_running_config(self):
+        set_module_args(dict(server='10.0.0.5', filename='sw1.cfg'))
+        result = self.execute_module(changed=True)
+        self.assertEqual(result['url'], 'tftp://10.0.0.5/sw1.cfg')
+        command = self.run_commands.call_args[0][1][0]
+        self.assertEqual(command['command'], 'copy system:running-config tftp://10.0.0.5/sw1.cfg')
+
+    def test_edgeswitch_copy_hostname(self):
+        set_module_args(dict(server='10.0.0.5', filename='{hostname}.cfg', source='startup-config'))
+        result = self.execute_module(changed=True)
+        self.assertEqual(result['url'], 'tftp://10.0.0.5/sw_test_1.cfg')
+        command = self.run_commands.call_args[0][1][0]
+        self.assertEqual(command['command'], 'copy nvram:startup-config tftp://10.0.0.5/sw_test_1.cfg')
+
+    def test_edgeswitch_copy_retries(self):
+        set_module_args(dict(server='10.0.0.5', filename='sw1.cfg', retries=2, interval=0))
+        self.run_commands.return_value = ['File transfer failed!']
+        self.run_commands.side_effect = None
+        with patch.object(self, 'load_fixtures'):
+            self.execute_module(failed=True)
+        self.assertEqual(self.run_commands.call_count, 2)
+
+    def test_edgeswitch_copy_last_retry(self):
+        set_module_args(dict(server='10.0.0.5', filename='sw1.cfg', retries=3, interval=0))
+        self.run_commands.side_effect = [['File transfer failed!'], ['File transfer failed!'],
+                                         ['File transfer operation completed successfully.']]
+        with patch.object(self, 'load_fixtures'):
+            result = self.execute_module(changed=True)
+        self.assertEqual(self.run_commands.call_count, 3)
+        self.assertIn('completed successfully', result['stdout'])
+
+    def test_edgeswitch_copy_no_retries(self):
+        set_module_args(dict(server='10.0.0.5', filename='sw1.cfg', retries=0))
+        self.execute_module(failed=True)
+        self.assertEqual(self.run_commands.call_count, 0)
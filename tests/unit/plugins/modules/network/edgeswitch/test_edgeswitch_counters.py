@@ -0,0 +1,100 @@
+# (c) 2018 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import csv
+import os
+import shutil
+import tempfile
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_counters
+from ansible_collections.ncstate.network.plugins.module_utils.network.edgeswitch.counters import CounterSeries, read_binary
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
+from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule, load_fixture
+
+
+class TestEdgeswitchCountersModule(TestEdgeswitchModule):
+
+    module = edgeswitch_counters
+
+    def setUp(self):
+        super(TestEdgeswitchCountersModule, self).setUp()
+        self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_counters.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+        self.mock_time = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_counters.time')
+        self.time = self.mock_time.start()
+        self.time.time.side_effect = [0.0, 0.0, 0.0, 10.0, 10.0]
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestEdgeswitchCountersModule, self).tearDown()
+        self.mock_run_commands.stop()
+        self.mock_time.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def load_fixtures(self, commands=None):
+        self.run_commands.side_effect = [[load_fixture('edgeswitch_counters_show_interface_counters_1')],
+                                         [load_fixture('edgeswitch_counters_show_interface_counters_2')]]
+
+    def test_edgeswitch_counters_rates(self):
+        set_module_args(dict(samples=2, interval=10))
+        result = self.execute_module()
+        self.assertEqual(result['ports'], ['0/1', '0/2', '0/10'])
+        self.assertEqual(result['elapsed'], 10.0)
+        self.assertEqual(result['rates']['0/1']['in_octets'], 1000000.0)
+        self.assertEqual(result['rates']['0/1']['in_ucast_pkts'], 100.0)
+        # cleared counters count from zero
+        self.assertEqual(result['rates']['0/10']['in_octets'], 800.0)
+        self.assertEqual(result['errors'], {'0/10': {'in_errors': 7, 'out_discards': 2}})
+        self.time.sleep.assert_called_once_with(10.0)
+
+    def test_edgeswitch_counters_interfaces(self):
+        set_module_args(dict(samples=2, interfaces=['0/1', '0/48']))
+        result = self.execute_module()
+        self.assertEqual(list(result['rates']), ['0/1', '0/48'])
+        self.assertEqual(result['warnings'], ['No counters found for port 0/48'])
+
+    def test_edgeswitch_counters_csv(self):
+        dest = os.path.join(self.tmpdir, 'sw1.csv')
+        set_module_args(dict(samples=2, dest=dest))
+        self.execute_module()
+        with open(dest) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:3], ['timestamp', 'port', 'in_bcast_pkts'])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[4][:2], ['10.000', '0/1'])
+
+    def test_edgeswitch_counters_binary(self):
+        dest = os.path.join(self.tmpdir, 'sw1.bin')
+        set_module_args(dict(samples=2, dest=dest, format='binary'))
+        self.execute_module()
+        with open(dest, 'rb') as f:
+            series = read_binary(f)
+        self.assertEqual(len(series), 2)
+        self.assertEqual(series.ports, ['0/1', '0/2', '0/10'])
+        self.assertEqual(series.rates()['0/1']['in_octets'], 1000000.0)
+
+    def test_edgeswitch_counters_total(self):
+        series = CounterSeries()
+        for timestamp, octets in enumerate([100, 400, 50, 250]):
+            series.add(float(timestamp), {'0/1': {'in_octets': octets, 'in_errors': 3}})
+        # 300 before the clear, 50 from zero and 200 after it
+        self.assertEqual(series.total().tolist(), [0, 550])
+        self.assertEqual(series.errors(), dict())
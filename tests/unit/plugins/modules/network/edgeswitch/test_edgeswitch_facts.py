@@ -0,0 +1,135 @@
+# (c) 2018 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_facts
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
+from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule, load_fixture
+
+
+class TestEdgeswitchFactsModule(TestEdgeswitchModule):
+
+    module = edgeswitch_facts
+
+    def setUp(self):
+        super(TestEdgeswitchFactsModule, self).setUp()
+        self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_facts.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+
+    def tearDown(self):
+        super(TestEdgeswitchFactsModule, self).tearDown()
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+        def load_from_file(*args, **kwargs):
+            module, commands = args
+            return [load_fixture('edgeswitch_facts_' + command.replace(' ', '_')) for command in commands]
+
+        self.run_commands.side_effect = load_from_file
+
+    def test_edgeswitch_facts_default(self):
+        set_module_args(dict(gather_subset=['default']))
+        result = self.execute_module()
+        facts = result['ansible_facts']
+        self.assertEqual(facts['ansible_net_model'], 'ES-16-XG')
+        self.assertEqual(facts['ansible_net_serialnum'], 'F09FC2EFD310')
+        self.assertEqual(facts['ansible_net_version'], '1.7.4.5075842')
+        self.assertEqual(facts['ansible_net_hostname'], 'sw_test_1')
+        self.assertNotIn('ansible_net_interfaces', facts)
+
+    def test_edgeswitch_facts_single_request(self):
+        set_module_args(dict(gather_subset=['all']))
+        result = self.execute_module()
+        self.assertEqual(self.run_commands.call_count, 1)
+        self.assertIn('ansible_net_config', result['ansible_facts'])
+
+    def test_edgeswitch_facts_exclude(self):
+        set_module_args(dict(gather_subset=['!lldp', '!config']))
+        result = self.execute_module()
+        commands = self.run_commands.call_args[0][1]
+        self.assertNotIn('show lldp remote-device all', commands)
+        self.assertNotIn('show running-config', commands)
+        self.assertIn('ansible_net_lags', result['ansible_facts'])
+
+    def test_edgeswitch_facts_interfaces(self):
+        set_module_args(dict(gather_subset=['interfaces']))
+        result = self.execute_module()
+        interfaces = result['ansible_facts']['ansible_net_interfaces']
+        self.assertEqual(interfaces['0/1']['name'], 'VMOTION ESX1')
+        self.assertEqual(interfaces['0/1']['physical_status'], '10G Full')
+        self.assertEqual(interfaces['4/1']['link_state'], 'Up')
+        # 0/15 is listed twice, both rows are kept
+        self.assertEqual([row['link_state'] for row in interfaces['0/15']], ['Down', 'Up'])
+
+    def test_edgeswitch_facts_interfaces_header(self):
+        output = ('Intf      Name      Link   Physical\n'
+                  '--------- --------- ------ --------\n'
+                  '0/1       uplink    Up     10G Full\n')
+        self.load_fixtures()
+        load_from_file = self.run_commands.side_effect
+        self.load_fixtures = lambda commands=None: None
+        self.run_commands.side_effect = lambda module, commands: [
+            output if command.startswith('show interfaces') else load_from_file(module, [command])[0] for command in commands]
+        set_module_args(dict(gather_subset=['interfaces']))
+        result = self.execute_module(failed=True)
+        self.assertEqual(result['msg'], 'Unable to parse the output of show interfaces status, the table has no port column')
+
+    def test_edgeswitch_facts_config(self):
+        set_module_args(dict(gather_subset=['config']))
+        result = self.execute_module()
+        sections = result['ansible_facts']['ansible_net_config_sections']
+        self.assertEqual(sections['global'], ['domain-name bar'])
+        self.assertEqual(sections['interface 0/2'], ['ip address 6.7.8.9 255.255.255.0', 'description test-string', 'shutdown'])
+        self.assertEqual(sections['ip access-list EXAMPLE in'], ['any any any permit'])
+
+    def test_edgeswitch_facts_vlans(self):
+        set_module_args(dict(gather_subset=['vlans']))
+        result = self.execute_module()
+        self.assertEqual(result['ansible_facts']['ansible_net_vlans'],
+                         {'1': {'name': 'default', 'type': 'Default'},
+                          '100': {'name': 'voice', 'type': 'Static'}})
+
+    def test_edgeswitch_facts_lag(self):
+        set_module_args(dict(gather_subset=['lag']))
+        result = self.execute_module()
+        lags = result['ansible_facts']['ansible_net_lags']
+        self.assertEqual(lags['3/1']['members'], ['0/1', '0/2'])
+        self.assertEqual(lags['3/1']['active_members'], ['0/1', '0/2'])
+        self.assertEqual(lags['3/2']['members'], [])
+
+    def test_edgeswitch_facts_lldp(self):
+        set_module_args(dict(gather_subset=['lldp']))
+        result = self.execute_module()
+        neighbors = result['ansible_facts']['ansible_net_neighbors']
+        self.assertNotIn('0/2', neighbors)
+        self.assertEqual(neighbors['0/1'], [{'host': 'core-sw1', 'port': '0/24', 'chassis_id': '74:AC:B9:11:22:33'}])
+        self.assertEqual(len(neighbors['0/16']), 2)
+
+    def test_edgeswitch_facts_columns(self):
+        set_module_args(dict(gather_subset=['vlans', 'lldp'], table_format='columns'))
+        result = self.execute_module()
+        facts = result['ansible_facts']
+        self.assertEqual(facts['ansible_net_vlans'], {'vlan_id': ['1', '100'], 'name': ['default', 'voice'],
+                                                      'type': ['Default', 'Static']})
+        self.assertEqual(facts['ansible_net_neighbors']['local_port'], ['0/1', '0/15', '0/16', '0/16'])
+
+    def test_edgeswitch_facts_bad_subset(self):
+        set_module_args(dict(gather_subset=['bogus']))
+        self.execute_module(failed=True)
@@ -0,0 +1,89 @@
+# (c) 2018 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_topology
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
+from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule
+
+# name: (management address, {local port: (neighbor name, neighbor port)})
+NETWORK = {
+    'core-sw1': (None, {'0/1': ('sw-a', '0/24'), '0/2': ('sw-b', '0/24'), '0/3': ('ap-1', 'eth0')}),
+    'sw-a': ('10.0.0.11', {'0/24': ('core-sw1', '0/1'), '0/1': ('sw-c', '0/23')}),
+    'sw-b': ('10.0.0.12', {'0/24': ('core-sw1', '0/2'), '0/1': ('sw-c', '0/24')}),
+    'sw-c': ('10.0.0.13', {'0/23': ('sw-a', '0/1'), '0/24': ('sw-b', '0/1'), '0/1': ('sw-d', '0/24')}),
+    'sw-d': ('10.0.0.14', {'0/24': ('sw-c', '0/1')}),
+    'ap-1': ('10.0.0.50', {'eth0': ('core-sw1', '0/3')}),
+}
+
+
+def emulate(name):
+    """ the output of topology.COMMANDS on the emulated device name
+    """
+    sysinfo = 'System Description............................. EdgeSwitch 16-Port 10G\n' \
+              'System Name.................................... %s\n' % name
+    detail = ['LLDP Remote Device Detail', '']
+    for port, (peer, peer_port) in sorted(NETWORK[name][1].items()):
+        address = NETWORK[peer][0] or '10.0.0.1'
+        detail.extend([
+            'Local Interface: %s' % port, '',
+            'Remote Identifier: 1',
+            'Chassis ID Subtype: MAC Address',
+            'Chassis ID: 74:AC:B9:00:00:%02X' % len(peer),
+            'Port ID Subtype: Interface Name',
+            'Port ID: %s' % peer_port,
+            'System Name: %s' % peer,
+            'System Description: EdgeSwitch',
+            'System Capabilities Supported: bridge, router',
+            'System Capabilities Enabled: bridge',
+            'Time to Live: 104 seconds',
+            'Management Address:',
+            '    Type: IPv4',
+            '    Address: %s' % address,
+            '',
+        ])
+    return [sysinfo, '\n'.join(detail)]
+
+
+class TestEdgeswitchTopologyModule(TestEdgeswitchModule):
+
+    module = edgeswitch_topology
+
+    def setUp(self):
+        super(TestEdgeswitchTopologyModule, self).setUp()
+        self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_topology.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+
+    def tearDown(self):
+        super(TestEdgeswitchTopologyModule, self).tearDown()
+        self.mock_run_commands.stop()
+
+    def load_fixtures(self, commands=None):
+        self.run_commands.return_value = emulate('core-sw1')
+
+    def test_edgeswitch_topology_neighbors_only(self):
+        set_module_args(dict(max_depth=0))
+        result = self.execute_module()
+        self.assertEqual(len(result['links']), 3)
+        self.assertEqual([node['name'] for node in result['nodes'] if node['crawled']], ['core-sw1'])
+
+    def test_edgeswitch_topology_crawl_needs_action(self):
+        set_module_args(dict(username='admin', password='secret', subnets=['10.0.0.0/24']))
+        self.execute_module(failed=True)
@@ -0,0 +1,99 @@
+# (c) 2018 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.edgeswitch import edgeswitch_vlans
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import set_module_args
+from ansible_collections.community.network.tests.unit.plugins.modules.network.edgeswitch.edgeswitch_module import TestEdgeswitchModule, load_fixture
+
+
+class TestEdgeswitchVlansModule(TestEdgeswitchModule):
+
+    module = edgeswitch_vlans
+
+    def setUp(self):
+        super(TestEdgeswitchVlansModule, self).setUp()
+
+        self.mock_run_commands = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_vlans.run_commands')
+        self.run_commands = self.mock_run_commands.start()
+
+        self.mock_load_config = patch('ansible_collections.ncstate.network.plugins.modules.network.edgeswitch.edgeswitch_vlans.load_config')
+        self.load_config = self.mock_load_config.start()
+
+    def tearDown(self):
+        super(TestEdgeswitchVlansModule, self).tearDown()
+        self.mock_run_commands.stop()
+        self.mock_load_config.stop()
+
+    def load_fixtures(self, commands=None):
+        self.run_commands.return_value = [load_fixture('edgeswitch_vlans_show_vlan_brief')]
+        self.load_config.return_value = None
+
+    def test_edgeswitch_vlans_merged_range(self):
+        config = [dict(vlan_id=i) for i in list(range(103, 200)) + [205, 207, 208]]
+        set_module_args(dict(config=config))
+        commands = ['vlan database', 'vlan 103-199', 'vlan 205', 'vlan 207-208', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+        self.assertEqual(self.run_commands.call_count, 1)
+        self.assertEqual(self.load_config.call_count, 1)
+
+    def test_edgeswitch_vlans_merged_names(self):
+        config = [dict(vlan_id=100, name='voice'), dict(vlan_id=101, name='guest'),
+                  dict(vlan_id=102), dict(vlan_id=400, name='mgmt')]
+        set_module_args(dict(config=config))
+        commands = ['vlan database', 'vlan 400', 'vlan name 101 "guest"', 'vlan name 400 "mgmt"', 'exit']
+        result = self.execute_module(changed=True, commands=commands, sort=False)
+        self.assertIn({'vlan_id': 102, 'name': 'data'}, result['after'])
+
+    def test_edgeswitch_vlans_merged_unchanged(self):
+        set_module_args(dict(config=[dict(vlan_id=100, name='voice'), dict(vlan_id=102)]))
+        self.execute_module(commands=[])
+        self.assertEqual(self.load_config.call_count, 0)
+
+    def test_edgeswitch_vlans_replaced(self):
+        set_module_args(dict(config=[dict(vlan_id=100, name='voice'), dict(vlan_id=102)], state='replaced'))
+        commands = ['vlan database', 'no vlan name 102', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_vlans_overridden(self):
+        set_module_args(dict(config=[dict(vlan_id=100, name='voice'), dict(vlan_id=150)], state='overridden'))
+        commands = ['vlan database', 'vlan 150', 'no vlan 101-102', 'no vlan 200', 'exit']
+        result = self.execute_module(changed=True, commands=commands, sort=False)
+        self.assertEqual([v['vlan_id'] for v in result['after']], [1, 100, 150, 300])
+
+    def test_edgeswitch_vlans_deleted(self):
+        set_module_args(dict(config=[dict(vlan_id=1), dict(vlan_id=101), dict(vlan_id=102), dict(vlan_id=999)],
+                             state='deleted'))
+        commands = ['vlan database', 'no vlan 101-102', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_vlans_deleted_all(self):
+        set_module_args(dict(state='deleted'))
+        commands = ['vlan database', 'no vlan 100-102', 'no vlan 200', 'exit']
+        self.execute_module(changed=True, commands=commands, sort=False)
+
+    def test_edgeswitch_vlans_invalid_id(self):
+        set_module_args(dict(config=[dict(vlan_id=5000)]))
+        self.execute_module(failed=True)
+
+    def test_edgeswitch_vlans_quoted_name(self):
+        set_module_args(dict(config=[dict(vlan_id=100, name='say "hi"')]))
+        result = self.execute_module(failed=True)
+        self.assertEqual(result['msg'], 'The name of VLAN 100 can not contain a double quote')
@@ -0,0 +1,78 @@
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+
+from ansible_collections.community.network.tests.unit.compat.mock import patch
+from ansible_collections.ncstate.network.plugins.modules.network.tftp import tftp_receive
+from ansible_collections.ncstate.network.plugins.module_utils.network.tftp import tftp
+from ansible_collections.community.network.tests.unit.plugins.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
+
+
+class TestTftpReceiveModule(ModuleTestCase):
+
+    def setUp(self):
+        super(TestTftpReceiveModule, self).setUp()
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest)
+
+        # start the uploads as soon as the module's server is listening
+        start = tftp.LocalTftpServer.start
+        self.uploads = list()
+        self.errors = dict()
+
+        def upload(port, name, data):
+            try:
+                tftp.upload('127.0.0.1', port, name, io.BytesIO(data))
+            except Exception as err:
+                self.errors[name] = err
+
+        def start_and_upload(server):
+            start(server)
+            for name, data in self.uploads:
+                thread = threading.Thread(target=upload, args=(server.port, name, data))
+                thread.start()
+
+        self.mock_start = patch.object(tftp.LocalTftpServer, 'start', start_and_upload)
+        self.mock_start.start()
+        self.addCleanup(self.mock_start.stop)
+
+    def test_tftp_receive_files(self):
+        self.uploads = [('sw1.cfg', b'a' * 2000), ('sites/sw2.cfg', b'b' * 10)]
+        set_module_args(dict(dest=self.dest, listen_ip='127.0.0.1', port=0, timeout=10,
+                             files=['sw1.cfg', 'sites/sw2.cfg']))
+        with self.assertRaises(AnsibleExitJson) as exc:
+            tftp_receive.main()
+        result = exc.exception.args[0]
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['missing'], [])
+        self.assertEqual([(f['filename'], f['size']) for f in result['received']],
+                         [('sites/sw2.cfg', 10), ('sw1.cfg', 2000)])
+        with open(os.path.join(self.dest, 'sw1.cfg'), 'rb') as f:
+            self.assertEqual(f.read(), b'a' * 2000)
+
+    def test_tftp_receive_missing(self):
+        self.uploads = [('sw1.cfg', b'a')]
+        set_module_args(dict(dest=self.dest, listen_ip='127.0.0.1', port=0, timeout=1,
+                             files=['sw1.cfg', 'sw2.cfg']))
+        with self.assertRaises(AnsibleFailJson) as exc:
+            tftp_receive.main()
+        self.assertEqual(exc.exception.args[0]['missing'], ['sw2.cfg'])
+
+    def test_tftp_receive_rejects_other_files(self):
+        self.uploads = [('sw1.cfg', b'a'), ('../other.cfg', b'b'), ('other.cfg', b'c')]
+        set_module_args(dict(dest=self.dest, listen_ip='127.0.0.1', port=0, timeout=2,
+                             files=['sw1.cfg', 'sw2.cfg']))
+        with self.assertRaises(AnsibleFailJson) as exc:
+            tftp_receive.main()
+        result = exc.exception.args[0]
+        self.assertEqual([f['filename'] for f in result['received']], ['sw1.cfg'])
+        self.assertIn('other.cfg', [f['filename'] for f in result['rejected']])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, 'other.cfg')))
+        self.assertIn('other.cfg', self.errors)